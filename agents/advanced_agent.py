@@ -13,21 +13,54 @@ Features:
 
 from typing import List, Dict, Any, Optional, Callable
 from abc import ABC, abstractmethod
+from dataclasses import dataclass
+import asyncio
+import logging
 import os
-from datetime import datetime, timezone
+import threading
+import time
 from langchain_core.runnables import RunnableConfig
 from holistic_ai_bedrock import get_chat_model
 
 from utils.message_bus import MessageBus, Message, MessageType, MessagePriority
+from utils.dead_letter import DeadLetterReason
 from org.schemas import AgentDecision, ReasoningStep, MemoryUpdate
 from org.memory import TrackedMemory
+from org.conversation import ConversationStore, AgentConversations, default_conversation_store
+from org.context_window import ContextWindow
+from utils.tracing import get_tracer
+from utils.log import get_logger, fields
+
+_log = get_logger("agent")
+
+@dataclass
+class ModelRequest:
+    """
+    The model call behind a request: the prompt, and how the model's text
+    becomes the handler result. Lets the sync and async paths share one
+    implementation per agent (see AdvancedAgent.prepare_request).
+    """
+    prompt: str
+    finish: Callable[[str], Optional[Dict]]
+    include_conversation: bool = False
+
 
 # agents/advanced_agent.py - Add conversation context
 
 class AdvancedAgent(ABC):
     """Advanced agent with conversation memory"""
     
-    def __init__(self, name: str, role: str, model_id: str = "amazon.nova-micro-v1:0", temperature: float = 0.0, tools: Optional[List] = None):
+    def __init__(
+        self,
+        name: str,
+        role: str,
+        model_id: str = "amazon.nova-micro-v1:0",
+        temperature: float = 0.0,
+        tools: Optional[List] = None,
+        context_token_budget: Optional[int] = None,
+        summary_model_id: Optional[str] = None,
+        conversation_store: Optional[ConversationStore] = None
+    ):
         self.name = name
         self.role = role
         self.model_id = model_id
@@ -40,8 +73,17 @@ class AdvancedAgent(ABC):
         # Initialize memory
         self.memory = TrackedMemory(name)
         
-        # Conversation history per thread
-        self.conversation_history: Dict[str, List[Dict]] = {}
+        # Conversation history per thread, kept in a bounded store shared by
+        # all agents (LRU over threads, capped turns, optional disk spill)
+        self.conversation_store = conversation_store or default_conversation_store
+        self.conversation_history = AgentConversations(self.conversation_store, name)
+        
+        # Optional token budget for conversation context: older turns are
+        # folded into rolling summaries written by a cheap model
+        self.context_window: Optional[ContextWindow] = None
+        if context_token_budget:
+            self.summary_model = get_chat_model(summary_model_id or model_id, temperature=0.0)
+            self.context_window = ContextWindow(context_token_budget, summarize=self._summarize_context)
         
         # Message bus (set by orchestrator)
         self.message_bus: Optional[MessageBus] = None
@@ -53,85 +95,47 @@ class AdvancedAgent(ABC):
         # Decision history
         self.decisions: List[AgentDecision] = []
         
-        print(f"🤖 {name} ({role}) initialized")
+        _log.info("🤖 %s (%s) initialized", name, role)
     
     def connect_to_bus(self, message_bus: MessageBus):
         """Connect agent to message bus"""
         self.message_bus = message_bus
         message_bus.register_agent(self.name, self)
-        print(f"   ✅ {self.name} connected to message bus")
+        _log.info("   ✅ %s connected to message bus", self.name)
     
-    def _add_to_conversation(self, thread_id: str, role: str, content: str):
-        """Add message to conversation history"""
-        if thread_id not in self.conversation_history:
-            self.conversation_history[thread_id] = []
-        
-        self.conversation_history[thread_id].append({
-            "role": role,
-            "content": content,
-            "timestamp": datetime.now(timezone.utc).isoformat()
-        })
+    def _add_to_conversation(self, thread_id: str, role: str, content: Any):
+        """Add message to conversation history (dict content stays structured)"""
+        self.conversation_history.append(thread_id, role, content)
     
-    # agents/advanced_agent.py - Update _get_conversation_context
-
     def _get_conversation_context(self, thread_id: str, format_for_decision: bool = False) -> str:
-        """Get full conversation context for this thread"""
-        if thread_id not in self.conversation_history:
+        """
+        Conversation context for this thread: the last 10 turns, or every
+        agent's findings for the decision maker (cached per thread).
+        """
+        context = self.conversation_history.get(thread_id)
+        if context is None:
             return "No previous conversation."
-        
-        history = self.conversation_history[thread_id]
-        
-        if format_for_decision:
-            # Format specifically for decision maker to read analyses
-            context = "=== PREVIOUS TEAM ANALYSES ===\n\n"
-            
-            for i, msg in enumerate(history, 1):
-                role = msg['role']
-                content = msg['content']
-                
-                # If content is a dict, extract the key findings
-                if isinstance(content, dict):
-                    context += f"--- {role} Analysis ---\n"
-                    
-                    # Extract investigation
-                    if 'investigation' in content:
-                        context += f"INVESTIGATION FINDINGS:\n{content['investigation']}\n\n"
-                    
-                    # Extract risk analysis
-                    elif 'analysis' in content and 'risk' in role.lower():
-                        context += f"RISK ASSESSMENT:\n{content['analysis']}\n\n"
-                    
-                    # Extract financial analysis
-                    elif 'analysis' in content and 'financial' in role.lower():
-                        context += f"FINANCIAL ANALYSIS:\n{content['analysis']}\n\n"
-                    
-                    # Extract audit
-                    elif 'audit' in content:
-                        context += f"TRANSPARENCY AUDIT:\n{content['audit']}\n\n"
-                    
-                    # Generic extraction
-                    else:
-                        for key, value in content.items():
-                            if key not in ['agent', 'status', 'claim_id']:
-                                context += f"{key.upper()}: {value}\n"
-                        context += "\n"
-                else:
-                    # String content
-                    context += f"[{role}]: {str(content)[:500]}\n\n"
-            
-            return context
-        else:
-            # Original format for other agents
-            context = "Previous conversation:\n"
-            for i, msg in enumerate(history[-10:], 1):
-                context += f"{i}. [{msg['role']}]: {str(msg['content'])[:200]}...\n"
-            
-            return context
+        if self.context_window:
+            return self.context_window.render(context, format_for_decision)
+        return context.render(format_for_decision)
     
-    def _handle_message(self, message: Message):
-        """Handle a received message with conversation tracking"""
-        
-        print(f"\n⚙️  [{self.name}] Processing message from {message.sender}")
+    def _summarize_context(self, prompt: str) -> str:
+        """Summarize older conversation turns with the summary model"""
+        thread_id = self.current_thread_id
+        config = RunnableConfig(
+            metadata={"thread_id": thread_id, "agent_name": self.name},
+            tags=[self.name, "context_summary"]
+        )
+        with get_tracer().span("llm.summary", trace_id=thread_id, agent=self.name, prompt_chars=len(prompt)):
+            result = self.summary_model.invoke(prompt, config=config)
+        return result.content if hasattr(result, "content") else str(result)
+    
+    def _begin_message(self, message: Message):
+        """Track an incoming message in the conversation"""
+        if _log.isEnabledFor(logging.INFO):
+            _log.info("\n⚙️  [%s] Processing message from %s", self.name, message.sender,
+                      extra=fields(event="process", agent=self.name, id=message.id, sender=message.sender,
+                                   thread_id=message.thread_id))
         
         self.current_thread_id = message.thread_id
         
@@ -140,29 +144,38 @@ class AdvancedAgent(ABC):
             self._add_to_conversation(
                 message.thread_id,
                 f"{message.sender}",
-                str(message.content)
+                message.content
+            )
+    
+    def _finish_request(self, message: Message, response: Optional[Dict]):
+        """Record our response and send it back if required"""
+        # Add our response to conversation
+        if message.thread_id and response:
+            self._add_to_conversation(
+                message.thread_id,
+                self.name,
+                response
             )
         
+        # Send response if required
+        if message.requires_response and response:
+            self.send_message(
+                receiver=message.sender,
+                content=response,
+                thread_id=message.thread_id,
+                message_type=MessageType.RESPONSE,
+                parent_message_id=message.id
+            )
+    
+    def _handle_message(self, message: Message):
+        """Handle a received message with conversation tracking"""
+        
+        self._begin_message(message)
+        
         # Route by message type
         if message.type == MessageType.REQUEST:
             response = self.handle_request(message)
-            
-            # Add our response to conversation
-            if message.thread_id and response:
-                self._add_to_conversation(
-                    message.thread_id,
-                    self.name,
-                    str(response)
-                )
-            
-            # Send response if required
-            if message.requires_response and response:
-                self.send_message(
-                    receiver=message.sender,
-                    content=response,
-                    thread_id=message.thread_id,
-                    message_type=MessageType.RESPONSE
-                )
+            self._finish_request(message, response)
         
         elif message.type == MessageType.HANDOFF:
             self.handle_handoff(message)
@@ -172,6 +185,9 @@ class AdvancedAgent(ABC):
         
         elif message.type == MessageType.RESPONSE:
             self.handle_response(message)
+        
+        elif message.type == MessageType.NOTIFICATION:
+            self.handle_notification(message)
     
     def send_message(
         self,
@@ -179,7 +195,8 @@ class AdvancedAgent(ABC):
         content: Dict[str, Any],
         thread_id: Optional[str] = None,
         message_type: MessageType = MessageType.REQUEST,
-        priority: MessagePriority = MessagePriority.NORMAL
+        priority: MessagePriority = MessagePriority.NORMAL,
+        parent_message_id: Optional[str] = None
     ):
         """Send a message via the message bus"""
         if not self.message_bus:
@@ -191,7 +208,8 @@ class AdvancedAgent(ABC):
             content=content,
             thread_id=thread_id or self.current_thread_id,
             message_type=message_type,
-            priority=priority
+            priority=priority,
+            parent_message_id=parent_message_id
         )
     
     def broadcast(
@@ -212,6 +230,31 @@ class AdvancedAgent(ABC):
             exclude=[self.name]
         )
     
+    def subscribe(self, pattern: str):
+        """Receive messages published to topics matching pattern"""
+        if not self.message_bus:
+            raise ValueError(f"{self.name} not connected to message bus")
+        self.message_bus.subscribe(self.name, pattern)
+    
+    def publish(
+        self,
+        topic: str,
+        content: Dict[str, Any],
+        thread_id: Optional[str] = None,
+        priority: MessagePriority = MessagePriority.NORMAL
+    ):
+        """Publish a notification to a topic"""
+        if not self.message_bus:
+            raise ValueError(f"{self.name} not connected to message bus")
+        
+        return self.message_bus.publish(
+            sender=self.name,
+            topic=topic,
+            content=content,
+            thread_id=thread_id or self.current_thread_id,
+            priority=priority
+        )
+    
     def process_messages(self, max_messages: int = 10, timeout: float = 0.1):
         """
         Process pending messages from queue.
@@ -230,11 +273,93 @@ class AdvancedAgent(ABC):
             if message is None:
                 break
             
-            self._handle_message(message)
+            start = time.perf_counter()
+            try:
+                self._handle_message(message)
+            except Exception as e:
+                self._record_handler_time(start, failed=True)
+                self._dead_letter(message, e)
+                raise
+            self._record_handler_time(start)
             processed += 1
         
         if processed > 0:
-            print(f"   ✅ {self.name} processed {processed} messages")
+            _log.info("   ✅ %s processed %d messages", self.name, processed)
+    
+    def serve(self, stop_event: Optional[threading.Event] = None, timeout: float = 0.5):
+        """
+        Process messages until stop_event is set.
+        
+        Used on remote nodes, where no orchestrator drives the agent directly.
+        """
+        stop_event = stop_event or threading.Event()
+        _log.info("🛰️  %s serving messages", self.name)
+        while not stop_event.is_set():
+            try:
+                self.process_messages(max_messages=10, timeout=timeout)
+            except Exception as e:
+                # Already dead-lettered; keep serving
+                _log.warning("⚠️  %s handler failed: %s", self.name, e)
+    
+    async def _ahandle_message(self, message: Message):
+        """Async counterpart of _handle_message (requests go through ahandle_request)"""
+        if message.type != MessageType.REQUEST:
+            self._handle_message(message)
+            return
+        
+        self._begin_message(message)
+        response = await self.ahandle_request(message)
+        self._finish_request(message, response)
+    
+    async def aserve(self, stop_event: Optional[asyncio.Event] = None, max_concurrency: int = 100):
+        """
+        Async agent loop for an AsyncMessageBus.
+        
+        Each message is handled in its own task (at most max_concurrency at
+        once), so many claim threads share one event loop.
+        """
+        if not self.message_bus:
+            raise ValueError(f"{self.name} not connected to message bus")
+        
+        slots = asyncio.Semaphore(max_concurrency)
+        tasks: set = set()
+        
+        async def handle(message: Message):
+            start = time.perf_counter()
+            try:
+                await self._ahandle_message(message)
+                self._record_handler_time(start)
+            except Exception as e:
+                self._record_handler_time(start, failed=True)
+                _log.warning("⚠️  %s failed on message %s: %s", self.name, message.id, e)
+                self._dead_letter(message, e)
+            finally:
+                slots.release()
+        
+        _log.info("🛰️  %s serving messages (async)", self.name)
+        try:
+            async for message in self.message_bus.messages(self.name, stop=stop_event):
+                await slots.acquire()
+                task = asyncio.create_task(handle(message))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+        finally:
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+    
+    def _record_handler_time(self, start: float, failed: bool = False):
+        """Report handler duration to the bus metrics (if the bus keeps them)"""
+        if self.message_bus and hasattr(self.message_bus, "record_handler_time"):
+            self.message_bus.record_handler_time(self.name, time.perf_counter() - start, failed)
+    
+    def _dead_letter(self, message: Message, error: Exception):
+        """Report a message whose handler raised to the bus's dead-letter queue"""
+        if self.message_bus and hasattr(self.message_bus, "dead_letter"):
+            self.message_bus.dead_letter(
+                message,
+                DeadLetterReason.HANDLER_FAILED,
+                f"{self.name}: {type(error).__name__}: {error}"
+            )
     
     def get_stats(self) -> Dict[str, Any]:
         """Get agent statistics"""
@@ -258,12 +383,57 @@ class AdvancedAgent(ABC):
             "decisions_made": len(self.decisions),
             "memory_items": memory_items,
             "pending_messages": pending_messages,
-            "conversation_threads": len(self.conversation_history)
+            "conversation_threads": len(self.conversation_history),
+            "conversation_store": self.conversation_store.get_stats(self.name),
+            "context_window": self.context_window.get_stats() if self.context_window else None
         }
     
+    def prepare_request(self, message: Message) -> ModelRequest:
+        """
+        Build the model call for a request - implemented by subclasses whose
+        request handling is one model call (used by both handle_request and
+        ahandle_request)
+        """
+        raise NotImplementedError("Subclasses must implement prepare_request or handle_request")
+    
     def handle_request(self, message: Message) -> Optional[Dict]:
-        """Handle a request message - to be implemented by subclasses"""
-        raise NotImplementedError("Subclasses must implement handle_request")
+        """Handle a request message (prepare_request → call_model → finish)"""
+        request = self.prepare_request(message)
+        response = self.call_model(
+            request.prompt,
+            thread_id=message.thread_id,
+            include_conversation=request.include_conversation
+        )
+        return request.finish(response)
+    
+    async def ahandle_request(self, message: Message) -> Optional[Dict]:
+        """
+        Async request handler used by aserve.
+        
+        Agents built on prepare_request await acall_model on the event loop.
+        Agents that only override handle_request run it in a worker thread.
+        """
+        if type(self).prepare_request is AdvancedAgent.prepare_request:
+            return await asyncio.to_thread(self.handle_request, message)
+        
+        # A context window may call the summary model: keep that off the loop
+        if self.context_window:
+            request = await asyncio.to_thread(self.prepare_request, message)
+        else:
+            request = self.prepare_request(message)
+        response = await self.acall_model(
+            request.prompt,
+            thread_id=message.thread_id,
+            include_conversation=request.include_conversation
+        )
+        return request.finish(response)
+    
+    def accept_speculative(self, response: Dict, thread_id: str):
+        """
+        Adopt a response given on a speculative side thread once the
+        orchestrator keeps it: it joins the conversation of thread_id.
+        """
+        self._add_to_conversation(thread_id, self.name, response)
     
     def handle_handoff(self, message: Message):
         """Handle a handoff message - to be implemented by subclasses"""
@@ -277,6 +447,10 @@ class AdvancedAgent(ABC):
         """Handle a response message - to be implemented by subclasses"""
         pass
     
+    def handle_notification(self, message: Message):
+        """Handle a published topic message (message.topic) - to be implemented by subclasses"""
+        pass
+    
     def call_model(
         self,
         prompt: str,
@@ -300,6 +474,49 @@ class AdvancedAgent(ABC):
         """
         
         thread_id = thread_id or self.current_thread_id
+        full_prompt, config = self._prepare_model_call(prompt, thread_id, include_conversation)
+        
+        # Call model
+        with get_tracer().span("llm.call", trace_id=thread_id, agent=self.name, model=self.model_id, prompt_chars=len(full_prompt)) as span:
+            result = self.model.invoke(full_prompt, config=config)
+            response = result.content if hasattr(result, "content") else str(result)
+            if span:
+                span.set("response_chars", len(response))
+        
+        if _log.isEnabledFor(logging.INFO):
+            _log.info("   ✅ Response: %d chars", len(response),
+                      extra=fields(event="model_response", agent=self.name, thread_id=thread_id, chars=len(response)))
+        
+        return response
+    
+    async def acall_model(
+        self,
+        prompt: str,
+        thread_id: Optional[str] = None,
+        include_conversation: bool = True
+    ) -> str:
+        """Async call_model using the chat model's ainvoke"""
+        
+        thread_id = thread_id or self.current_thread_id
+        if include_conversation and self.context_window:
+            full_prompt, config = await asyncio.to_thread(self._prepare_model_call, prompt, thread_id, include_conversation)
+        else:
+            full_prompt, config = self._prepare_model_call(prompt, thread_id, include_conversation)
+        
+        with get_tracer().span("llm.call", trace_id=thread_id, agent=self.name, model=self.model_id, prompt_chars=len(full_prompt), mode="async") as span:
+            result = await self.model.ainvoke(full_prompt, config=config)
+            response = result.content if hasattr(result, "content") else str(result)
+            if span:
+                span.set("response_chars", len(response))
+        
+        if _log.isEnabledFor(logging.INFO):
+            _log.info("   ✅ Response: %d chars", len(response),
+                      extra=fields(event="model_response", agent=self.name, thread_id=thread_id, chars=len(response)))
+        
+        return response
+    
+    def _prepare_model_call(self, prompt: str, thread_id: Optional[str], include_conversation: bool):
+        """Full prompt (with conversation context) and tracing config"""
         
         # Build full prompt with conversation context
         if include_conversation and thread_id:
@@ -313,7 +530,10 @@ Respond considering the full conversation history above."""
         else:
             full_prompt = prompt
         
-        print(f"   🤖 {self.name} calling model (with context: {include_conversation})...")
+        if _log.isEnabledFor(logging.INFO):
+            _log.info("   🤖 %s calling model (with context: %s)...", self.name, include_conversation,
+                      extra=fields(event="model_call", agent=self.name, model=self.model_id, thread_id=thread_id,
+                                   prompt_chars=len(full_prompt), include_conversation=include_conversation))
         
         # Configure tracing
         config = RunnableConfig(
@@ -326,10 +546,4 @@ Respond considering the full conversation history above."""
             tags=[self.name, self.role, "agent_call"]
         )
         
-        # Call model
-        result = self.model.invoke(full_prompt, config=config)
-        response = result.content if hasattr(result, "content") else str(result)
-        
-        print(f"   ✅ Response: {len(response)} chars")
-        
-        return response
\ No newline at end of file
+        return full_prompt, config
\ No newline at end of file
@@ -4,8 +4,9 @@ from org.schemas import TransparencyReport, ReasoningStep
 from typing import List, Dict
 import json
 from .base_agent import BaseAgent
-from .advanced_agent import AdvancedAgent
+from .advanced_agent import AdvancedAgent, ModelRequest
 from utils.message_bus import Message
+from org.context_window import DEFAULT_CONTEXT_TOKENS
 import datetime
 from datetime import timezone
 
@@ -16,13 +17,14 @@ class AuditorAgent(AdvancedAgent):
         super().__init__(
             name="TransparencyAuditor",
             role="Transparency & Compliance Auditor",
-            model_id="amazon.nova-micro-v1:0"
+            model_id="amazon.nova-micro-v1:0",
+            context_token_budget=DEFAULT_CONTEXT_TOKENS
         )
         self.audits = []
     
     # agents/auditor_agent.py
 
-    def handle_request(self, message: Message) -> dict:
+    def prepare_request(self, message: Message) -> ModelRequest:
         """Handle audit request with full conversation context"""
         
         claim_id = message.content.get("claim_id", "UNKNOWN")
@@ -54,14 +56,15 @@ class AuditorAgent(AdvancedAgent):
     }}
     """
         
-        response = self.call_model(prompt, thread_id=message.thread_id, include_conversation=True)
+        def finish(response: str) -> dict:
+            return {
+                "agent": self.name,
+                "audit": response,
+                "claim_id": claim_id,
+                "status": "completed"
+            }
         
-        return {
-            "agent": self.name,
-            "audit": response,
-            "claim_id": claim_id,
-            "status": "completed"
-        }
+        return ModelRequest(prompt, finish, include_conversation=True)
 
     
     def audit_decision(self, agent_decision: Dict, thread_id: str | None = None) -> TransparencyReport:
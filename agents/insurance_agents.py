@@ -1,7 +1,8 @@
 # agents/insurance_investigator.py
-from agents.advanced_agent import AdvancedAgent
+from agents.advanced_agent import AdvancedAgent, ModelRequest
 from utils.message_bus import Message
 from typing import Optional, Dict
+from org.context_window import DEFAULT_CONTEXT_TOKENS, clip_to_tokens
 
 # Load the core behavior prompt (shared across all agents)
 CORE_INSURANCE_PROTOCOL = """
@@ -63,7 +64,7 @@ class SIUInvestigatorAgent(AdvancedAgent):
         )
         self.investigations = {}
     
-    def handle_request(self, message: Message) -> Optional[Dict]:
+    def prepare_request(self, message: Message) -> ModelRequest:
         """Handle fraud investigation request"""
         
         claim_data = message.content.get("claim", {})
@@ -74,6 +75,15 @@ class SIUInvestigatorAgent(AdvancedAgent):
         # Get any previous context
         conversation_context = self._get_conversation_context(message.thread_id)
         
+        # Batch pre-score (if the claim was scored before dispatch)
+        prescore_context = ""
+        if "fraud_prescore" in claim_data:
+            signals = claim_data.get("fraud_signals", {})
+            prescore_context = (
+                f"- Automated Fraud Pre-Score: {claim_data['fraud_prescore']:.0%} "
+                f"(statistical prior, not evidence; signals: {signals})\n"
+            )
+        
         # Build investigation prompt
         prompt = f"""{CORE_INSURANCE_PROTOCOL}
 
@@ -116,36 +126,33 @@ CLAIM TO INVESTIGATE:
 - Type: {claim_data.get('claim_type', 'Unknown')}
 - Amount: ${claim_data.get('claim_amount', 0):,.2f}
 - Description: {claim_data.get('description', 'No description provided')}
-
+{prescore_context}
 Conduct your investigation and provide your findings in Slack-style format.
 """
         
-        # Call model
-        response = self.call_model(
-            prompt,
-            thread_id=message.thread_id,
-            include_conversation=False  # We included it manually
-        )
-        
-        # Store investigation
-        self.investigations[claim_id] = response
-        
-        # Store in memory
-        self.memory.set(
-            f"siu_investigation_{claim_id}",
-            response,
-            "SIU investigation completed with confidence assessment",
-            thread_id=message.thread_id
-        )
-        
-        print(f"   ✅ Investigation complete")
+        def finish(response: str) -> Dict:
+            # Store investigation
+            self.investigations[claim_id] = response
+            
+            # Store in memory
+            self.memory.set(
+                f"siu_investigation_{claim_id}",
+                response,
+                "SIU investigation completed with confidence assessment",
+                thread_id=message.thread_id
+            )
+            
+            print(f"   ✅ Investigation complete")
+            
+            return {
+                "agent": self.name,
+                "investigation": response,
+                "claim_id": claim_id,
+                "status": "completed"
+            }
         
-        return {
-            "agent": self.name,
-            "investigation": response,
-            "claim_id": claim_id,
-            "status": "completed"
-        }
+        # Conversation context is included in the prompt manually
+        return ModelRequest(prompt, finish)
 
 
 class ClaimsAdjusterAgent(AdvancedAgent):
@@ -165,7 +172,7 @@ class ClaimsAdjusterAgent(AdvancedAgent):
         )
         self.adjustments = {}
     
-    def handle_request(self, message: Message) -> Optional[Dict]:
+    def prepare_request(self, message: Message) -> ModelRequest:
         """Handle claims adjustment request"""
         
         claim_data = message.content.get("claim", {})
@@ -225,30 +232,52 @@ Review this claim considering:
 Provide your adjustment recommendation in Slack-style format.
 """
         
-        response = self.call_model(
-            prompt,
-            thread_id=message.thread_id,
-            include_conversation=False
-        )
-        
-        # Store adjustment
-        self.adjustments[claim_id] = response
-        
-        self.memory.set(
-            f"claims_adjustment_{claim_id}",
-            response,
-            "Claims adjustment with bad faith risk assessment",
-            thread_id=message.thread_id
-        )
-        
-        print(f"   ✅ Adjustment complete")
+        def finish(response: str) -> Dict:
+            # Store adjustment
+            self.adjustments[claim_id] = response
+            
+            self.memory.set(
+                f"claims_adjustment_{claim_id}",
+                response,
+                "Claims adjustment with bad faith risk assessment",
+                thread_id=message.thread_id
+            )
+            
+            print(f"   ✅ Adjustment complete")
+            
+            return {
+                "agent": self.name,
+                "adjustment": response,
+                "claim_id": claim_id,
+                "status": "completed"
+            }
         
-        return {
-            "agent": self.name,
-            "adjustment": response,
-            "claim_id": claim_id,
-            "status": "completed"
-        }
+        return ModelRequest(prompt, finish)
+
+
+# Per-stage cap when earlier stage results are rendered into a prompt
+STAGE_RESULT_TOKENS = 600
+
+
+def format_stage_results(results: Optional[Dict], max_tokens: int = STAGE_RESULT_TOKENS) -> str:
+    """Render {stage: response} from earlier workflow stages for a prompt"""
+    if not results:
+        return "No stage results provided."
+    
+    blocks = []
+    for stage, result in results.items():
+        if isinstance(result, dict):
+            agent = result.get("agent", "unknown")
+            body = "\n".join(
+                f"{key}: {value}" for key, value in result.items()
+                if key not in ("agent", "claim_id", "status")
+            )
+            if result.get("status") not in (None, "completed"):
+                body = f"status: {result['status']}\n{body}".rstrip()
+        else:
+            agent, body = "unknown", str(result)
+        blocks.append(f"[{stage}] ({agent})\n{clip_to_tokens(body, max_tokens).rstrip()}\n")
+    return "\n".join(blocks)
 
 
 class ClaimsManagerAgent(AdvancedAgent):
@@ -264,20 +293,24 @@ class ClaimsManagerAgent(AdvancedAgent):
         super().__init__(
             name="ClaimsManager",
             role="Claims Manager - Final Authority",
-            model_id=model_id
+            model_id=model_id,
+            context_token_budget=DEFAULT_CONTEXT_TOKENS
         )
         self.final_decisions = {}
     
-    def handle_request(self, message: Message) -> Optional[Dict]:
+    def prepare_request(self, message: Message) -> ModelRequest:
         """Make final binding decision"""
         
         claim_data = message.content.get("claim", {})
         claim_id = message.content.get("claim_id", "UNKNOWN")
         
-        print(f"   ⚖️  Manager making final decision for {claim_id}")
+        speculative = message.content.get("speculative", False)
+        
+        print(f"   ⚖️  Manager making {'speculative ' if speculative else ''}final decision for {claim_id}")
         
         # Get full conversation (all team input)
         conversation_context = self._get_conversation_context(message.thread_id)
+        stage_results = format_stage_results(message.content.get("upstream_results"))
         
         prompt = f"""{CORE_INSURANCE_PROTOCOL}
 
@@ -320,6 +353,9 @@ Response Style (Slack):
 TEAM ANALYSES:
 {conversation_context}
 
+STAGE RESULTS:
+{stage_results}
+
 CLAIM DETAILS:
 - Claim ID: {claim_id}
 - Claimant: {claim_data.get('claimant_name', 'Unknown')}
@@ -330,20 +366,34 @@ Based on all team input above, make your FINAL BINDING DECISION.
 Justify it with explicit cost-benefit analysis.
 """
         
-        response = self.call_model(
-            prompt,
-            thread_id=message.thread_id,
-            include_conversation=False
-        )
+        def finish(response: str) -> Dict:
+            # A speculative decision is only recorded once the orchestrator keeps it
+            if not speculative:
+                self._record_decision(claim_id, response, message.thread_id)
+            
+            return {
+                "agent": self.name,
+                "decision": response,
+                "claim_id": claim_id,
+                "status": "completed"
+            }
         
-        # Store decision
+        return ModelRequest(prompt, finish)
+    
+    def accept_speculative(self, response: Dict, thread_id: str):
+        """Record a speculative decision the orchestrator kept"""
+        super().accept_speculative(response, thread_id)
+        self._record_decision(response.get("claim_id", "UNKNOWN"), response.get("decision", ""), thread_id)
+    
+    def _record_decision(self, claim_id: str, response: str, thread_id: str):
+        """Store and announce a final binding decision"""
         self.final_decisions[claim_id] = response
         
         self.memory.set(
             f"final_decision_{claim_id}",
             response,
             "Final binding decision with cost-benefit justification",
-            thread_id=message.thread_id
+            thread_id=thread_id
         )
         
         # Print decision prominently
@@ -353,11 +403,4 @@ Justify it with explicit cost-benefit analysis.
         print(f"Claim: {claim_id}")
         print(f"{'='*70}")
         print(response)
-        print(f"{'='*70}\n")
-        
-        return {
-            "agent": self.name,
-            "decision": response,
-            "claim_id": claim_id,
-            "status": "completed"
-        }
\ No newline at end of file
+        print(f"{'='*70}\n")
\ No newline at end of file
@@ -0,0 +1,10 @@
+# benchmarks/__init__.py
+"""
+Claim-processing benchmarks.
+
+Run the main suite with:
+    python -m benchmarks.run --claims 50 --latency 0.05
+
+Compare two saved runs with:
+    python -m benchmarks.compare benchmarks/results/A.json benchmarks/results/B.json
+"""
@@ -0,0 +1,108 @@
+# benchmarks/bench_bus_contention.py
+"""
+MessageBus Contention Benchmark
+
+Many producer threads sending to a set of consumer agents, optionally with
+a slow message callback registered. Reports throughput and per-send latency
+percentiles for inline callbacks (callback_workers=0) and pooled callbacks.
+
+    python -m benchmarks.bench_bus_contention --producers 16 --callback-ms 1
+"""
+
+from typing import Dict, Any, List
+import argparse
+import threading
+import time
+
+from benchmarks.common import measure, percentiles, save_results, quiet
+
+
+def bench_contention(
+    producers: int,
+    consumers: int,
+    messages: int,
+    callback_ms: float,
+    callback_workers: int
+) -> Dict[str, Any]:
+    from utils.message_bus import MessageBus, MessageType
+
+    with quiet():
+        bus = MessageBus(callback_workers=callback_workers)
+        for i in range(consumers):
+            bus.register_agent(f"consumer-{i}", None)
+        for i in range(producers):
+            bus.register_agent(f"producer-{i}", None)
+
+        if callback_ms:
+            def slow_callback(message):
+                time.sleep(callback_ms / 1000)
+            bus.register_callback(MessageType.REQUEST, slow_callback)
+
+    per_producer = messages // producers
+    latencies: List[List[float]] = [[] for _ in range(producers)]
+
+    def produce(index: int):
+        record = latencies[index]
+        for n in range(per_producer):
+            start = time.perf_counter()
+            bus.send(f"producer-{index}", f"consumer-{n % consumers}", {"n": n}, thread_id=f"claim-{index}-{n % 10}")
+            record.append(time.perf_counter() - start)
+
+    def consume(index: int, expected: int):
+        for _ in range(expected):
+            bus.receive(f"consumer-{index}", timeout=10)
+
+    total = per_producer * producers
+    expected = [total // consumers + (1 if i < total % consumers else 0) for i in range(consumers)]
+
+    with quiet(), measure(trace_memory=False) as m:
+        threads = [threading.Thread(target=produce, args=(i,)) for i in range(producers)]
+        threads += [threading.Thread(target=consume, args=(i, expected[i])) for i in range(consumers)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+    bus.callback_dispatcher.shutdown()
+
+    return {
+        "messages": total,
+        "messages_per_second": round(total / m.wall_seconds, 2) if m.wall_seconds else None,
+        "send_latency": percentiles([x for record in latencies for x in record]),
+        "callback_inline_runs": bus.callback_dispatcher.get_stats()["inline_runs"],
+        **m.to_dict()
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MessageBus contention benchmark")
+    parser.add_argument("--producers", type=int, default=16)
+    parser.add_argument("--consumers", type=int, default=4)
+    parser.add_argument("--messages", type=int, default=8000)
+    parser.add_argument("--callback-ms", type=float, default=0.5, help="Latency of the registered callback (0 = none)")
+    parser.add_argument("--callback-workers", default="0,4", help="callback_workers settings to compare")
+    parser.add_argument("--output-dir", default=None)
+    args = parser.parse_args()
+
+    results: Dict[str, Any] = {
+        "config": {
+            "producers": args.producers,
+            "consumers": args.consumers,
+            "messages": args.messages,
+            "callback_ms": args.callback_ms
+        }
+    }
+
+    print(f"🏁 Contention benchmark: {args.producers} producers → {args.consumers} consumers")
+    for workers in (int(w) for w in args.callback_workers.split(",") if w.strip()):
+        key = f"callback_workers_{workers}"
+        results[key] = bench_contention(args.producers, args.consumers, args.messages, args.callback_ms, workers)
+        print(f"   callback workers {workers}: {results[key]['messages_per_second']} msg/s, "
+              f"p99 send {results[key]['send_latency'].get('p99')}s")
+
+    save_results("bus_contention", results, args.output_dir)
+    return results
+
+
+if __name__ == "__main__":
+    main()
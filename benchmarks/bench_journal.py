@@ -0,0 +1,109 @@
+# benchmarks/bench_journal.py
+"""
+MessageBus Journal Benchmark
+
+Messages/second through a durable MessageBus at different group-commit
+settings, against the in-memory bus as a baseline.
+
+    python -m benchmarks.bench_journal --messages 5000 --senders 4
+"""
+
+from typing import Dict, Any, Optional
+import argparse
+import shutil
+import tempfile
+import threading
+import os
+
+from benchmarks.common import measure, save_results, quiet
+
+
+def bench_bus(
+    messages: int,
+    senders: int,
+    fsync_every: Optional[int],
+    wait_for_sync: bool,
+    directory: str
+) -> Dict[str, Any]:
+    from utils.message_bus import MessageBus
+    from utils.journal import MessageJournal
+
+    journal = None
+    if fsync_every is not None:
+        path = os.path.join(directory, f"bus-{fsync_every}-{int(wait_for_sync)}.journal")
+        journal = MessageJournal(path, fsync_every=fsync_every, wait_for_sync=wait_for_sync)
+
+    with quiet():
+        bus = MessageBus(journal=journal)
+        bus.register_agent("consumer", None)
+        for i in range(senders):
+            bus.register_agent(f"sender-{i}", None)
+
+    per_sender = messages // senders
+
+    def produce(index: int):
+        for n in range(per_sender):
+            bus.send(f"sender-{index}", "consumer", {"n": n}, thread_id=f"bench-{index}")
+
+    def consume():
+        for _ in range(per_sender * senders):
+            bus.receive("consumer", timeout=5)
+
+    with quiet(), measure(trace_memory=False) as m:
+        threads = [threading.Thread(target=produce, args=(i,)) for i in range(senders)]
+        threads.append(threading.Thread(target=consume))
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+    result = {
+        "messages": per_sender * senders,
+        "messages_per_second": round(per_sender * senders / m.wall_seconds, 2) if m.wall_seconds else None,
+        **m.to_dict()
+    }
+    if journal:
+        result["fsyncs"] = journal.get_stats()["fsyncs"]
+        journal.close()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MessageBus journal benchmark")
+    parser.add_argument("--messages", type=int, default=5000)
+    parser.add_argument("--senders", type=int, default=4)
+    parser.add_argument("--batches", default="1,8,64,512", help="fsync_every settings to compare")
+    parser.add_argument("--wait-for-sync", action="store_true", help="Senders block until their record is synced")
+    parser.add_argument("--dir", default=None, help="Journal directory (default: temporary)")
+    parser.add_argument("--output-dir", default=None)
+    args = parser.parse_args()
+
+    directory = args.dir or tempfile.mkdtemp(prefix="bench-journal-")
+    batches = [int(b) for b in args.batches.split(",") if b.strip()]
+
+    results: Dict[str, Any] = {
+        "config": {
+            "messages": args.messages,
+            "senders": args.senders,
+            "wait_for_sync": args.wait_for_sync
+        }
+    }
+
+    print(f"🏁 Journal benchmark: {args.messages} messages, {args.senders} senders")
+    try:
+        results["memory"] = bench_bus(args.messages, args.senders, None, False, directory)
+        print(f"   in-memory: {results['memory']['messages_per_second']} msg/s")
+        for batch in batches:
+            key = f"fsync_every_{batch}"
+            results[key] = bench_bus(args.messages, args.senders, batch, args.wait_for_sync, directory)
+            print(f"   fsync every {batch}: {results[key]['messages_per_second']} msg/s ({results[key]['fsyncs']} fsyncs)")
+    finally:
+        if not args.dir:
+            shutil.rmtree(directory, ignore_errors=True)
+
+    save_results("journal", results, args.output_dir)
+    return results
+
+
+if __name__ == "__main__":
+    main()
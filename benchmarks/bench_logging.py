@@ -0,0 +1,79 @@
+# benchmarks/bench_logging.py
+"""
+Logging Overhead Benchmark
+
+MessageBus send + receive throughput with the "claims" loggers at INFO
+(every message logged, synchronous and queue-based output) vs. WARNING
+(hot-path records skipped before any formatting). Output goes to a temp
+file, so the numbers reflect formatting and I/O rather than a terminal.
+
+    python -m benchmarks.bench_logging --messages 20000
+"""
+
+from typing import Dict, Any
+import argparse
+import tempfile
+
+from benchmarks.common import measure, save_results
+
+
+MODES = {
+    "info_sync": {"level": "INFO", "asynchronous": False},
+    "info_async": {"level": "INFO", "asynchronous": True},
+    "info_sampled": {"level": "INFO", "asynchronous": True, "sample": {"bus": 0.01}},
+    "warning": {"level": "WARNING", "asynchronous": True}
+}
+
+
+def bench_mode(messages: int, agents: int, **config) -> Dict[str, Any]:
+    from utils.log import configure_logging
+    from utils.message_bus import MessageBus
+
+    with tempfile.TemporaryFile("w+", encoding="utf-8") as sink:
+        configure_logging(stream=sink, **config)
+        try:
+            bus = MessageBus()
+            names = [f"agent-{i}" for i in range(agents)]
+            for name in names:
+                bus.register_agent(name, None)
+
+            with measure(trace_memory=False) as m:
+                for n in range(messages):
+                    receiver = names[n % agents]
+                    bus.send("Orchestrator", receiver, {"n": n}, thread_id=f"claim-{n % 100}")
+                    bus.receive(receiver, timeout=1)
+        finally:
+            # Drains queued records (untimed: senders only enqueue them)
+            # and restores the default configuration
+            configure_logging()
+        bus.callback_dispatcher.shutdown()
+        log_bytes = sink.tell()
+
+    return {
+        "messages": messages,
+        "messages_per_second": round(messages / m.wall_seconds, 2) if m.wall_seconds else None,
+        "log_bytes": log_bytes,
+        **m.to_dict()
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Logging overhead benchmark")
+    parser.add_argument("--messages", type=int, default=20000)
+    parser.add_argument("--agents", type=int, default=4)
+    parser.add_argument("--output-dir", default=None)
+    args = parser.parse_args()
+
+    results: Dict[str, Any] = {"config": {"messages": args.messages, "agents": args.agents}}
+
+    print(f"🏁 Logging benchmark: {args.messages} messages")
+    for mode, config in MODES.items():
+        results[mode] = bench_mode(args.messages, args.agents, **config)
+        print(f"   {mode}: {results[mode]['messages_per_second']} msg/s ({results[mode]['log_bytes']} log bytes)")
+
+    save_results("logging", results, args.output_dir)
+    return results
+
+
+if __name__ == "__main__":
+    main()
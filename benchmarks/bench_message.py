@@ -0,0 +1,113 @@
+# benchmarks/bench_message.py
+"""
+Message Representation Benchmark
+
+- Memory per Message (tracemalloc over many live instances)
+- Encode/decode throughput: JSON (to_dict/from_dict) vs. the binary codec,
+  plus header-only reads through MessageView (payload left undecoded)
+
+    python -m benchmarks.bench_message --messages 50000
+"""
+
+from typing import Dict, Any, List
+import argparse
+import json
+import time
+import tracemalloc
+
+from benchmarks.common import save_results
+
+
+def _make_messages(count: int, payload_words: int) -> List[Any]:
+    from utils.message_bus import Message, MessageType, MessagePriority
+
+    agents = ["SIU_Investigator", "ClaimsAdjuster", "TransparencyAuditor", "ClaimsManager", "Orchestrator"]
+    text = " ".join(f"word{i}" for i in range(payload_words))
+    return [
+        Message(
+            type=MessageType.REQUEST,
+            priority=MessagePriority.HIGH,
+            sender=agents[i % 5],
+            receiver=agents[(i + 1) % 5],
+            thread_id=f"claim-{i // 4}",
+            content={"claim_id": f"CLM-{i}", "stage": "investigation", "description": text, "amount": 1000.0 + i},
+            metadata={"fraud_prescore": 0.42} if i % 2 else {}
+        )
+        for i in range(count)
+    ]
+
+
+def bench_memory(count: int, payload_words: int) -> Dict[str, Any]:
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    messages = _make_messages(count, payload_words)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return {
+        "messages": len(messages),
+        "bytes_per_message": round((after - before) / count, 1)
+    }
+
+
+def _rate(count: int, seconds: float) -> float:
+    return round(count / seconds, 1) if seconds else None
+
+
+def bench_codecs(count: int, payload_words: int) -> Dict[str, Any]:
+    from utils.message_bus import Message
+    from utils import message_codec
+
+    messages = _make_messages(count, payload_words)
+    results: Dict[str, Any] = {"payload_codec": message_codec.codec_name()}
+
+    start = time.perf_counter()
+    encoded_json = [json.dumps(m.to_dict()).encode("utf-8") for m in messages]
+    results["json_encode_per_second"] = _rate(count, time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for data in encoded_json:
+        Message.from_dict(json.loads(data))
+    results["json_decode_per_second"] = _rate(count, time.perf_counter() - start)
+
+    start = time.perf_counter()
+    encoded = [message_codec.encode(m) for m in messages]
+    results["binary_encode_per_second"] = _rate(count, time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for data in encoded:
+        message_codec.decode(data)
+    results["binary_decode_per_second"] = _rate(count, time.perf_counter() - start)
+
+    # Routing only needs the header: payload stays a memoryview
+    start = time.perf_counter()
+    for data in encoded:
+        message_codec.MessageView(data).receiver
+    results["binary_header_only_per_second"] = _rate(count, time.perf_counter() - start)
+
+    results["json_bytes_per_message"] = round(sum(map(len, encoded_json)) / count, 1)
+    results["binary_bytes_per_message"] = round(sum(map(len, encoded)) / count, 1)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Message memory and codec benchmark")
+    parser.add_argument("--messages", type=int, default=50000)
+    parser.add_argument("--payload-words", type=int, default=40)
+    parser.add_argument("--output-dir", default=None)
+    args = parser.parse_args()
+
+    results: Dict[str, Any] = {"config": {"messages": args.messages, "payload_words": args.payload_words}}
+
+    print(f"🏁 Message benchmark: {args.messages} messages")
+    results["memory"] = bench_memory(args.messages, args.payload_words)
+    print(f"   memory: {results['memory']['bytes_per_message']} bytes/message")
+    results["codec"] = bench_codecs(args.messages, args.payload_words)
+    for key, value in results["codec"].items():
+        print(f"   {key}: {value}")
+
+    save_results("message", results, args.output_dir)
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+# benchmarks/common.py
+"""
+Shared benchmark helpers: measurement, percentiles and result files.
+"""
+
+from typing import Dict, List, Any, Optional
+from contextlib import contextmanager
+from datetime import datetime, timezone
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+
+def percentiles(values: List[float], points=(50, 90, 95, 99)) -> Dict[str, float]:
+    """Nearest-rank percentiles plus min/max/mean"""
+    if not values:
+        return {}
+    ordered = sorted(values)
+    n = len(ordered)
+    summary = {f"p{p}": ordered[min(n - 1, max(0, int(round(p / 100 * n)) - 1))] for p in points}
+    summary["min"] = ordered[0]
+    summary["max"] = ordered[-1]
+    summary["mean"] = sum(ordered) / n
+    summary["count"] = n
+    return {k: round(v, 6) if isinstance(v, float) else v for k, v in summary.items()}
+
+
+class Measurement:
+    """Wall time, CPU time and peak traced memory of a block"""
+
+    def __init__(self):
+        self.wall_seconds = 0.0
+        self.cpu_seconds = 0.0
+        self.peak_memory_bytes = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "wall_seconds": round(self.wall_seconds, 6),
+            "cpu_seconds": round(self.cpu_seconds, 6),
+            "peak_memory_bytes": self.peak_memory_bytes
+        }
+
+
+@contextmanager
+def measure(trace_memory: bool = True):
+    """Measure a block (tracemalloc adds overhead; disable for tight loops)"""
+    result = Measurement()
+    if trace_memory:
+        tracemalloc.start()
+    wall, cpu = time.perf_counter(), time.process_time()
+    try:
+        yield result
+    finally:
+        result.wall_seconds = time.perf_counter() - wall
+        result.cpu_seconds = time.process_time() - cpu
+        if trace_memory:
+            result.peak_memory_bytes = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=os.path.dirname(RESULTS_DIR),
+            stderr=subprocess.DEVNULL
+        ).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def save_results(name: str, results: Dict[str, Any], output_dir: Optional[str] = None) -> str:
+    """Write a benchmark result file tagged with commit and environment"""
+    output_dir = output_dir or RESULTS_DIR
+    os.makedirs(output_dir, exist_ok=True)
+
+    commit = git_commit()
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    path = os.path.join(output_dir, f"{name}_{stamp}_{commit or 'nogit'}.json")
+
+    document = {
+        "benchmark": name,
+        "timestamp": stamp,
+        "commit": commit,
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "results": results
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(document, f, indent=2, default=str)
+
+    print(f"💾 Results saved: {path}")
+    return path
+
+
+@contextmanager
+def quiet(enabled: bool = True):
+    """Silence the per-operation output of the system under test"""
+    if not enabled:
+        yield
+        return
+    from utils.log import ROOT, flush_logging
+    
+    logger = logging.getLogger(ROOT)
+    level = logger.level
+    logger.setLevel(logging.WARNING)
+    stdout = sys.stdout
+    with open(os.devnull, "w") as devnull:
+        sys.stdout = devnull
+        try:
+            yield
+        finally:
+            # Queued records are written before stdout comes back
+            flush_logging()
+            sys.stdout = stdout
+            logger.setLevel(level)
@@ -0,0 +1,54 @@
+# benchmarks/compare.py
+"""
+Compare two saved benchmark result files.
+
+    python -m benchmarks.compare OLD.json NEW.json
+"""
+
+from typing import Dict, Any, Iterator, Tuple
+import argparse
+import json
+
+
+def _flatten(data: Any, prefix: str = "") -> Iterator[Tuple[str, float]]:
+    if isinstance(data, dict):
+        for key, value in data.items():
+            yield from _flatten(value, f"{prefix}.{key}" if prefix else key)
+    elif isinstance(data, (int, float)) and not isinstance(data, bool):
+        yield prefix, float(data)
+
+
+def compare(old: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, Dict[str, float]]:
+    """Numeric metrics present in both runs with their relative change"""
+    old_metrics = dict(_flatten(old.get("results", old)))
+    new_metrics = dict(_flatten(new.get("results", new)))
+
+    diff = {}
+    for key in sorted(old_metrics.keys() & new_metrics.keys()):
+        if key.startswith("config."):
+            continue
+        before, after = old_metrics[key], new_metrics[key]
+        change = (after - before) / before if before else None
+        diff[key] = {"old": before, "new": after, "change": change}
+    return diff
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare benchmark results")
+    parser.add_argument("old")
+    parser.add_argument("new")
+    args = parser.parse_args()
+
+    with open(args.old) as f:
+        old = json.load(f)
+    with open(args.new) as f:
+        new = json.load(f)
+
+    print(f"📊 {old.get('commit')} → {new.get('commit')}")
+    for key, row in compare(old, new).items():
+        change = f"{row['change']:+.1%}" if row["change"] is not None else "n/a"
+        print(f"   {key:<60} {row['old']:>14.4f} {row['new']:>14.4f} {change:>9}")
+
+
+if __name__ == "__main__":
+    main()
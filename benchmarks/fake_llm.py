@@ -0,0 +1,106 @@
+# benchmarks/fake_llm.py
+"""
+Stand-in LLM for benchmarks
+
+Features:
+- Drop-in for the chat model's invoke()/ainvoke()
+- Configurable latency and jitter
+- Canned, role-appropriate responses (SIU, adjuster, audit, debate, decision)
+- Patches get_chat_model so agents can be built without credentials
+"""
+
+from typing import Any, Optional
+from contextlib import contextmanager
+import asyncio
+import json
+import random
+import time
+
+
+class FakeMessage:
+    """Minimal stand-in for an AIMessage"""
+
+    def __init__(self, content: str):
+        self.content = content
+
+
+class FakeChatModel:
+    """Chat model that sleeps for a configurable latency and returns canned text"""
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, response_words: int = 120, seed: Optional[int] = None):
+        self.latency = latency
+        self.jitter = jitter
+        self.response_words = response_words
+        self.rng = random.Random(seed)
+        self.calls = 0
+
+    def _delay(self) -> float:
+        return max(0.0, self.latency + self.rng.uniform(-self.jitter, self.jitter))
+
+    def _filler(self) -> str:
+        return " ".join(["Justification based on the file and policy wording."] * (self.response_words // 8))
+
+    def _respond(self, prompt: Any) -> str:
+        text = str(prompt)
+        # Decision prompts quote the earlier stages' results, so match them first
+        if "Claim Manager" in text or "FINAL BINDING DECISION" in text:
+            return f"Decision: APPROVE — evidence supports the claim\n\n{self._filler()}"
+        if "transparency_score" in text:
+            return json.dumps({
+                "transparency_score": 0.8,
+                "reasoning_completeness": 0.8,
+                "risk_of_shortcuts": 0.2,
+                "risk_of_shortcut_score": 0.2,
+                "issues_found": [],
+                "flags": [],
+                "recommendations": ["Keep documenting evidence"],
+                "reasoning": "Steps are explained and cited"
+            })
+        if '"position"' in text:
+            return json.dumps({
+                "position": "agree",
+                "reasoning": self._filler(),
+                "key_points": ["evidence is consistent"],
+                "concerns": []
+            })
+        if "SIU Investigator" in text:
+            return f"Verdict: LEGITIMATE (80% confidence)\n\n{self._filler()}"
+        if "Claims Adjuster" in text:
+            return f"Summary: Covered — recommend settlement at the requested amount\n\n{self._filler()}"
+        return f"Summary of prior turns. {self._filler()}"
+
+    def invoke(self, prompt: Any, config: Any = None, **kwargs) -> FakeMessage:
+        self.calls += 1
+        delay = self._delay()
+        if delay:
+            time.sleep(delay)
+        return FakeMessage(self._respond(prompt))
+
+    async def ainvoke(self, prompt: Any, config: Any = None, **kwargs) -> FakeMessage:
+        self.calls += 1
+        delay = self._delay()
+        if delay:
+            await asyncio.sleep(delay)
+        return FakeMessage(self._respond(prompt))
+
+
+@contextmanager
+def fake_chat_models(latency: float = 0.0, jitter: float = 0.0, response_words: int = 120):
+    """
+    Make agents built inside this block use FakeChatModel.
+
+    Patches the get_chat_model names imported by the agent base classes.
+    """
+    import agents.advanced_agent as advanced_agent
+    import agents.base_agent as base_agent
+
+    def factory(*args, **kwargs):
+        return FakeChatModel(latency=latency, jitter=jitter, response_words=response_words)
+
+    originals = (advanced_agent.get_chat_model, base_agent.get_chat_model)
+    advanced_agent.get_chat_model = factory
+    base_agent.get_chat_model = factory
+    try:
+        yield factory
+    finally:
+        advanced_agent.get_chat_model, base_agent.get_chat_model = originals
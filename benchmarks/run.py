@@ -0,0 +1,166 @@
+# benchmarks/run.py
+"""
+Claim-Processing Benchmark Suite
+
+Suites:
+- orchestrator: MultiAgentOrchestrator.process_claim over a synthetic workload
+- debate: DebateOrchestrator.conduct_debate rounds
+- auditor: AuditorAgent.audit_decision calls
+
+Reports throughput, per-stage latency percentiles, peak memory and CPU time
+against a stand-in LLM with configurable latency.
+"""
+
+from typing import Dict, List, Any
+import argparse
+
+from benchmarks.common import measure, percentiles, save_results, quiet
+from benchmarks.fake_llm import fake_chat_models
+from benchmarks.workload import generate_claims, parse_type_mix
+
+
+def bench_orchestrator(claims, latency: float, jitter: float, verbose: bool = False) -> Dict[str, Any]:
+    from utils.orchestrator import MultiAgentOrchestrator
+    from agents.auditor_agent import AuditorAgent
+    from agents.insurance_agents import SIUInvestigatorAgent, ClaimsAdjusterAgent, ClaimsManagerAgent
+
+    with quiet(not verbose), fake_chat_models(latency, jitter):
+        orchestrator = MultiAgentOrchestrator()
+        for agent in (SIUInvestigatorAgent(), ClaimsAdjusterAgent(), AuditorAgent(), ClaimsManagerAgent()):
+            orchestrator.register_agent(agent)
+
+    stage_latencies: Dict[str, List[float]] = {}
+    claim_latencies: List[float] = []
+
+    with quiet(not verbose), measure() as m:
+        for claim in claims:
+            workflow = orchestrator.process_claim(claim.claim_id, dict(claim.__dict__))
+            claim_latencies.append((workflow.completed_at - workflow.started_at).total_seconds())
+            for stage in workflow.stages:
+                if stage.started_at and stage.completed_at:
+                    stage_latencies.setdefault(stage.name, []).append(
+                        (stage.completed_at - stage.started_at).total_seconds()
+                    )
+
+    return {
+        "claims": len(claims),
+        "throughput_claims_per_second": round(len(claims) / m.wall_seconds, 4) if m.wall_seconds else None,
+        "claim_latency": percentiles(claim_latencies),
+        "stage_latency": {name: percentiles(values) for name, values in stage_latencies.items()},
+        **m.to_dict()
+    }
+
+
+def bench_debate(rounds: int, debates: int, latency: float, jitter: float, verbose: bool = False) -> Dict[str, Any]:
+    from org.debate import DebateOrchestrator
+    from agents.insurance_agents import SIUInvestigatorAgent, ClaimsAdjusterAgent, ClaimsManagerAgent
+
+    with quiet(not verbose), fake_chat_models(latency, jitter):
+        participants = [SIUInvestigatorAgent(), ClaimsAdjusterAgent(), ClaimsManagerAgent()]
+
+    debate_latencies: List[float] = []
+    with quiet(not verbose), measure() as m:
+        for i in range(debates):
+            # Threshold above 1 forces every round to run
+            debate = DebateOrchestrator(max_rounds=rounds, consensus_threshold=1.1)
+            with measure(trace_memory=False) as single:
+                debate.conduct_debate(f"Should claim BENCH-{i} be approved?", participants, thread_id=f"debate-{i}")
+            debate_latencies.append(single.wall_seconds)
+
+    return {
+        "debates": debates,
+        "rounds_per_debate": rounds,
+        "throughput_debates_per_second": round(debates / m.wall_seconds, 4) if m.wall_seconds else None,
+        "debate_latency": percentiles(debate_latencies),
+        **m.to_dict()
+    }
+
+
+def bench_auditor(claims, latency: float, jitter: float, verbose: bool = False) -> Dict[str, Any]:
+    from agents.auditor_agent import AuditorAgent
+
+    with quiet(not verbose), fake_chat_models(latency, jitter):
+        auditor = AuditorAgent()
+
+    audit_latencies: List[float] = []
+    with quiet(not verbose), measure() as m:
+        for claim in claims:
+            decision = {
+                "agent_name": "ClaimsManager",
+                "task": f"Decide claim {claim.claim_id}",
+                "reasoning": claim.description,
+                "decision": "APPROVE",
+                "confidence": 0.8
+            }
+            with measure(trace_memory=False) as single:
+                auditor.audit_decision(decision, thread_id=claim.claim_id)
+            audit_latencies.append(single.wall_seconds)
+
+    return {
+        "audits": len(claims),
+        "throughput_audits_per_second": round(len(claims) / m.wall_seconds, 4) if m.wall_seconds else None,
+        "audit_latency": percentiles(audit_latencies),
+        **m.to_dict()
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Claim-processing benchmarks")
+    parser.add_argument("--claims", type=int, default=20, help="Claims in the synthetic workload")
+    parser.add_argument("--type-mix", default=None, help="e.g. 'Auto Theft=0.5,Fire=0.5'")
+    parser.add_argument("--duplicate-rate", type=float, default=0.05)
+    parser.add_argument("--description-words", type=int, default=60)
+    parser.add_argument("--latency", type=float, default=0.05, help="Fake LLM latency (seconds)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Fake LLM latency jitter (seconds)")
+    parser.add_argument("--suites", default="orchestrator,debate,auditor")
+    parser.add_argument("--debate-rounds", type=int, default=3)
+    parser.add_argument("--debates", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output-dir", default=None)
+    parser.add_argument("--verbose", action="store_true", help="Keep the system's own output")
+    args = parser.parse_args()
+
+    from utils.log import configure_logging
+    configure_logging(asynchronous=True)
+
+    claims = generate_claims(
+        args.claims,
+        type_mix=parse_type_mix(args.type_mix),
+        duplicate_rate=args.duplicate_rate,
+        description_words=args.description_words,
+        seed=args.seed
+    )
+
+    suites = [s.strip() for s in args.suites.split(",") if s.strip()]
+    results: Dict[str, Any] = {
+        "config": {
+            "claims": args.claims,
+            "type_mix": args.type_mix,
+            "duplicate_rate": args.duplicate_rate,
+            "description_words": args.description_words,
+            "latency": args.latency,
+            "jitter": args.jitter,
+            "seed": args.seed
+        }
+    }
+
+    print(f"🏁 Running benchmarks: {', '.join(suites)}")
+
+    if "orchestrator" in suites:
+        results["orchestrator"] = bench_orchestrator(claims, args.latency, args.jitter, args.verbose)
+        print(f"   orchestrator: {results['orchestrator']['throughput_claims_per_second']} claims/s")
+
+    if "debate" in suites:
+        results["debate"] = bench_debate(args.debate_rounds, args.debates, args.latency, args.jitter, args.verbose)
+        print(f"   debate: {results['debate']['throughput_debates_per_second']} debates/s")
+
+    if "auditor" in suites:
+        results["auditor"] = bench_auditor(claims, args.latency, args.jitter, args.verbose)
+        print(f"   auditor: {results['auditor']['throughput_audits_per_second']} audits/s")
+
+    save_results("claims", results, args.output_dir)
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+import os
+import sys
+import argparse
+from dotenv import load_dotenv
+from utils.orchestrator import MultiAgentOrchestrator
+from utils.ingestion import ClaimIngestionPipeline
+from utils.triage import TriageEngine
+from utils.log import configure_logging
+
+# Load environment
+load_dotenv()
+os.environ["LANGCHAIN_TRACING_V2"] = "true"
+
+from agents.auditor_agent import AuditorAgent
+from agents.insurance_agents import SIUInvestigatorAgent, ClaimsAdjusterAgent, ClaimsManagerAgent
+
+
+def main():
+    """Stream claims from JSONL (or stdin) through the insurance workflow"""
+    
+    parser = argparse.ArgumentParser(description="Stream insurance claims through the multi-agent workflow")
+    parser.add_argument("input", help="Claims JSONL file, or '-' for stdin")
+    parser.add_argument("-o", "--output", default="decisions.jsonl", help="Decisions JSONL file, or '-' for stdout")
+    parser.add_argument("--workers", type=int, default=1, help="Claims processed concurrently")
+    parser.add_argument("--max-pending", type=int, default=2, help="Claims in flight before the reader blocks")
+    parser.add_argument("--triage", action="store_true", help="Enable rule-based fast-path triage")
+    parser.add_argument("--prescore", action="store_true", help="Batch fraud pre-scoring of the claims read ahead")
+    parser.add_argument("--score-batch", type=int, default=256, help="Claims pre-scored per vectorized batch")
+    args = parser.parse_args()
+    configure_logging(asynchronous=True)
+    
+    output = args.output
+    if output == "-":
+        # Decisions own stdout; agent prints and logs go to stderr
+        output, sys.stdout = sys.stdout, sys.stderr
+    
+    orchestrator = MultiAgentOrchestrator(triage_engine=TriageEngine() if args.triage else None)
+    orchestrator.register_agent(SIUInvestigatorAgent())
+    orchestrator.register_agent(ClaimsAdjusterAgent())
+    orchestrator.register_agent(AuditorAgent())
+    orchestrator.register_agent(ClaimsManagerAgent())
+    
+    scorer = None
+    if args.prescore:
+        from utils.fraud_scoring import BatchFraudScorer
+        scorer = BatchFraudScorer()
+    
+    pipeline = ClaimIngestionPipeline(
+        orchestrator,
+        workers=args.workers,
+        max_pending=args.max_pending,
+        scorer=scorer,
+        score_batch=args.score_batch
+    )
+    return pipeline.run(args.input, output)
+
+
+if __name__ == "__main__":
+    main()
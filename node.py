@@ -0,0 +1,55 @@
+import os
+import argparse
+import threading
+from dotenv import load_dotenv
+from utils.message_bus import MessageBus
+from utils.transport import TcpTransport
+from utils.log import configure_logging
+
+# Load environment
+load_dotenv()
+os.environ["LANGCHAIN_TRACING_V2"] = "true"
+
+from agents.auditor_agent import AuditorAgent
+from agents.insurance_agents import SIUInvestigatorAgent, ClaimsAdjusterAgent, ClaimsManagerAgent
+
+AGENT_TYPES = {
+    "SIU_Investigator": SIUInvestigatorAgent,
+    "ClaimsAdjuster": ClaimsAdjusterAgent,
+    "TransparencyAuditor": AuditorAgent,
+    "ClaimsManager": ClaimsManagerAgent,
+}
+
+
+def main():
+    """Host insurance agents on this node, connected to a message broker"""
+    
+    parser = argparse.ArgumentParser(description="Run insurance agents on a remote node")
+    parser.add_argument("--broker", default="127.0.0.1:7878", help="Broker host:port")
+    parser.add_argument("--agents", default=",".join(AGENT_TYPES), help="Comma-separated agent names to host")
+    parser.add_argument("--node-id", default=None, help="Node identifier (default: random)")
+    args = parser.parse_args()
+    configure_logging(asynchronous=True)
+    
+    host, port = args.broker.rsplit(":", 1)
+    bus = MessageBus(transport=TcpTransport(host, int(port), node_id=args.node_id))
+    
+    stop_event = threading.Event()
+    threads = []
+    for name in args.agents.split(","):
+        agent = AGENT_TYPES[name.strip()]()
+        agent.connect_to_bus(bus)
+        thread = threading.Thread(target=agent.serve, args=(stop_event,), name=agent.name, daemon=True)
+        thread.start()
+        threads.append(thread)
+    
+    print(f"\n🛰️  Node {bus.transport.node_id} serving {len(threads)} agents (Ctrl+C to stop)\n")
+    try:
+        stop_event.wait()
+    except KeyboardInterrupt:
+        stop_event.set()
+        bus.transport.stop()
+
+
+if __name__ == "__main__":
+    main()
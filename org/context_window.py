@@ -0,0 +1,228 @@
+# org/context_window.py
+from typing import Callable, Dict, Any, Optional
+from collections import OrderedDict
+import hashlib
+import threading
+
+from org.conversation import ConversationContext
+from utils.log import get_logger
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+_log = get_logger("agent")
+
+CHARS_PER_TOKEN = 4
+
+# Context budget for agents that read the whole thread (auditor, claims manager)
+DEFAULT_CONTEXT_TOKENS = 3000
+
+_encoding = None
+_encoding_loaded = False
+
+
+def _get_encoding():
+    """tiktoken encoding, loaded on first use (None if unavailable, e.g. offline)"""
+    global _encoding, _encoding_loaded
+    if not _encoding_loaded:
+        _encoding_loaded = True
+        if tiktoken is not None:
+            try:
+                _encoding = tiktoken.get_encoding("cl100k_base")
+            except Exception:
+                _encoding = None
+    return _encoding
+
+
+def estimate_tokens(text: str) -> int:
+    """Token count (tiktoken when available, ~4 chars/token otherwise)"""
+    if not text:
+        return 0
+    encoding = _get_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def clip_to_tokens(text: str, max_tokens: int) -> str:
+    """Cut text to roughly max_tokens (character-based, cheap)"""
+    limit = max(0, max_tokens) * CHARS_PER_TOKEN
+    if len(text) <= limit:
+        return text
+    return text[:max(0, limit - 4)].rstrip() + " ...\n"
+
+
+class SummaryCache:
+    """
+    Summaries keyed by what they summarize (previous summary + folded turns).
+
+    Shared by all agents by default, so a span of conversation is summarized
+    once no matter how many agents' contexts contain it.
+    """
+
+    def __init__(self, max_entries: int = 1000):
+        self.max_entries = max_entries
+        self.entries: "OrderedDict[str, str]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def key(text: str) -> str:
+        return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        with self.lock:
+            summary = self.entries.get(key)
+            if summary is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return summary
+
+    def put(self, key: str, summary: str):
+        with self.lock:
+            self.entries[key] = summary
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self.lock:
+            return {"entries": len(self.entries), "hits": self.hits, "misses": self.misses}
+
+
+shared_summary_cache = SummaryCache()
+
+
+SUMMARY_PROMPT = """Summarize this earlier part of an insurance claim conversation in at most {words} words.
+Keep every finding, score, amount, decision, flag and open concern, and who stated it.
+Leave out greetings, repetition and formatting.
+
+{previous}Conversation:
+{turns}
+Summary:"""
+
+
+class ContextWindow:
+    """
+    Fits a thread's conversation into a token budget.
+
+    The most recent turns are included verbatim. When the thread no longer
+    fits, the oldest unsummarized turns are folded (fold_turns at a time)
+    into a rolling summary written by a cheap model: each turn is summarized
+    once and the summary is kept on the ConversationContext. keep_recent
+    turns are never folded; if even those do not fit they are clipped.
+
+    Args:
+        max_tokens: Budget for the whole rendered context
+        summarize: prompt -> summary text (usually a cheap chat model)
+        keep_recent: Turns always kept verbatim
+        fold_turns: Turns folded into the summary per summarization call
+        summary_tokens: Target (and hard cap) for the summary length
+        cache: Summary cache (default: shared by all agents)
+    """
+
+    def __init__(
+        self,
+        max_tokens: int,
+        summarize: Callable[[str], str],
+        keep_recent: int = 4,
+        fold_turns: int = 4,
+        summary_tokens: Optional[int] = None,
+        cache: Optional[SummaryCache] = None
+    ):
+        self.max_tokens = max_tokens
+        self.summarize = summarize
+        self.keep_recent = keep_recent
+        self.fold_turns = max(1, fold_turns)
+        self.summary_tokens = summary_tokens or max(64, max_tokens // 4)
+        self.cache = cache if cache is not None else shared_summary_cache
+
+        self.summaries_made = 0
+        self.summary_failures = 0
+        self.turns_folded = 0
+
+    def render(self, context: ConversationContext, format_for_decision: bool = False) -> str:
+        """The thread's context within max_tokens"""
+        header = ConversationContext.DECISION_HEADER if format_for_decision else "Previous conversation:\n"
+
+        while True:
+            with context.lock:
+                summary_block = self._summary_block(context.summary)
+                start, end = context.summarized_turns, len(context)
+                used = estimate_tokens(header) + estimate_tokens(summary_block) + sum(
+                    context.turn_tokens(i, format_for_decision, estimate_tokens) for i in range(start, end)
+                )
+                foldable = end - self.keep_recent - start
+                if used <= self.max_tokens or foldable <= 0:
+                    texts = [context.turn_text(i, format_for_decision) for i in range(start, end)]
+                    break
+                fold_end = start + min(self.fold_turns, foldable)
+                previous = context.summary
+                first, last = context[start], context[fold_end - 1]
+                turns = "".join(context.turn_text(i) for i in range(start, fold_end))
+
+            # Summarized without the lock, so appends and renders of this
+            # thread do not wait for the model
+            summary = self._summarize(previous, turns)
+
+            with context.lock:
+                # Commit only if nobody folded or dropped these turns meanwhile;
+                # otherwise measure again from the current state
+                if (
+                    context.summarized_turns == start
+                    and context.summary == previous
+                    and len(context) >= fold_end
+                    and context[start] is first
+                    and context[fold_end - 1] is last
+                ):
+                    context.summary = summary
+                    context.summarized_turns = fold_end
+                    self.turns_folded += fold_end - start
+
+        if used > self.max_tokens and texts:
+            # Only recent turns left and still too long: clip each evenly
+            share = (self.max_tokens - estimate_tokens(header) - estimate_tokens(summary_block)) // len(texts)
+            texts = [clip_to_tokens(text, share) for text in texts]
+
+        return header + summary_block + "".join(texts)
+
+    @staticmethod
+    def _summary_block(summary: str) -> str:
+        return f"Summary of earlier conversation:\n{summary}\n\n" if summary else ""
+
+    def _summarize(self, previous_summary: str, turns: str) -> str:
+        """Rolling summary of previous_summary plus the folded turns"""
+        previous = f"Summary so far:\n{previous_summary}\n\n" if previous_summary else ""
+        prompt = SUMMARY_PROMPT.format(
+            words=self.summary_tokens * 3 // 4,
+            previous=previous,
+            turns=turns
+        )
+
+        key = self.cache.key(prompt)
+        summary = self.cache.get(key)
+        if summary is None:
+            try:
+                summary = clip_to_tokens(self.summarize(prompt).strip(), self.summary_tokens)
+                self.summaries_made += 1
+                self.cache.put(key, summary)
+            except Exception as e:
+                # Never fail the caller's prompt: keep a clipped extract instead (not cached)
+                _log.warning("⚠️  Context summarization failed (%s) - using an extract", e)
+                self.summary_failures += 1
+                summary = clip_to_tokens((previous_summary + "\n" + turns).strip(), self.summary_tokens)
+        return summary
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "max_tokens": self.max_tokens,
+            "summaries_made": self.summaries_made,
+            "summary_failures": self.summary_failures,
+            "turns_folded": self.turns_folded,
+            "cache": self.cache.get_stats()
+        }
@@ -0,0 +1,397 @@
+# org/conversation.py
+from typing import Dict, List, Any, Iterator, Optional, Callable
+from collections import OrderedDict
+from datetime import datetime, timezone
+import hashlib
+import json
+import os
+import threading
+
+
+class ConversationContext:
+    """
+    Conversation history of one thread, with cached prompt views.
+
+    Turns keep their structured content (dicts stay dicts). Rendered views
+    are memoized: the decision view is extended with only the turns added
+    since it was last rendered, and the recent view reuses each turn's
+    snippet, so building a prompt costs O(new turns), not O(history).
+
+    Behaves like the list of turn dicts it replaces (len, iteration, indexing).
+    drop_oldest() trims the history; `offset` counts the turns dropped so far.
+    """
+
+    RECENT_TURNS = 10
+    SNIPPET_CHARS = 200
+    DECISION_TEXT_CHARS = 500
+    DECISION_SKIP_KEYS = ("agent", "status", "claim_id")
+
+    DECISION_HEADER = "=== PREVIOUS TEAM ANALYSES ===\n\n"
+
+    def __init__(self, thread_id: str):
+        self.thread_id = thread_id
+        self.turns: List[Dict[str, Any]] = []
+        self.version = 0
+        self.offset = 0
+        # Characters of turn content held (footprint estimate), total and per turn
+        self.chars = 0
+        self._sizes: List[int] = []
+
+        # Per-turn snippet for the recent view (rendered once per turn)
+        self._snippets: List[str] = []
+        # Decision view rendered so far and how many turns it covers
+        self._decision = self.DECISION_HEADER
+        self._decision_turns = 0
+        # (version, limit) -> rendered recent view
+        self._recent: Optional[tuple] = None
+        # Full (untruncated) text per turn and view, for token budgeting
+        self._full_text: Dict[bool, List[str]] = {False: [], True: []}
+        self._full_tokens: Dict[bool, List[int]] = {False: [], True: []}
+
+        # Rolling summary of turns [0, summarized_turns) (see org/context_window.py)
+        self.summary = ""
+        self.summarized_turns = 0
+        self.lock = threading.RLock()
+
+    def append(self, role: str, content: Any) -> Dict[str, Any]:
+        """Add a turn; content is stored as given (dict or text)"""
+        turn = {
+            "role": role,
+            "content": content,
+            "timestamp": datetime.now(timezone.utc).isoformat()
+        }
+        self._add_turn(turn)
+        return turn
+
+    def _add_turn(self, turn: Dict[str, Any]):
+        text = str(turn["content"])
+        self.turns.append(turn)
+        self._snippets.append(f"[{turn['role']}]: {text[:self.SNIPPET_CHARS]}...\n")
+        self._sizes.append(len(text))
+        self.chars += len(text)
+        self.version += 1
+
+    def drop_oldest(self, count: int) -> int:
+        """
+        Forget the oldest turns (cached views are adjusted, not rebuilt).
+
+        Dropped turns already folded into the rolling summary stay covered
+        by it; others are gone from every view.
+        """
+        with self.lock:
+            count = min(count, len(self.turns))
+            if count <= 0:
+                return 0
+            self.chars -= sum(self._sizes[:count])
+            del self._sizes[:count]
+            del self.turns[:count]
+            del self._snippets[:count]
+            for view in (False, True):
+                del self._full_text[view][:count]
+                del self._full_tokens[view][:count]
+            self.offset += count
+            self.summarized_turns = max(0, self.summarized_turns - count)
+            self._decision = self.DECISION_HEADER
+            self._decision_turns = 0
+            self.version += 1
+            return count
+
+    def recent(self, limit: int = RECENT_TURNS) -> str:
+        """Numbered view of the last `limit` turns"""
+        if self._recent and self._recent[0] == (self.version, limit):
+            return self._recent[1]
+
+        snippets = self._snippets[-limit:]
+        view = "Previous conversation:\n" + "".join(
+            f"{i}. {snippet}" for i, snippet in enumerate(snippets, 1)
+        )
+        self._recent = ((self.version, limit), view)
+        return view
+
+    def for_decision(self) -> str:
+        """Every turn, with each agent's key findings extracted (decision maker)"""
+        if self._decision_turns < len(self.turns):
+            new_turns = self.turns[self._decision_turns:]
+            self._decision += "".join(self._render_for_decision(turn) for turn in new_turns)
+            self._decision_turns = len(self.turns)
+        return self._decision
+
+    def render(self, format_for_decision: bool = False) -> str:
+        return self.for_decision() if format_for_decision else self.recent()
+
+    def turn_text(self, index: int, format_for_decision: bool = False) -> str:
+        """Untruncated text of one turn in the given view (rendered once)"""
+        texts = self._full_text[format_for_decision]
+        while len(texts) <= index:
+            turn = self.turns[len(texts)]
+            if format_for_decision and isinstance(turn["content"], dict):
+                texts.append(self._render_for_decision(turn))
+            elif format_for_decision:
+                texts.append(f"[{turn['role']}]: {turn['content']}\n\n")
+            else:
+                texts.append(f"{self.offset + len(texts) + 1}. [{turn['role']}]: {turn['content']}\n")
+        return texts[index]
+
+    def turn_tokens(self, index: int, format_for_decision: bool, count: Callable[[str], int]) -> int:
+        """Token count of turn_text (counted once)"""
+        tokens = self._full_tokens[format_for_decision]
+        while len(tokens) <= index:
+            tokens.append(count(self.turn_text(len(tokens), format_for_decision)))
+        return tokens[index]
+
+    def _render_for_decision(self, turn: Dict[str, Any]) -> str:
+        role = turn["role"]
+        content = turn["content"]
+
+        if not isinstance(content, dict):
+            return f"[{role}]: {str(content)[:self.DECISION_TEXT_CHARS]}\n\n"
+
+        header = f"--- {role} Analysis ---\n"
+        if "investigation" in content:
+            return header + f"INVESTIGATION FINDINGS:\n{content['investigation']}\n\n"
+        if "analysis" in content and "risk" in role.lower():
+            return header + f"RISK ASSESSMENT:\n{content['analysis']}\n\n"
+        if "analysis" in content and "financial" in role.lower():
+            return header + f"FINANCIAL ANALYSIS:\n{content['analysis']}\n\n"
+        if "audit" in content:
+            return header + f"TRANSPARENCY AUDIT:\n{content['audit']}\n\n"
+
+        fields = "".join(
+            f"{key.upper()}: {value}\n"
+            for key, value in content.items()
+            if key not in self.DECISION_SKIP_KEYS
+        )
+        return header + fields + "\n"
+
+    def __len__(self) -> int:
+        return len(self.turns)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return iter(self.turns)
+
+    def __getitem__(self, index):
+        return self.turns[index]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "thread_id": self.thread_id,
+            "offset": self.offset,
+            "summary": self.summary,
+            "summarized_turns": self.summarized_turns,
+            "turns": self.turns
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ConversationContext":
+        context = cls(data["thread_id"])
+        context.offset = data.get("offset", 0)
+        for turn in data.get("turns", []):
+            context._add_turn(turn)
+        context.summary = data.get("summary", "")
+        context.summarized_turns = data.get("summarized_turns", 0)
+        return context
+
+
+class ConversationStore:
+    """
+    Bounded conversation store shared by agents.
+
+    Holds one ConversationContext per (thread, agent), grouped by thread:
+    - LRU over threads: beyond max_threads the least recently used thread
+      (all of its agents' contexts) is evicted
+    - At most max_turns turns per context (oldest dropped first)
+    - With spill_dir, evicted threads are written to disk as JSON and
+      loaded back transparently when touched again
+
+    Message contents are stored by reference, so turns share their payload
+    dicts with the message bus history instead of copying them.
+    """
+
+    def __init__(
+        self,
+        max_threads: Optional[int] = 1000,
+        max_turns: Optional[int] = 200,
+        spill_dir: Optional[str] = None
+    ):
+        self.max_threads = max_threads
+        self.max_turns = max_turns
+        self.spill_dir = spill_dir
+        if spill_dir:
+            os.makedirs(spill_dir, exist_ok=True)
+
+        # thread_id -> {agent_name -> context}, least recently used first
+        self.threads: "OrderedDict[str, Dict[str, ConversationContext]]" = OrderedDict()
+        self.lock = threading.RLock()
+
+        # agent_name -> [contexts, turns, content chars] held in memory,
+        # kept up to date so per-agent stats never scan every thread
+        self.agent_totals: Dict[str, List[int]] = {}
+
+        self.evicted = 0
+        self.spilled = 0
+        self.loaded = 0
+        self.turns_dropped = 0
+
+    def context(self, agent_name: str, thread_id: str, create: bool = True) -> Optional[ConversationContext]:
+        """An agent's context for a thread (created if missing and create=True)"""
+        with self.lock:
+            contexts = self._touch(thread_id)
+            if contexts is None:
+                if not create:
+                    return None
+                contexts = self.threads[thread_id] = {}
+                self._evict()
+            context = contexts.get(agent_name)
+            if context is None and create:
+                context = contexts[agent_name] = ConversationContext(thread_id)
+                self._count(agent_name, 1, 0, 0)
+            return context
+
+    def append(self, agent_name: str, thread_id: str, role: str, content: Any) -> Dict[str, Any]:
+        """Add a turn to an agent's context, trimming it to max_turns"""
+        with self.lock:
+            context = self.context(agent_name, thread_id)
+            turns, chars = len(context), context.chars
+            turn = context.append(role, content)
+            # Trim in batches so the cached views are adjusted rarely
+            if self.max_turns is not None and len(context) > self.max_turns + max(1, self.max_turns // 4):
+                self.turns_dropped += context.drop_oldest(len(context) - self.max_turns)
+            self._count(agent_name, 0, len(context) - turns, context.chars - chars)
+            return turn
+
+    def _count(self, agent_name: str, contexts: int, turns: int, chars: int):
+        totals = self.agent_totals.setdefault(agent_name, [0, 0, 0])
+        totals[0] += contexts
+        totals[1] += turns
+        totals[2] += chars
+
+    def _count_thread(self, contexts: Dict[str, ConversationContext], sign: int):
+        """Add (sign=1) or remove (sign=-1) a thread's contexts from the totals"""
+        for agent_name, context in contexts.items():
+            self._count(agent_name, sign, sign * len(context), sign * context.chars)
+
+    def _touch(self, thread_id: str) -> Optional[Dict[str, ConversationContext]]:
+        contexts = self.threads.get(thread_id)
+        if contexts is not None:
+            self.threads.move_to_end(thread_id)
+            return contexts
+        if self.spill_dir:
+            contexts = self._load(thread_id)
+            if contexts is not None:
+                self.threads[thread_id] = contexts
+                self._count_thread(contexts, 1)
+                self._evict()
+        return contexts
+
+    def _evict(self):
+        while self.max_threads is not None and len(self.threads) > self.max_threads:
+            thread_id, contexts = self.threads.popitem(last=False)
+            self._count_thread(contexts, -1)
+            self.evicted += 1
+            if self.spill_dir:
+                self._spill(thread_id, contexts)
+
+    def _path(self, thread_id: str) -> str:
+        return os.path.join(self.spill_dir, hashlib.sha1(thread_id.encode("utf-8")).hexdigest() + ".json")
+
+    def _spill(self, thread_id: str, contexts: Dict[str, ConversationContext]):
+        data = {"thread_id": thread_id, "agents": {name: c.to_dict() for name, c in contexts.items()}}
+        tmp = self._path(thread_id) + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, default=str)
+        os.replace(tmp, self._path(thread_id))
+        self.spilled += 1
+
+    def _load(self, thread_id: str) -> Optional[Dict[str, ConversationContext]]:
+        path = self._path(thread_id)
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        os.remove(path)
+        self.loaded += 1
+        return {name: ConversationContext.from_dict(c) for name, c in data["agents"].items()}
+
+    def agent_threads(self, agent_name: str) -> List[str]:
+        """Threads (in memory) in which the agent has a context"""
+        with self.lock:
+            return [thread_id for thread_id, contexts in self.threads.items() if agent_name in contexts]
+
+    def agent_context_count(self, agent_name: str) -> int:
+        """Number of the agent's contexts in memory"""
+        with self.lock:
+            return self.agent_totals.get(agent_name, (0,))[0]
+
+    def drop_thread(self, thread_id: str):
+        """Forget a thread (memory and disk)"""
+        with self.lock:
+            contexts = self.threads.pop(thread_id, None)
+            if contexts is not None:
+                self._count_thread(contexts, -1)
+            if self.spill_dir and os.path.exists(self._path(thread_id)):
+                os.remove(self._path(thread_id))
+
+    def clear(self):
+        with self.lock:
+            for thread_id in list(self.threads):
+                self.drop_thread(thread_id)
+
+    def get_stats(self, agent_name: Optional[str] = None) -> Dict[str, Any]:
+        """Footprint (optionally restricted to one agent's contexts)"""
+        with self.lock:
+            if agent_name is None:
+                contexts, turns, chars = (sum(column) for column in zip((0, 0, 0), *self.agent_totals.values()))
+            else:
+                contexts, turns, chars = self.agent_totals.get(agent_name, (0, 0, 0))
+            stats = {
+                "threads": len(self.threads) if agent_name is None else contexts,
+                "contexts": contexts,
+                "turns": turns,
+                "content_chars": chars,
+                "max_threads": self.max_threads,
+                "max_turns": self.max_turns
+            }
+            if agent_name is None:
+                stats.update(evicted=self.evicted, spilled=self.spilled, loaded=self.loaded,
+                             turns_dropped=self.turns_dropped)
+            return stats
+
+
+class AgentConversations:
+    """
+    One agent's view of a ConversationStore: thread_id -> ConversationContext.
+
+    Stands in for the per-agent dict AdvancedAgent.conversation_history used
+    to be (get, in, len, iteration).
+    """
+
+    def __init__(self, store: ConversationStore, agent_name: str):
+        self.store = store
+        self.agent_name = agent_name
+
+    def append(self, thread_id: str, role: str, content: Any) -> Dict[str, Any]:
+        return self.store.append(self.agent_name, thread_id, role, content)
+
+    def get(self, thread_id: str, default: Any = None) -> Any:
+        context = self.store.context(self.agent_name, thread_id, create=False)
+        return default if context is None else context
+
+    def __getitem__(self, thread_id: str) -> ConversationContext:
+        context = self.get(thread_id)
+        if context is None:
+            raise KeyError(thread_id)
+        return context
+
+    def __contains__(self, thread_id: str) -> bool:
+        return self.get(thread_id) is not None
+
+    def __len__(self) -> int:
+        return self.store.agent_context_count(self.agent_name)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.store.agent_threads(self.agent_name))
+
+
+# Used by agents that are not given their own store
+default_conversation_store = ConversationStore()
@@ -3,6 +3,12 @@ from org.schemas import MemoryUpdate
 from typing import Dict, List, Any, Optional
 from datetime import datetime
 import json
+import logging
+
+from utils.tracing import get_tracer
+from utils.log import get_logger, fields
+
+_log = get_logger("memory")
 
 class TrackedMemory:
     """
@@ -33,14 +39,18 @@ class TrackedMemory:
         )
         
         # Update memory
-        self.memory[key] = value
-        self.history.append(update)
+        with get_tracer().span("memory.set", trace_id=thread_id, agent=self.agent_name, key=key, update_type=update_type):
+            self.memory[key] = value
+            self.history.append(update)
         
         # Log for LangSmith visibility
-        print(f"💾 [{self.agent_name}] Memory {update_type}: {key}")
-        print(f"   Reasoning: {reasoning}")
-        if thread_id:
-            print(f"   Thread: {thread_id}")
+        if _log.isEnabledFor(logging.INFO):
+            _log.info(
+                "💾 [%s] Memory %s: %s\n   Reasoning: %s%s", self.agent_name, update_type, key, reasoning,
+                f"\n   Thread: {thread_id}" if thread_id else "",
+                extra=fields(event="memory_set", agent=self.agent_name, update_type=update_type,
+                             key=key, reasoning=reasoning, thread_id=thread_id)
+            )
         
         return update
     
@@ -68,8 +78,10 @@ class TrackedMemory:
         del self.memory[key]
         self.history.append(update)
         
-        print(f"💾 [{self.agent_name}] Memory deleted: {key}")
-        print(f"   Reasoning: {reasoning}")
+        _log.info(
+            "💾 [%s] Memory deleted: %s\n   Reasoning: %s", self.agent_name, key, reasoning,
+            extra=fields(event="memory_delete", agent=self.agent_name, key=key, reasoning=reasoning)
+        )
         
         return update
     
@@ -106,7 +118,8 @@ class TrackedMemory:
 
         self.history.append(update)
 
-        print(f"📝 [{self.agent_name}] Logged event:")
-        print(f"    {item}")
+        if _log.isEnabledFor(logging.INFO):
+            _log.info("📝 [%s] Logged event:\n    %s", self.agent_name, item,
+                      extra=fields(event="memory_log", agent=self.agent_name))
 
         return update
@@ -2,6 +2,7 @@
 import uuid
 from datetime import datetime, timezone
 from dataclasses import dataclass
+from typing import Optional
 
 @dataclass
 class InsuranceClaim:
@@ -11,6 +12,8 @@ class InsuranceClaim:
     claim_amount: float
     description: str
     status: str = "Pending"
+    prior_claims: int = 0
+    coverage_change_days: Optional[int] = None
 
 
 class Task:
@@ -0,0 +1,102 @@
+# tests/test_agent_queue.py
+import threading
+from queue import Empty
+
+import pytest
+
+from utils.message_bus import AgentQueue, BackpressureError, Message, MessagePriority
+
+
+def _message(n: int, priority: MessagePriority = MessagePriority.NORMAL) -> Message:
+    return Message(sender="Orchestrator", receiver="SIU", content={"n": n}, priority=priority)
+
+
+def _drain(queue: AgentQueue):
+    return [queue.get(block=False).content["n"] for _ in range(queue.qsize())]
+
+
+def test_fifo_within_priority_and_priority_order():
+    queue = AgentQueue()
+    queue.put(_message(1, MessagePriority.LOW))
+    queue.put(_message(2))
+    queue.put(_message(3, MessagePriority.CRITICAL))
+    queue.put(_message(4))
+
+    assert _drain(queue) == [3, 2, 4, 1]
+    with pytest.raises(Empty):
+        queue.get(block=False)
+
+
+def test_reject_policy_raises_when_full():
+    queue = AgentQueue(capacity=2, policy="reject")
+    queue.put(_message(1))
+    queue.put(_message(2))
+
+    with pytest.raises(BackpressureError):
+        queue.put(_message(3))
+    assert queue.get_stats()["rejected"] == 1
+    assert _drain(queue) == [1, 2]
+
+
+def test_drop_oldest_evicts_from_the_lowest_priority():
+    dropped = []
+    queue = AgentQueue(capacity=2, policy="drop_oldest", on_drop=dropped.append)
+    queue.put(_message(1, MessagePriority.HIGH))
+    queue.put(_message(2, MessagePriority.LOW))
+    queue.put(_message(3))
+
+    assert [m.content["n"] for m in dropped] == [2]
+    assert _drain(queue) == [1, 3]
+    assert queue.get_stats()["dropped"] == 1
+
+
+def test_drop_oldest_never_evicts_a_higher_priority_message():
+    dropped = []
+    queue = AgentQueue(capacity=2, policy="drop_oldest", on_drop=dropped.append)
+    queue.put(_message(1, MessagePriority.CRITICAL))
+    queue.put(_message(2, MessagePriority.HIGH))
+    queue.put(_message(3, MessagePriority.LOW))
+    queue.put(_message(4, MessagePriority.HIGH))    # same level: oldest HIGH goes
+
+    assert [m.content["n"] for m in dropped] == [3, 2]
+    assert _drain(queue) == [1, 4]
+    stats = queue.get_stats()
+    assert stats["dropped"] == 2 and stats["enqueued"] == 3
+
+
+def test_block_policy_times_out():
+    queue = AgentQueue(capacity=1, policy="block", put_timeout=0.05)
+    queue.put(_message(1))
+
+    with pytest.raises(BackpressureError):
+        queue.put(_message(2))
+    stats = queue.get_stats()
+    assert stats["blocked"] == 1 and stats["rejected"] == 1
+
+
+def test_block_policy_waits_for_space():
+    queue = AgentQueue(capacity=1, policy="block", put_timeout=5)
+    queue.put(_message(1))
+
+    producer = threading.Thread(target=queue.put, args=(_message(2),))
+    producer.start()
+    assert queue.get(timeout=1).content["n"] == 1
+    producer.join(timeout=5)
+
+    assert not producer.is_alive()
+    assert _drain(queue) == [2]
+    assert queue.get_stats()["blocked"] == 1
+
+
+def test_forced_put_bypasses_capacity_and_records_high_water():
+    queue = AgentQueue(capacity=1, policy="reject")
+    queue.put(_message(1))
+    queue.put(_message(2), force=True)
+
+    stats = queue.get_stats()
+    assert stats["size"] == 2 and stats["high_water"] == 2
+
+
+def test_unknown_policy_is_rejected():
+    with pytest.raises(ValueError):
+        AgentQueue(policy="spill")
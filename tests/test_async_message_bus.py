@@ -0,0 +1,85 @@
+# tests/test_async_message_bus.py
+import asyncio
+import time
+
+from utils.async_message_bus import AsyncMessageBus
+from utils.dead_letter import DeadLetterReason
+from utils.message_bus import MessageType, MessagePriority
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_priority_then_fifo():
+    async def scenario():
+        bus = AsyncMessageBus()
+        bus.register_agent("a", None)
+        bus.send("s", "a", {"n": 1})
+        bus.send("s", "a", {"n": 2}, priority=MessagePriority.CRITICAL)
+        bus.send("s", "a", {"n": 3})
+        return [(await bus.receive("a", timeout=1)).content["n"] for _ in range(3)]
+
+    assert run(scenario()) == [2, 1, 3]
+
+
+def test_expired_messages_are_dead_lettered():
+    async def scenario():
+        bus = AsyncMessageBus()
+        bus.register_agent("a", None)
+        bus.send("s", "a", {"n": 1}, deadline=time.time() - 1)
+        bus.send("s", "a", {"n": 2}, ttl=60)
+        message = await bus.receive("a", timeout=1)
+        return bus, message
+
+    bus, message = run(scenario())
+    assert message.content["n"] == 2
+    assert [l.reason for l in bus.dead_letters.list()] == [DeadLetterReason.EXPIRED]
+    assert bus.metrics_snapshot()["agents"]["a"]["expired"] == 1
+
+
+def test_unknown_receiver_is_dead_lettered_and_replayable():
+    async def scenario():
+        bus = AsyncMessageBus()
+        bus.send("s", "late", {"n": 1})
+        bus.register_agent("late", None)
+        replayed = bus.replay_dead_letters(DeadLetterReason.UNDELIVERABLE)
+        return replayed, await bus.receive("late", timeout=1)
+
+    replayed, message = run(scenario())
+    assert len(replayed) == 1
+    assert message.content == {"n": 1}
+    assert message.metadata["dead_letter_reason"] == "undeliverable"
+
+
+def test_publish_reaches_matching_subscribers_only():
+    async def scenario():
+        bus = AsyncMessageBus()
+        for name in ("auto", "all", "home"):
+            bus.register_agent(name, None)
+        bus.subscribe("auto", "claims.auto.*")
+        bus.subscribe("all", "claims.#")
+        bus.subscribe("home", "claims.home.*")
+        sent = bus.publish("auto", "claims.auto.theft", {"claim_id": "c1"})
+        return bus, sent
+
+    bus, sent = run(scenario())
+    assert [m.receiver for m in sent] == ["all"]
+    assert sent[0].type == MessageType.NOTIFICATION
+    assert bus.pending_count("all") == 1 and bus.pending_count("home") == 0
+
+
+def test_metrics_snapshot_tracks_queue_and_handler():
+    async def scenario():
+        bus = AsyncMessageBus()
+        bus.register_agent("a", None)
+        for n in range(3):
+            bus.send("s", "a", {"n": n})
+        await bus.receive("a", timeout=1)
+        bus.record_handler_time("a", 0.01)
+        return bus.metrics_snapshot()["agents"]["a"]
+
+    agent = run(scenario())
+    assert agent["enqueued"] == 3 and agent["dequeued"] == 1
+    assert agent["depth"] == 2 and agent["high_water"] == 3
+    assert agent["handler_time"]["count"] == 1
@@ -0,0 +1,95 @@
+# tests/test_async_orchestrator.py
+import asyncio
+
+import pytest
+
+pytest.importorskip("langchain_core")
+
+from benchmarks.fake_llm import fake_chat_models
+from utils.async_orchestrator import AsyncOrchestrator
+
+
+CLAIMS = [
+    (f"CLM-{i}", {"claimant_name": "Jane Doe", "claim_type": "auto", "claim_amount": 1000.0 + i,
+                  "description": "Rear-ended at a junction"})
+    for i in range(3)
+]
+
+
+def _no_sync_call(*args, **kwargs):
+    raise AssertionError("blocking invoke used on the async path")
+
+
+def _build(response_timeout=5.0):
+    from agents.insurance_agents import SIUInvestigatorAgent, ClaimsAdjusterAgent, ClaimsManagerAgent
+    from agents.auditor_agent import AuditorAgent
+
+    with fake_chat_models(latency=0.01):
+        agents = [SIUInvestigatorAgent(), ClaimsAdjusterAgent(), AuditorAgent(), ClaimsManagerAgent()]
+    for agent in agents:
+        agent.model.invoke = _no_sync_call
+
+    orchestrator = AsyncOrchestrator(response_timeout=response_timeout)
+    for agent in agents:
+        orchestrator.register_agent(agent)
+    return orchestrator, agents
+
+
+def test_claims_run_end_to_end_through_acall_model():
+    orchestrator, agents = _build()
+
+    async def scenario():
+        async with orchestrator:
+            return await orchestrator.process_claims(CLAIMS)
+
+    workflows = asyncio.run(scenario())
+
+    assert [w.status for w in workflows] == ["completed"] * 3
+    for workflow in workflows:
+        assert set(workflow.results) == {"siu_investigation", "claims_adjustment", "transparency_audit", "final_decision"}
+        assert workflow.results["final_decision"]["decision"].startswith("Decision: APPROVE")
+    assert sorted(agents[-1].final_decisions) == ["CLM-0", "CLM-1", "CLM-2"]
+    assert all(agent.model.calls >= 3 for agent in agents)
+    assert orchestrator.get_stats()["pending_requests"] == 0
+
+
+def test_unanswered_stage_times_out():
+    orchestrator, agents = _build(response_timeout=0.2)
+    orchestrator.agents["SIU_Investigator"].model.latency = 1.0
+
+    async def scenario():
+        async with orchestrator:
+            return await orchestrator.process_claim(*CLAIMS[0], workflow_steps=[
+                {"name": "siu_investigation", "agent": "SIU_Investigator"}
+            ])
+
+    workflow = asyncio.run(scenario())
+    assert workflow.results["siu_investigation"] == {"status": "no_response", "agent": "SIU_Investigator"}
+
+
+def test_process_claim_requires_start():
+    orchestrator, _ = _build()
+    with pytest.raises(RuntimeError):
+        asyncio.run(orchestrator.process_claim(*CLAIMS[0]))
+
+
+def test_completed_workflows_follow_the_retention_policy(tmp_path):
+    from utils.workflow_archive import RetentionPolicy
+
+    orchestrator = AsyncOrchestrator(retention=RetentionPolicy(
+        archive_path=str(tmp_path / "archive.jsonl"), max_workflows=1, max_summaries=1
+    ))
+    steps = [{"name": "siu_investigation", "agent": "SIU_Investigator"}]   # not registered: skipped
+
+    async def scenario():
+        async with orchestrator:
+            for claim_id, claim_data in CLAIMS:
+                await orchestrator.process_claim(claim_id, claim_data, workflow_steps=steps)
+
+    asyncio.run(scenario())
+
+    stats = orchestrator.get_stats()
+    assert stats["total_workflows"] == 2 and stats["completed_workflows"] == 2
+    assert stats["compacted_workflows"] == 1 and stats["evicted_workflows"] == 1
+    assert orchestrator.workflows["CLM-1"].is_compacted
+    assert orchestrator.get_workflow_status("CLM-0")["status"] == "completed"
@@ -0,0 +1,71 @@
+# tests/test_bus_metrics.py
+import time
+
+from utils.bus_metrics import Histogram, RateWindow
+from utils.message_bus import MessageBus, MessageType
+
+
+def test_histogram_percentiles_are_bucket_bounds():
+    histogram = Histogram(bounds=(0.001, 0.01, 0.1))
+    for value in [0.0005] * 50 + [0.005] * 40 + [0.05] * 9 + [2.0]:
+        histogram.record(value)
+
+    assert histogram.percentile(50) == 0.001
+    assert histogram.percentile(90) == 0.01
+    assert histogram.percentile(99) == 0.1
+    # The overflow bucket reports the observed maximum
+    assert histogram.percentile(100) == 2.0
+    stats = histogram.to_dict()
+    assert stats["count"] == 100 and stats["min"] == 0.0005 and stats["max"] == 2.0
+    assert Histogram().percentile(50) is None
+
+
+def test_percentile_never_exceeds_the_maximum():
+    histogram = Histogram(bounds=(0.001, 0.01))
+    histogram.record(0.002)
+    assert histogram.percentile(50) == 0.002
+
+
+def test_rate_window_trims_old_seconds():
+    rate = RateWindow(window=10)
+    rate.add(100.2)
+    rate.add(100.7, 3)
+    rate.add(105.0, 6)
+
+    assert list(rate.seconds) == [[100, 4], [105, 6]]
+    assert rate.rate(105.5) == 1.0
+    assert rate.rate(110.0) == 0.6        # second 100 has left the window
+    assert rate.rate(200.0) == 0.0
+    assert not rate.seconds
+
+
+def test_per_agent_expired_and_dropped_counts():
+    bus = MessageBus(queue_capacity=2, backpressure="drop_oldest")
+    bus.register_agent("SIU", object())
+    bus.send("Orchestrator", "SIU", {"n": 0}, ttl=0.01)
+    bus.send("Orchestrator", "SIU", {"n": 1})
+    bus.send("Orchestrator", "SIU", {"n": 2})          # drops n=0
+    bus.send("Orchestrator", "SIU", {"n": 3}, ttl=0.01)  # drops n=1
+    time.sleep(0.02)
+
+    assert bus.receive("SIU", timeout=0.1).content == {"n": 2}
+    assert bus.receive("SIU", timeout=0.1) is None     # n=3 expired
+
+    agent = bus.metrics_snapshot()["agents"]["SIU"]
+    assert agent["dropped"] == 2 and agent["expired"] == 1
+    assert agent["enqueued"] == 4 and agent["dequeued"] == 2
+    assert agent["high_water"] == 2
+
+
+def test_consumed_messages_record_their_queue_wait():
+    bus = MessageBus()
+    bus.register_agent("Orchestrator", object())
+    bus.send("SIU", "Orchestrator", {}, thread_id="t", message_type=MessageType.RESPONSE)
+    time.sleep(0.01)
+
+    assert len(bus.consume("Orchestrator", lambda message: message.thread_id == "t")) == 1
+
+    agent = bus.metrics_snapshot()["agents"]["Orchestrator"]
+    assert agent["dequeued"] == 1
+    assert agent["queue_wait"]["count"] == 1
+    assert agent["queue_wait"]["min"] >= 0.01
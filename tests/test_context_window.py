@@ -0,0 +1,87 @@
+# tests/test_context_window.py
+import threading
+
+from org.context_window import ContextWindow, SummaryCache, estimate_tokens
+from org.conversation import ConversationContext
+
+
+def _context(turns: int, words: int = 40) -> ConversationContext:
+    context = ConversationContext("thread-1")
+    for n in range(turns):
+        context.append("user" if n % 2 == 0 else "assistant", f"turn {n} " + "detail " * words)
+    return context
+
+
+def test_render_fits_budget_and_keeps_recent_turns_verbatim():
+    calls = []
+
+    def summarize(prompt):
+        calls.append(prompt)
+        return "short summary"
+
+    context = _context(12)
+    window = ContextWindow(max_tokens=400, summarize=summarize, keep_recent=2, fold_turns=4, cache=SummaryCache())
+    rendered = window.render(context)
+
+    assert estimate_tokens(rendered) <= 400
+    assert "short summary" in rendered
+    assert context.turn_text(11) in rendered and context.turn_text(10) in rendered
+    assert context.summarized_turns > 0
+    assert window.turns_folded == context.summarized_turns
+
+    # Folded turns are not summarized again on the next render
+    made = window.summaries_made
+    window.render(context)
+    assert window.summaries_made == made
+
+
+def test_small_thread_is_not_summarized():
+    window = ContextWindow(max_tokens=2000, summarize=lambda prompt: "unused", cache=SummaryCache())
+    context = _context(3, words=5)
+    assert window.render(context).endswith(context.turn_text(2))
+    assert window.summaries_made == 0
+
+
+def test_failed_summary_falls_back_to_an_extract():
+    def summarize(prompt):
+        raise RuntimeError("model unavailable")
+
+    window = ContextWindow(max_tokens=300, summarize=summarize, keep_recent=2, cache=SummaryCache())
+    rendered = window.render(_context(10))
+    assert window.summary_failures > 0
+    assert "Summary of earlier conversation" in rendered
+
+
+def test_summarizer_runs_without_the_context_lock():
+    context = _context(10)
+    lock_free = []
+
+    def summarize(prompt):
+        # Another thread must be able to take the lock while the model runs
+        probe = threading.Thread(target=lambda: lock_free.append(context.lock.acquire(timeout=1) and context.lock.release() is None))
+        probe.start()
+        probe.join()
+        return "summary"
+
+    window = ContextWindow(max_tokens=300, summarize=summarize, keep_recent=2, cache=SummaryCache())
+    window.render(context)
+    assert lock_free and all(lock_free)
+
+
+def test_concurrent_change_discards_a_stale_summary():
+    context = _context(10)
+    stale = []
+
+    def summarize(prompt):
+        if not stale:
+            # Turns dropped while this span was being summarized
+            stale.append(prompt)
+            context.drop_oldest(2)
+        return f"summary {len(stale)}"
+
+    window = ContextWindow(max_tokens=300, summarize=summarize, keep_recent=2, fold_turns=2, cache=SummaryCache())
+    window.render(context)
+
+    assert "turn 0 " in stale[0]
+    assert "turn 0 " not in context.summary
+    assert window.turns_folded == context.summarized_turns
@@ -0,0 +1,66 @@
+# tests/test_conversation.py
+from org.conversation import AgentConversations, ConversationStore
+
+
+def _scanned_stats(store: ConversationStore, agent_name: str):
+    contexts = [by_agent[agent_name] for by_agent in store.threads.values() if agent_name in by_agent]
+    return len(contexts), sum(len(c) for c in contexts), sum(c.chars for c in contexts)
+
+
+def _counted_stats(store: ConversationStore, agent_name: str):
+    stats = store.get_stats(agent_name)
+    return stats["contexts"], stats["turns"], stats["content_chars"]
+
+
+def test_least_recently_used_thread_is_evicted():
+    store = ConversationStore(max_threads=2)
+    store.append("SIU", "t1", "user", "first")
+    store.append("SIU", "t2", "user", "second")
+    store.context("SIU", "t1")                     # t1 is now the most recent
+    store.append("SIU", "t3", "user", "third")
+
+    assert list(store.threads) == ["t1", "t3"]
+    assert store.context("SIU", "t2", create=False) is None
+    assert store.get_stats()["evicted"] == 1
+
+
+def test_evicted_thread_is_loaded_back_from_spill(tmp_path):
+    store = ConversationStore(max_threads=1, spill_dir=str(tmp_path))
+    store.append("SIU", "t1", "user", {"claim": "C-1"})
+    store.append("SIU", "t2", "user", "other")
+
+    context = store.context("SIU", "t1", create=False)
+    assert context is not None
+    assert context[0]["content"] == {"claim": "C-1"}
+    stats = store.get_stats()
+    assert stats["spilled"] == 2 and stats["loaded"] == 1
+
+
+def test_oldest_turns_are_trimmed_in_batches():
+    store = ConversationStore(max_turns=4)
+    for i in range(6):
+        store.append("SIU", "t1", "user", f"turn {i}")
+    context = store.context("SIU", "t1")
+
+    assert len(context) == 4
+    assert context[0]["content"] == "turn 2"
+    assert store.get_stats()["turns_dropped"] == 2
+
+
+def test_per_agent_counters_match_the_contexts(tmp_path):
+    store = ConversationStore(max_threads=3, max_turns=4, spill_dir=str(tmp_path))
+    for i in range(40):
+        thread_id = f"t{i % 5}"
+        store.append("SIU", thread_id, "user", "x" * i)
+        if i % 3 == 0:
+            store.append("Auditor", thread_id, "assistant", {"n": i})
+        if i == 25:
+            store.drop_thread("t2")
+
+    for agent_name in ("SIU", "Auditor"):
+        assert _counted_stats(store, agent_name) == _scanned_stats(store, agent_name)
+        assert len(AgentConversations(store, agent_name)) == len(store.agent_threads(agent_name))
+
+    totals = store.get_stats()
+    assert totals["contexts"] == sum(len(by_agent) for by_agent in store.threads.values())
+    assert _counted_stats(store, "nobody") == (0, 0, 0)
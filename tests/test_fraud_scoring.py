@@ -0,0 +1,36 @@
+# tests/test_fraud_scoring.py
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from utils.fraud_scoring import BatchFraudScorer, FEATURE_NAMES, DUPLICATE_SIMILARITY
+
+
+CLAIMS = [
+    {"claim_id": "A", "claim_type": "auto theft", "claim_amount": 40000, "coverage_change_days": 2,
+     "description": "Car stolen late night, GPS disabled, paid cash"},
+    {"claim_id": "B", "claim_type": "auto theft", "claim_amount": 41000, "coverage_change_days": 3,
+     "description": "Car stolen late night, GPS disabled, paid cash"},
+    {"claim_id": "C", "claim_type": "medical", "claim_amount": 300,
+     "description": "Routine physiotherapy after a sprained ankle"},
+]
+
+
+def test_feature_columns_match_names():
+    result = BatchFraudScorer().score(CLAIMS)
+    assert result.feature_names == FEATURE_NAMES
+    assert result.features.shape == (3, len(FEATURE_NAMES))
+    assert result.features[0, DUPLICATE_SIMILARITY] == pytest.approx(1.0)
+
+
+def test_suspicious_claims_rank_first():
+    assert BatchFraudScorer().score(CLAIMS).ranking()[-1] == "C"
+
+
+def test_annotate_flags_duplicates():
+    records = BatchFraudScorer().annotate(CLAIMS)
+    assert records[0]["fraud_signals"]["possible_duplicate_of"] == "B"
+    assert records[1]["fraud_signals"]["possible_duplicate_of"] == "A"
+    assert "possible_duplicate_of" not in records[2]["fraud_signals"]
+    assert 0.0 <= records[2]["fraud_prescore"] < records[0]["fraud_prescore"] <= 1.0
+    assert "fraud_prescore" not in CLAIMS[0]
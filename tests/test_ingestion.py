@@ -0,0 +1,75 @@
+# tests/test_ingestion.py
+import io
+import json
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from utils.ingestion import ClaimIngestionPipeline, ClaimValidationError, coerce_claim
+
+
+class ChattyOrchestrator:
+    """Prints while processing, like the agents do"""
+
+    def process_claim(self, claim_id, claim_data):
+        print(f"processing {claim_id}")
+        now = datetime.now(timezone.utc)
+        return SimpleNamespace(
+            claim_id=claim_id, thread_id=f"t-{claim_id}", status="completed", triage=None,
+            results={"final_decision": {"decision": "APPROVE"}}, started_at=now, completed_at=now
+        )
+
+
+def test_coerce_claim_cleans_amount():
+    claim = coerce_claim({"claim_id": 7, "claim_type": "auto", "claim_amount": "$1,250.50"})
+    assert claim.claim_id == "7"
+    assert claim.claim_amount == 1250.5
+    assert claim.claimant_name == "Unknown"
+
+
+@pytest.mark.parametrize("record", [
+    {"claim_type": "auto", "claim_amount": 1},
+    {"claim_id": "c", "claim_type": "auto", "claim_amount": "lots"},
+    {"claim_id": "c", "claim_type": "auto", "claim_amount": -5},
+    ["not", "an", "object"]
+])
+def test_coerce_claim_rejects(record):
+    with pytest.raises(ClaimValidationError):
+        coerce_claim(record)
+
+
+def test_run_to_stdout_keeps_output_clean(capsys):
+    source = io.StringIO(
+        '{"claim_id": "A", "claim_type": "auto", "claim_amount": 10}\n'
+        'not json\n'
+        '{"claim_id": "B", "claim_type": "home", "claim_amount": 20}\n'
+    )
+
+    stats = ClaimIngestionPipeline(ChattyOrchestrator(), workers=2).run(source, "-")
+
+    captured = capsys.readouterr()
+    rows = [json.loads(line) for line in captured.out.splitlines()]
+    assert sorted(row.get("claim_id") or "" for row in rows) == ["", "A", "B"]
+    assert "processing A" in captured.err
+    assert stats["completed"] == 2 and stats["rejected"] == 1
+
+
+def test_run_prescores_batches():
+    pytest.importorskip("numpy")
+    from utils.fraud_scoring import BatchFraudScorer
+
+    seen = {}
+
+    class RecordingOrchestrator(ChattyOrchestrator):
+        def process_claim(self, claim_id, claim_data):
+            seen[claim_id] = claim_data
+            return super().process_claim(claim_id, claim_data)
+
+    source = io.StringIO("".join(
+        f'{{"claim_id": "{i}", "claim_type": "theft", "claim_amount": {100 * i}}}\n' for i in range(5)
+    ))
+    stats = ClaimIngestionPipeline(RecordingOrchestrator(), scorer=BatchFraudScorer(), score_batch=2).run(source, io.StringIO())
+
+    assert stats["prescored"] == stats["completed"] == 5
+    assert all("fraud_prescore" in data and "fraud_signals" in data for data in seen.values())
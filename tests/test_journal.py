@@ -0,0 +1,49 @@
+# tests/test_journal.py
+import threading
+
+from utils.journal import MessageJournal
+from utils.message_bus import MessageBus, MessageType
+
+
+def test_unacked_messages_are_replayed_after_restart(tmp_path):
+    path = str(tmp_path / "bus.journal")
+    bus = MessageBus(journal=MessageJournal(path, fsync_interval=None))
+    bus.register_agent("SIU", object())
+    bus.send("Orchestrator", "SIU", {"n": 1})
+    bus.send("Orchestrator", "SIU", {"n": 2})
+    assert bus.receive("SIU", timeout=1).content == {"n": 1}
+    bus.journal.close()
+
+    restarted = MessageBus(journal=MessageJournal(path, fsync_interval=None))
+    restarted.register_agent("SIU", object())
+    assert restarted.receive("SIU", timeout=1).content == {"n": 2}
+    assert not restarted.has_messages("SIU")
+    restarted.journal.close()
+
+
+def test_wait_synced_without_flusher_syncs_a_short_batch(tmp_path):
+    journal = MessageJournal(str(tmp_path / "bus.journal"), fsync_every=64, fsync_interval=None)
+    seq = journal.append({"id": "m1"})
+
+    done = []
+    waiter = threading.Thread(target=lambda: done.append(journal.wait_synced(seq)))
+    waiter.start()
+    waiter.join(timeout=5)
+
+    assert done == [True]
+    assert journal.get_stats()["unsynced_records"] == 0
+    journal.close()
+
+
+def test_consumed_messages_are_acked(tmp_path):
+    bus = MessageBus(journal=MessageJournal(str(tmp_path / "bus.journal"), fsync_interval=None))
+    bus.register_agent("Orchestrator", object())
+    for thread_id in ("t1", "t1", "t2"):
+        bus.send("SIU", "Orchestrator", {}, thread_id=thread_id, message_type=MessageType.RESPONSE)
+
+    consumed = bus.consume("Orchestrator", lambda msg: msg.thread_id == "t1")
+
+    assert len(consumed) == 2
+    assert bus.pending_count("Orchestrator") == 1
+    assert bus.journal.pending_count() == 1
+    bus.journal.close()
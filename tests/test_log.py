@@ -0,0 +1,26 @@
+# tests/test_log.py
+import logging
+from logging.handlers import QueueHandler
+
+from utils.log import ROOT, configure_logging, flush_logging, get_logger
+
+
+def test_default_is_synchronous_on_stderr(capsys):
+    configure_logging()
+    get_logger("bus").info("📨 routed")
+
+    captured = capsys.readouterr()
+    assert "📨 routed" in captured.err
+    assert captured.out == ""
+    assert not any(isinstance(h, QueueHandler) for h in logging.getLogger(ROOT).handlers)
+
+
+def test_entry_points_opt_in_to_asynchronous_output(capsys):
+    configure_logging(asynchronous=True)
+    try:
+        assert any(isinstance(h, QueueHandler) for h in logging.getLogger(ROOT).handlers)
+        get_logger("orchestrator").warning("⚠️  queued")
+        flush_logging()
+        assert "⚠️  queued" in capsys.readouterr().err
+    finally:
+        configure_logging()
@@ -0,0 +1,99 @@
+# tests/test_message_bus.py
+import threading
+
+from utils.dead_letter import DeadLetterReason
+from utils.message_bus import CallbackDispatcher, Message, MessageBus
+
+
+def test_send_many_records_one_fan_out_entry_and_one_delivery_per_receiver():
+    bus = MessageBus()
+    for name in ("SIU", "Auditor"):
+        bus.register_agent(name, object())
+
+    deliveries = bus.send_many("Orchestrator", ["SIU", "Auditor"], {"claim": "C-1"}, thread_id="t")
+
+    history = bus.get_thread_messages("t")
+    assert len(history) == 1
+    record = history[0]
+    assert record.receivers == ["SIU", "Auditor"] and record.receiver == ""
+
+    assert [d.id for d in deliveries] == [f"{record.id}:SIU", f"{record.id}:Auditor"]
+    for name in ("SIU", "Auditor"):
+        received = bus.receive(name, timeout=1)
+        assert received.id == f"{record.id}:{name}"
+        assert received.receiver == name and received.content == {"claim": "C-1"}
+        assert not bus.has_messages(name)
+
+    # Delivery ids resolve to the fan-out record
+    assert bus.get_message(deliveries[0].id) is record
+
+
+def test_send_many_dead_letters_unknown_receivers():
+    bus = MessageBus()
+    bus.register_agent("SIU", object())
+
+    deliveries = bus.send_many("Orchestrator", ["SIU", "Ghost"], {"n": 1})
+
+    assert [d.receiver for d in deliveries] == ["SIU"]
+    letters = bus.dead_letters.list(DeadLetterReason.UNDELIVERABLE)
+    assert [letter.message.receiver for letter in letters] == ["Ghost"]
+    assert letters[0].message.id.endswith(":Ghost")
+
+
+def _message(n: int) -> Message:
+    return Message(sender="Orchestrator", receiver="SIU", content={"n": n})
+
+
+def test_inline_dispatcher_runs_callbacks_in_order():
+    dispatcher = CallbackDispatcher(workers=0)
+    seen = []
+    for n in range(3):
+        dispatcher.dispatch([lambda m: seen.append(("a", m.content["n"])), lambda m: seen.append(("b", m.content["n"]))],
+                            _message(n))
+
+    assert seen == [("a", 0), ("b", 0), ("a", 1), ("b", 1), ("a", 2), ("b", 2)]
+    assert dispatcher.get_stats()["inline_runs"] == 0
+
+
+def test_single_worker_keeps_dispatch_order():
+    dispatcher = CallbackDispatcher(workers=1, max_backlog=100)
+    seen = []
+    for n in range(20):
+        dispatcher.dispatch([lambda m: seen.append(m.content["n"])], _message(n))
+    dispatcher.shutdown()
+
+    assert seen == list(range(20))
+
+
+def test_full_backlog_runs_callbacks_inline():
+    import threading
+    dispatcher = CallbackDispatcher(workers=1, max_backlog=1)
+    release = threading.Event()
+    ran_in = {}
+
+    def slow(message):
+        ran_in["slow"] = threading.current_thread()
+        release.wait(5)
+
+    def record(message):
+        ran_in["record"] = threading.current_thread()
+
+    dispatcher.dispatch([slow], _message(0))       # takes the only backlog slot
+    dispatcher.dispatch([record], _message(1))     # backlog full: runs in this thread
+    release.set()
+    dispatcher.shutdown()
+
+    assert ran_in["record"] is threading.current_thread()
+    assert ran_in["slow"] is not threading.current_thread()
+    assert dispatcher.get_stats()["inline_runs"] == 1
+
+
+def test_callback_errors_are_counted_not_raised():
+    def broken(message):
+        raise RuntimeError("boom")
+
+    dispatcher = CallbackDispatcher(workers=0)
+    dispatcher.dispatch([broken], _message(0))
+
+    (entry,) = dispatcher.get_stats()["callbacks"].values()
+    assert entry["calls"] == 1 and entry["errors"] == 1
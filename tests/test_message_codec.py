@@ -0,0 +1,132 @@
+# tests/test_message_codec.py
+import time
+
+import pytest
+
+from utils import message_codec
+from utils.message_bus import Message, MessageBus, MessageType, MessagePriority
+from utils.message_store import MessageStore
+from utils.transport import MessageBroker, TcpTransport
+
+
+def _message(**overrides) -> Message:
+    fields = dict(
+        type=MessageType.RESPONSE,
+        priority=MessagePriority.HIGH,
+        sender="SIU",
+        receiver="Orchestrator",
+        thread_id="thread-1",
+        content={"fraud_score": 0.42, "flags": ["late_report"], "nested": {"ok": True}},
+        metadata={"claim_amount": 1250.5},
+        parent_message_id="req-1",
+        requires_response=True,
+        topic="claims.auto",
+        deadline=time.time() + 60
+    )
+    fields.update(overrides)
+    return Message(**fields)
+
+
+def test_round_trip_preserves_every_field():
+    message = _message()
+    decoded = message_codec.decode(message_codec.encode(message))
+    for name in ("id", "type", "priority", "sender", "receiver", "thread_id", "content", "metadata",
+                 "created_ns", "parent_message_id", "requires_response", "topic", "deadline", "receivers"):
+        assert getattr(decoded, name) == getattr(message, name), name
+
+
+def test_round_trip_of_fan_out_record_without_optionals():
+    message = _message(receiver="", receivers=["SIU", "Auditor"], thread_id=None, parent_message_id=None,
+                       topic=None, deadline=None, requires_response=False)
+    decoded = message_codec.decode(message_codec.encode(message))
+    assert decoded.receivers == ["SIU", "Auditor"]
+    assert decoded.thread_id is None and decoded.deadline is None
+    assert not decoded.requires_response
+
+
+def test_view_reads_header_without_decoding_payload():
+    view = message_codec.MessageView(message_codec.encode(_message()))
+    assert view.receiver == "Orchestrator"
+    assert view._decoded is None
+    assert view.content["fraud_score"] == 0.42
+
+
+def test_frames_stream_and_truncation():
+    messages = [_message(content={"n": i}) for i in range(3)]
+    packed = message_codec.pack_frames(messages)
+    assert [v.content["n"] for v in message_codec.iter_frames(packed)] == [0, 1, 2]
+    with pytest.raises(message_codec.CodecError):
+        list(message_codec.iter_frames(packed[:-1]))
+
+
+def test_spilled_history_reads_back_from_frames(tmp_path):
+    store = MessageStore(max_messages=2, spill_dir=str(tmp_path))
+    messages = [_message(thread_id=f"t{i % 2}", content={"n": i}) for i in range(6)]
+    for message in messages:
+        store.add(message)
+
+    assert [m.content["n"] for m in store.thread("t0")] == [0, 2, 4]
+    assert store.get(messages[1].id).content == {"n": 1}
+    assert [m.content["n"] for m in store.conversation("Orchestrator", "SIU")] == list(range(6))
+    store.spill.close()
+
+    # Segment summaries are rebuilt from the frame headers after a restart
+    reopened = MessageStore(max_messages=2, spill_dir=str(tmp_path))
+    assert [m.content["n"] for m in reopened.thread("t1")] == [1, 3]
+
+
+def test_transport_carries_encoded_messages(capsys):
+    broker = MessageBroker(port=0).start()
+    sender_bus = MessageBus(transport=TcpTransport(port=broker.port, node_id="a"))
+    receiver_bus = MessageBus(transport=TcpTransport(port=broker.port, node_id="b"))
+    try:
+        receiver_bus.register_agent("SIU", object())
+        deadline = time.monotonic() + 5
+        while not sender_bus.is_routable("SIU") and time.monotonic() < deadline:
+            time.sleep(0.02)
+
+        sender_bus.send("Orchestrator", "SIU", {"claim": {"amount": 10}}, thread_id="t")
+        received = receiver_bus.receive("SIU", timeout=5)
+        assert received is not None
+        assert received.content == {"claim": {"amount": 10}}
+        # The broker counts a frame after writing it, so the count can trail delivery
+        deadline = time.monotonic() + 5
+        while broker.forwarded < 1 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert broker.forwarded == 1
+    finally:
+        sender_bus.transport.stop()
+        receiver_bus.transport.stop()
+        broker.stop()
+
+
+def test_undecodable_frame_is_skipped_without_dropping_the_connection():
+    from utils.transport import _MESSAGE, _write_frame
+
+    broker = MessageBroker(port=0).start()
+    sender_bus = MessageBus(transport=TcpTransport(port=broker.port, node_id="a"))
+    receiver_bus = MessageBus(transport=TcpTransport(port=broker.port, node_id="b"))
+    try:
+        sender_bus.register_agent("Orchestrator", object())
+        receiver_bus.register_agent("SIU", object())
+        deadline = time.monotonic() + 5
+        while not (sender_bus.is_routable("SIU") and receiver_bus.is_routable("Orchestrator")) \
+                and time.monotonic() < deadline:
+            time.sleep(0.02)
+
+        # Valid header, payload that no codec can read
+        body = message_codec.encode(_message(sender="Orchestrator", receiver="SIU", content={"n": 0}))
+        payload_length = len(message_codec.MessageView(body).payload)
+        corrupt = body[:-payload_length] + b"\xc1" * payload_length
+        sender = sender_bus.transport
+        _write_frame(sender.sock, _MESSAGE, corrupt, sender.write_lock)
+
+        sender_bus.send("Orchestrator", "SIU", {"n": 1}, thread_id="t")
+        received = receiver_bus.receive("SIU", timeout=5)
+        assert received is not None and received.content == {"n": 1}
+        assert receiver_bus.transport.rejected == 1
+        assert sender_bus.is_routable("SIU")
+    finally:
+        sender_bus.transport.stop()
+        receiver_bus.transport.stop()
+        broker.stop()
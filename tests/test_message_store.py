@@ -0,0 +1,123 @@
+# tests/test_message_store.py
+from utils.message_bus import Message
+from utils.message_store import MessageStore
+
+
+def _message(thread_id, n):
+    return Message(sender="SIU", receiver="Orchestrator", thread_id=thread_id, content={"n": n})
+
+
+def test_spilled_lookup_reads_one_frame_and_misses_read_nothing(tmp_path, monkeypatch):
+    store = MessageStore(max_messages=1, spill_dir=str(tmp_path), segment_max_messages=2)
+    messages = [_message("t", n) for n in range(5)]
+    for message in messages:
+        store.add(message)
+
+    assert store.get(messages[2].id).content == {"n": 2}
+    assert store.get(f"{messages[3].id}:Auditor").content == {"n": 3}
+
+    def no_disk(*args, **kwargs):
+        raise AssertionError("segments scanned for an unknown id")
+
+    store.spill.flush()
+    monkeypatch.setattr("builtins.open", no_disk)
+    assert store.get("missing") is None
+    assert store.get("missing:Auditor") is None
+
+
+def test_thread_count_spans_tiers_and_dropped_segments(tmp_path):
+    store = MessageStore(max_messages=2, spill_dir=str(tmp_path), segment_max_messages=1, max_segments=2)
+    for n, thread_id in enumerate(["a", "a", "b", "c"]):
+        store.add(_message(thread_id, n))
+    # "a" spilled, "b" and "c" in memory
+    assert store.thread_count() == 3
+
+    store.add(_message("d", 4))
+    store.add(_message("e", 5))
+    # Spill keeps the two newest segments ("b", "c"); "a" is gone
+    assert store.thread_count() == 4
+    assert store.thread("a") == []
+
+    reopened = MessageStore(max_messages=2, spill_dir=str(tmp_path))
+    assert reopened.thread_count() == 2
+    assert reopened.get(store.recent[0].id) is None
+
+
+def test_thread_count_without_spill():
+    store = MessageStore(max_messages=2)
+    for n, thread_id in enumerate(["a", "b", "b", "c"]):
+        store.add(_message(thread_id, n))
+    assert store.thread_count() == 2
+
+
+def test_only_newest_segments_are_indexed(tmp_path):
+    store = MessageStore(max_messages=1, spill_dir=str(tmp_path), segment_max_messages=2,
+                         max_segments=None, indexed_segments=1)
+    messages = [_message(f"t{n % 2}", n) for n in range(9)]
+    for message in messages:
+        store.add(message)
+
+    spill = store.spill
+    assert len(spill.segments) == 4
+    assert len(spill.indexes) == 1
+    assert sum(len(index) for index in spill.indexes.values()) == 2
+
+    # Older segments are scanned (within their id range), newer read directly
+    assert store.get(messages[0].id).content == {"n": 0}
+    assert store.get(messages[7].id).content == {"n": 7}
+    assert [m.content["n"] for m in store.thread("t0")] == [0, 2, 4, 6, 8]
+
+    reopened = MessageStore(max_messages=1, spill_dir=str(tmp_path), indexed_segments=1)
+    assert len(reopened.spill.indexes) == 1
+    assert reopened.get(messages[1].id).content == {"n": 1}
+
+
+def test_spill_keeps_a_bounded_number_of_segments_by_default(tmp_path):
+    store = MessageStore(max_messages=1, spill_dir=str(tmp_path), segment_max_messages=1)
+    for n in range(30):
+        store.add(_message("t", n))
+
+    assert len(store.spill.segments) == store.spill.max_segments == 20
+    assert len(list(tmp_path.iterdir())) == 20
+
+
+def test_indexes_follow_eviction_without_spill():
+    store = MessageStore(max_messages=3)
+    messages = [
+        Message(sender="SIU", receiver="Orchestrator", thread_id="a", content={"n": 0}),
+        Message(sender="Auditor", receiver="Orchestrator", thread_id="b", content={"n": 1}),
+        Message(sender="Orchestrator", receiver="SIU", thread_id="a", content={"n": 2}),
+        Message(sender="SIU", receiver="Orchestrator", thread_id="a", content={"n": 3}),
+        Message(sender="Orchestrator", receiver="Auditor", thread_id="c", content={"n": 4}),
+    ]
+    for message in messages:
+        store.add(message)
+
+    assert [m.content["n"] for m in store] == [2, 3, 4]
+    assert store.get(messages[0].id) is None and store.get(messages[1].id) is None
+    assert store.get(messages[3].id) is messages[3]
+    assert [m.content["n"] for m in store.thread("a")] == [2, 3]
+    assert store.thread("b") == []
+    # Pairs are unordered
+    assert [m.content["n"] for m in store.conversation("Orchestrator", "SIU")] == [2, 3]
+    assert [m.content["n"] for m in store.conversation("Auditor", "Orchestrator")] == [4]
+    assert store.by_thread.keys() == {"a", "c"}
+    assert store.by_pair.keys() == {("Orchestrator", "SIU"), ("Auditor", "Orchestrator")}
+    assert store.get_stats()["evicted"] == 2
+
+
+def test_thread_count_without_spill_tracks_evicted_and_returning_threads():
+    store = MessageStore(max_messages=2)
+    store.add(_message("a", 0))
+    store.add(_message("b", 1))
+    store.add(_message("c", 2))                     # evicts the only "a" message
+    assert store.thread_count() == 2
+
+    store.add(_message("a", 3))                     # "a" is back, "b" evicted
+    assert store.thread_count() == 2
+    assert [m.content["n"] for m in store.thread("a")] == [3]
+
+    store.clear()
+    assert store.thread_count() == 0
+    store.add(_message("d", 4))
+    assert store.thread_count() == 1
@@ -0,0 +1,116 @@
+# tests/test_speculation.py
+import pytest
+
+from utils.speculation import default_speculation_check, SpeculationStats
+
+pytest.importorskip("langchain_core")
+
+from benchmarks.fake_llm import fake_chat_models
+from utils.message_bus import Message, MessageType
+from utils.orchestrator import MultiAgentOrchestrator
+
+
+SIU = {"agent": "SIU_Investigator", "investigation": "Verdict: LEGITIMATE (80%)", "status": "completed"}
+COVERED = {"agent": "ClaimsAdjuster", "adjustment": "Summary: Covered", "status": "completed"}
+DENIED = {"agent": "ClaimsAdjuster", "adjustment": "Summary: Denied", "status": "completed"}
+AUDIT_OK = {"agent": "TransparencyAuditor", "audit": '{"risk_of_shortcuts": 0.2}', "status": "completed"}
+
+CLAIM = {"claimant_name": "Jane Doe", "claim_type": "auto", "claim_amount": 1200.0}
+
+
+def test_check_accepts_consistent_stages():
+    speculative = {"siu_investigation": SIU}
+    final = {**speculative, "claims_adjustment": COVERED, "transparency_audit": AUDIT_OK}
+    assert default_speculation_check(speculative, final)
+
+
+def test_check_rejects_conflicting_adjuster():
+    speculative = {"siu_investigation": SIU}
+    final = {**speculative, "claims_adjustment": DENIED}
+    assert not default_speculation_check(speculative, final)
+
+
+def test_check_rejects_failed_stage():
+    speculative = {"siu_investigation": SIU}
+    final = {**speculative, "claims_adjustment": {"status": "no_response"}}
+    assert not default_speculation_check(speculative, final)
+
+
+def test_stats_acceptance_rate():
+    stats = SpeculationStats()
+    for outcome in ("launched", "launched", "accepted", "rejected"):
+        stats.record(outcome)
+    assert stats.to_dict()["acceptance_rate"] == 0.5
+
+
+def _manager():
+    from agents.insurance_agents import ClaimsManagerAgent
+    with fake_chat_models():
+        return ClaimsManagerAgent()
+
+
+def _decision_request(thread_id, speculative):
+    return Message(
+        sender="Orchestrator",
+        receiver="ClaimsManager",
+        content={
+            "type": "final_decision",
+            "claim": CLAIM,
+            "claim_id": "CLM-1",
+            "upstream_results": {"siu_investigation": SIU, "claims_adjustment": COVERED},
+            "speculative": speculative
+        },
+        thread_id=thread_id,
+        type=MessageType.REQUEST
+    )
+
+
+def test_manager_prompt_includes_stage_results():
+    manager = _manager()
+    prompts = []
+    manager.model.invoke = lambda prompt, config=None: prompts.append(prompt) or type("R", (), {"content": "Decision: APPROVE"})()
+
+    manager.handle_request(_decision_request("t-1", speculative=False))
+
+    assert "[siu_investigation] (SIU_Investigator)" in prompts[0]
+    assert "investigation: Verdict: LEGITIMATE (80%)" in prompts[0]
+    assert "adjustment: Summary: Covered" in prompts[0]
+
+
+def test_speculative_decision_recorded_only_when_accepted():
+    manager = _manager()
+
+    response = manager.handle_request(_decision_request("t-1:speculative", speculative=True))
+    assert manager.final_decisions == {}
+    assert manager.memory.get("final_decision_CLM-1") is None
+
+    manager.accept_speculative(response, "t-1")
+    assert manager.final_decisions["CLM-1"] == response["decision"]
+    assert manager.conversation_history["t-1"][-1]["content"] == response
+
+
+def test_rejected_speculation_leaves_no_trace():
+    from agents.insurance_agents import SIUInvestigatorAgent, ClaimsAdjusterAgent, ClaimsManagerAgent
+
+    with fake_chat_models():
+        orchestrator = MultiAgentOrchestrator(speculative_decision=True, speculation_check=lambda spec, final: False)
+        agents = [SIUInvestigatorAgent(), ClaimsAdjusterAgent(), ClaimsManagerAgent()]
+    for agent in agents:
+        orchestrator.register_agent(agent)
+    steps = [
+        {"name": "siu_investigation", "agent": "SIU_Investigator"},
+        {"name": "claims_adjustment", "agent": "ClaimsAdjuster"},
+        {"name": "final_decision", "agent": "ClaimsManager"}
+    ]
+
+    workflow = orchestrator.process_claim("CLM-9", CLAIM, steps)
+    manager = agents[-1]
+
+    assert workflow.speculation == "rejected"
+    assert list(manager.final_decisions) == ["CLM-9"]
+    threads = manager.conversation_store.agent_threads(manager.name)
+    assert workflow.thread_id in threads
+    assert f"{workflow.thread_id}:speculative" not in threads
+    rerun = [m for m in orchestrator.message_bus.get_thread_messages(workflow.thread_id)
+             if m.receiver == manager.name and m.type == MessageType.REQUEST]
+    assert set(rerun[-1].content["upstream_results"]) == {"siu_investigation", "claims_adjustment"}
@@ -0,0 +1,64 @@
+# tests/test_topics.py
+import pytest
+
+from utils.topics import TopicTrie, validate_topic
+
+
+@pytest.fixture
+def trie() -> TopicTrie:
+    trie = TopicTrie()
+    trie.subscribe("claims.auto.theft", "exact")
+    trie.subscribe("claims.auto.*", "one")
+    trie.subscribe("claims.#", "any")
+    trie.subscribe("#.escalated", "tail")
+    trie.subscribe("audit.#.done", "middle")
+    return trie
+
+
+@pytest.mark.parametrize("topic, expected", [
+    ("claims.auto.theft", {"exact", "one", "any"}),
+    ("claims.auto.glass", {"one", "any"}),
+    ("claims", {"any"}),
+    ("claims.auto", {"any"}),
+    ("claims.auto.theft.escalated", {"any", "tail"}),
+    ("escalated", {"tail"}),
+    ("audit.done", {"middle"}),
+    ("audit.a.b.done", {"middle"}),
+    ("audit.done.late", set()),
+    ("billing.auto.theft", set()),
+])
+def test_wildcard_matching(trie, topic, expected):
+    assert trie.match(topic) == expected
+
+
+def test_cached_matches_follow_subscription_changes(trie):
+    assert "one" in trie.match("claims.auto.glass")
+    trie.unsubscribe("one")
+    assert trie.match("claims.auto.glass") == {"any"}
+
+    trie.subscribe("claims.auto.glass", "late")
+    assert trie.match("claims.auto.glass") == {"any", "late"}
+
+
+def test_unsubscribe_one_pattern_prunes_the_trie():
+    trie = TopicTrie()
+    trie.subscribe("claims.auto.*", "SIU")
+    trie.subscribe("audit.#", "SIU")
+
+    trie.unsubscribe("SIU", "claims.auto.*")
+    assert "claims" not in trie.root.children
+    assert trie.subscriptions("SIU") == {"SIU": ["audit.#"]}
+
+    trie.unsubscribe("SIU")
+    assert trie.subscriptions() == {} and not trie.root.children
+
+
+@pytest.mark.parametrize("pattern", ["", "claims..auto", "claims.au*", "claims.#x"])
+def test_invalid_patterns_are_rejected(pattern):
+    with pytest.raises(ValueError):
+        TopicTrie().subscribe(pattern, "SIU")
+
+
+def test_published_topics_cannot_contain_wildcards():
+    with pytest.raises(ValueError):
+        validate_topic("claims.*")
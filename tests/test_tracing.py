@@ -0,0 +1,30 @@
+# tests/test_tracing.py
+import json
+
+from utils.tracing import ChromeTraceExporter, JsonlSpanExporter, Tracer
+
+
+def test_chrome_exporter_keeps_the_most_recent_events(tmp_path):
+    path = tmp_path / "trace.json"
+    tracer = Tracer(ChromeTraceExporter(str(path), max_events=3))
+    for n in range(5):
+        with tracer.span(f"stage:{n}", trace_id="t"):
+            pass
+    tracer.exporter.flush()
+
+    document = json.loads(path.read_text())
+    assert [event["name"] for event in document["traceEvents"]] == ["stage:2", "stage:3", "stage:4"]
+    assert document["otherData"]["dropped_events"] == 2
+
+
+def test_jsonl_exporter_writes_nested_spans(tmp_path):
+    path = tmp_path / "spans.jsonl"
+    tracer = Tracer(JsonlSpanExporter(str(path)))
+    with tracer.span("claim", trace_id="t") as claim:
+        with tracer.span("stage:siu", trace_id="t"):
+            pass
+    tracer.exporter.close()
+
+    spans = [json.loads(line) for line in path.read_text().splitlines()]
+    by_name = {span["name"]: span for span in spans}
+    assert by_name["stage:siu"]["parent_id"] == claim.span_id
@@ -0,0 +1,89 @@
+# tests/test_triage.py
+import pickle
+
+import pytest
+
+from utils.triage import (
+    ESCALATE, FAST_TRACK, FULL_REVIEW, TriageEngine, TriageRule, merge_stats
+)
+
+
+STEPS = [
+    {"name": "siu_investigation", "agent": "SIU_Investigator"},
+    {"name": "claims_adjustment", "agent": "ClaimsAdjuster"},
+    {"name": "transparency_audit", "agent": "TransparencyAuditor"},
+    {"name": "final_decision", "agent": "ClaimsManager"},
+]
+
+
+def _engine() -> TriageEngine:
+    return TriageEngine([
+        TriageRule(name="escalate_theft", action=ESCALATE, keywords=["theft"]),
+        TriageRule(name="small", max_amount=1000, skip_stages=["siu_investigation", "transparency_audit"]),
+        TriageRule(name="small_auto", max_amount=1000, claim_types=["auto"], skip_stages=["claims_adjustment"]),
+    ])
+
+
+def test_first_matching_rule_wins():
+    engine = _engine()
+
+    theft = engine.evaluate({"claim_amount": 500, "claim_type": "auto", "description": "Theft of a bike"})
+    small = engine.evaluate({"claim_amount": 500, "claim_type": "auto", "description": "Dented bumper"})
+
+    assert (theft.rule, theft.action, theft.skip_stages) == ("escalate_theft", ESCALATE, [])
+    assert (small.rule, small.action) == ("small", FAST_TRACK)
+
+
+def test_unmatched_claim_gets_the_full_workflow():
+    engine = _engine()
+    steps, decision = engine.select_workflow({"claim_amount": 50000, "description": "Flooded basement"}, STEPS)
+
+    assert decision.rule is None and decision.action == FULL_REVIEW
+    assert steps is STEPS
+
+
+def test_select_workflow_skips_the_rule_stages():
+    engine = _engine()
+    steps, decision = engine.select_workflow({"claim_amount": 200, "description": "Cracked windscreen"}, STEPS)
+
+    assert [s["name"] for s in steps] == ["claims_adjustment", "final_decision"]
+    assert decision.skip_stages == ["siu_investigation", "transparency_audit"]
+    assert engine.get_stats()["stages_skipped"] == 2
+
+
+def test_hit_rates_and_merged_stats():
+    engine = _engine()
+    for claim in ({"claim_amount": 100}, {"claim_amount": 100}, {"claim_amount": 9999}, {"description": "theft"}):
+        engine.evaluate(claim)
+
+    stats = engine.get_stats()
+    assert stats["total_evaluated"] == 4 and stats["no_match"] == 1
+    assert stats["rule_hits"] == {"escalate_theft": 1, "small": 2, "small_auto": 0}
+    assert stats["rule_hit_rates"]["small"] == 0.5
+
+    merged = merge_stats([stats, None, stats])
+    assert merged["total_evaluated"] == 8 and merged["rule_hits"]["small"] == 4
+    assert merged["rule_hit_rates"]["small"] == 0.5
+
+
+def test_engine_survives_pickling():
+    engine = _engine()
+    engine.evaluate({"claim_amount": 100})
+
+    copy = pickle.loads(pickle.dumps(engine))
+    assert copy.evaluate({"description": "theft"}).rule == "escalate_theft"
+    assert copy.get_stats()["total_evaluated"] == 2
+
+
+def test_orchestrator_records_triage_only_for_the_default_workflow():
+    pytest.importorskip("langchain_core")
+    from utils.orchestrator import MultiAgentOrchestrator
+
+    orchestrator = MultiAgentOrchestrator(triage_engine=_engine())
+    default = orchestrator.process_claim("CLM-1", {"claim_amount": 200})
+    custom = orchestrator.process_claim("CLM-2", {"claim_amount": 200}, workflow_steps=STEPS[-1:])
+
+    assert default.triage["rule"] == "small"
+    assert [s.name for s in default.stages] == ["claims_adjustment", "final_decision"]
+    assert custom.triage is None
+    assert orchestrator.get_stats()["triage_stats"]["total_evaluated"] == 1
@@ -0,0 +1,71 @@
+# tests/test_worker_pool.py
+import os
+
+import pytest
+
+pytest.importorskip("langchain_core")
+
+from utils.worker_pool import WorkerPool
+
+
+def crashing_workers():
+    """Agent factory (runs in the worker): no agents, and claims marked "crash" kill the process"""
+    from utils.orchestrator import MultiAgentOrchestrator
+
+    process_claim = MultiAgentOrchestrator.process_claim
+
+    def crash_on_marked(self, claim_id, claim_data, workflow_steps=None):
+        marker = claim_data.get("crash_once")
+        if claim_data.get("crash") or (marker and not os.path.exists(marker)):
+            if marker:
+                open(marker, "w").close()
+            os._exit(1)
+        return process_claim(self, claim_id, claim_data, workflow_steps)
+
+    MultiAgentOrchestrator.process_claim = crash_on_marked
+    return []
+
+
+def _pool(**kwargs):
+    return WorkerPool(crashing_workers, num_workers=2, poll_interval=0.2, **kwargs)
+
+
+def test_claims_of_a_dead_worker_are_requeued(tmp_path):
+    claims = [(f"C{i}", {"claim_amount": 100}) for i in range(4)]
+    claims.insert(1, ("FLAKY", {"claim_amount": 100, "crash_once": str(tmp_path / "crashed")}))
+
+    with _pool(max_queued=6) as pool:
+        records = list(pool.map(claims))
+        stats = pool.get_stats()
+
+    assert sorted(r["claim_id"] for r in records) == ["C0", "C1", "C2", "C3", "FLAKY"]
+    assert all(r["status"] == "completed" for r in records)
+    assert stats["restarted"] == 1 and stats["in_flight"] == 0
+
+
+def test_poison_claim_fails_after_retries():
+    claims = [("POISON", {"claim_amount": 1, "crash": True}), ("OK", {"claim_amount": 1})]
+
+    with _pool(max_retries=1) as pool:
+        records = {r["claim_id"]: r for r in pool.map(claims)}
+
+    assert records["OK"]["status"] == "completed"
+    assert records["POISON"]["status"] == "failed"
+    assert "worker lost 2 times" in records["POISON"]["error"]
+    assert pool.restarted == 2
+
+
+def test_worker_triage_stats_are_merged():
+    from utils.triage import TriageEngine
+
+    claims = [(f"C{i}", {"claim_amount": 100 * (i + 1)}) for i in range(3)]
+    pool = WorkerPool(crashing_workers, num_workers=2, poll_interval=0.2,
+                      orchestrator_kwargs={"triage_engine": TriageEngine()})
+    with pool:
+        records = list(pool.map(claims))
+        stats = pool.get_stats()
+
+    assert all(r["triage"]["rule"] == "straight_through" for r in records)
+    assert stats["triage_stats"]["total_evaluated"] == 3
+    assert stats["triage_stats"]["rule_hits"]["straight_through"] == 3
+    assert stats["speculation_stats"] is None
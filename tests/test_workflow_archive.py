@@ -0,0 +1,78 @@
+# tests/test_workflow_archive.py
+import pytest
+
+pytest.importorskip("langchain_core")
+pytest.importorskip("langsmith")
+
+from utils.orchestrator import ClaimWorkflow
+from utils.workflow_archive import WorkflowArchive
+
+
+def _completed_workflow(claim_id: str = "CLM-1") -> ClaimWorkflow:
+    workflow = ClaimWorkflow(claim_id, {"claim_amount": 500}, "thread-1")
+    workflow.add_stage("siu_investigation", "SIU_Investigator")
+    workflow.start_stage("siu_investigation")
+    workflow.complete_stage("siu_investigation", {"fraud_score": 0.1})
+    workflow.status = "completed"
+    return workflow
+
+
+def test_compacted_workflow_reads_back_from_archive(tmp_path):
+    archive = WorkflowArchive(str(tmp_path / "archive.jsonl"))
+    workflow = _completed_workflow()
+    workflow.compact(archive)
+
+    assert workflow.is_compacted
+    assert workflow.results == {"siu_investigation": {"fraud_score": 0.1}}
+    record = workflow.to_dict()
+    assert record["claim_data"] == {"claim_amount": 500}
+    assert record["progress"] == "1/1"
+
+
+def test_compacted_workflow_rejects_mutation(tmp_path):
+    archive = WorkflowArchive(str(tmp_path / "archive.jsonl"))
+    workflow = _completed_workflow()
+    workflow.compact(archive)
+
+    with pytest.raises(RuntimeError):
+        workflow.complete_stage("siu_investigation", {"fraud_score": 0.9})
+    with pytest.raises(RuntimeError):
+        workflow.status = "in_progress"
+    # Writes to a loaded copy never reach the archive
+    workflow.results["siu_investigation"] = "changed"
+    assert workflow.results == {"siu_investigation": {"fraud_score": 0.1}}
+
+
+def test_repeated_loads_are_served_from_cache(tmp_path, monkeypatch):
+    archive = WorkflowArchive(str(tmp_path / "archive.jsonl"), cache_size=1)
+    workflow = _completed_workflow()
+    workflow.compact(archive)
+    workflow.results
+
+    def no_disk(*args, **kwargs):
+        raise AssertionError("archive re-read from disk")
+
+    monkeypatch.setattr("builtins.open", no_disk)
+    assert workflow.claim_data == {"claim_amount": 500}
+    assert workflow.results["siu_investigation"]["fraud_score"] == 0.1
+
+
+def test_archive_keeps_the_newest_records_and_compacts(tmp_path):
+    path = str(tmp_path / "archive.jsonl")
+    archive = WorkflowArchive(path, max_records=3, compact_min_bytes=0)
+    for n in range(10):
+        archive.store({"claim_id": f"CLM-{n}", "n": n})
+    archive.store({"claim_id": "CLM-9", "n": 99})
+
+    assert list(archive.index) == ["CLM-7", "CLM-8", "CLM-9"]
+    assert archive.load("CLM-0") is None
+    assert archive.load("CLM-9") == {"claim_id": "CLM-9", "n": 99}
+    stats = archive.get_stats()
+    assert stats["compactions"] > 0
+    assert stats["file_bytes"] <= 2 * stats["live_bytes"]
+    archive.close()
+
+    reopened = WorkflowArchive(path, max_records=3)
+    assert len(reopened) == 3
+    assert reopened.load("CLM-8") == {"claim_id": "CLM-8", "n": 8}
+    reopened.close()
@@ -0,0 +1,487 @@
+# utils/async_message_bus.py
+"""
+Asyncio Message Bus
+
+Features:
+- asyncio priority queues per agent (FIFO within a priority)
+- Awaitable receive: no polling timeouts, no per-agent threads
+- Async subscriptions: sync or coroutine callbacks, and async iteration
+  over an agent's messages
+- Thread-safe send (handlers offloaded to worker threads can still send)
+- Same Message type, history store and query API as MessageBus
+- Message TTL / deadlines (lazy expiry on receive) and a dead-letter queue
+- Topic publish/subscribe and batch send (shared payload, one history entry)
+- Per-agent metrics with the MessageBus snapshot / periodic dump API
+
+Not supported (use MessageBus): bounded queues / backpressure policies,
+the write-ahead journal and multi-node transports. Queues are unbounded.
+
+Usage:
+    bus = AsyncMessageBus()
+    agent.connect_to_bus(bus)
+    asyncio.create_task(agent.aserve())
+    message = await bus.receive("Orchestrator", timeout=30)
+"""
+
+from typing import Dict, List, Optional, Callable, Any, AsyncIterator
+import asyncio
+import inspect
+import itertools
+import logging
+import time
+
+from utils.message_bus import Message, MessageType, MessagePriority, EMPTY_METADATA, FrozenPayload, _deadline
+from utils.message_store import MessageStore
+from utils.topics import TopicTrie, validate_topic
+from utils.dead_letter import DeadLetterQueue, DeadLetterReason
+from utils.bus_metrics import AgentMetrics, MetricsDumper
+from utils.log import get_logger, fields
+
+
+_log = get_logger("bus")
+
+
+class AsyncMessageBus:
+    """
+    Event-loop message bus for multi-agent communication.
+
+    All routing happens on the event loop thread; send() called from another
+    thread is forwarded with call_soon_threadsafe, so no lock is needed.
+    """
+
+    def __init__(
+        self,
+        history_limit: Optional[int] = 10000,
+        history_spill_dir: Optional[str] = None,
+        dead_letter_limit: Optional[int] = 10000,
+        metrics_window: float = 60.0
+    ):
+        # Agent message queues: agent_name -> asyncio.PriorityQueue of
+        # (priority, seq, enqueue monotonic time, message)
+        self.agent_queues: Dict[str, asyncio.PriorityQueue] = {}
+        self.high_water: Dict[str, int] = {}
+
+        # Registered agents: agent_name -> agent_instance
+        self.agents: Dict[str, Any] = {}
+
+        # Message history (see MessageBus)
+        self.history = MessageStore(max_messages=history_limit, spill_dir=history_spill_dir)
+
+        # Undeliverable, expired and failed messages
+        self.dead_letters = DeadLetterQueue(dead_letter_limit)
+
+        # Topic subscriptions: pattern trie -> agent names
+        self.topics = TopicTrie()
+
+        # Per-agent metrics (kept after an agent unregisters, as in MessageBus)
+        self.metrics_window = metrics_window
+        self.agent_metrics: Dict[str, AgentMetrics] = {}
+        self.metrics_started = time.time()
+        self.metrics_dumper: Optional[MetricsDumper] = None
+
+        # Callbacks: message_type -> list of callbacks (sync or async)
+        self.callbacks: Dict[MessageType, List[Callable]] = {
+            mt: [] for mt in MessageType
+        }
+
+        self._sequence = itertools.count()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._callback_tasks: set = set()
+
+        _log.info("🚌 Async Message Bus initialized")
+
+    def _bind_loop(self):
+        if self._loop is None:
+            try:
+                self._loop = asyncio.get_running_loop()
+            except RuntimeError:
+                pass
+
+    def register_agent(self, agent_name: str, agent_instance: Any):
+        """Register an agent with the message bus"""
+        self._bind_loop()
+        if agent_name not in self.agent_queues:
+            self.agent_queues[agent_name] = asyncio.PriorityQueue()
+            self.high_water.setdefault(agent_name, 0)
+            self.agent_metrics.setdefault(agent_name, AgentMetrics(self.metrics_window))
+            self.agents[agent_name] = agent_instance
+            _log.info("   ✅ Registered: %s", agent_name, extra=fields(event="register", agent=agent_name))
+        else:
+            _log.warning("   ⚠️  Agent %s already registered", agent_name)
+
+    def unregister_agent(self, agent_name: str):
+        """Unregister an agent"""
+        if agent_name in self.agent_queues:
+            del self.agent_queues[agent_name]
+            del self.agents[agent_name]
+            self.topics.unsubscribe(agent_name)
+            _log.info("   ❌ Unregistered: %s", agent_name, extra=fields(event="unregister", agent=agent_name))
+
+    def send(
+        self,
+        sender: str,
+        receiver: str,
+        content: Dict[str, Any],
+        thread_id: Optional[str] = None,
+        message_type: MessageType = MessageType.REQUEST,
+        priority: MessagePriority = MessagePriority.NORMAL,
+        requires_response: bool = False,
+        metadata: Optional[Dict] = None,
+        parent_message_id: Optional[str] = None,
+        ttl: Optional[float] = None,
+        deadline: Optional[float] = None
+    ) -> Message:
+        """
+        Send a message (non-blocking; queues are unbounded).
+
+        Same arguments as MessageBus.send. Safe to call from any thread.
+        A message for an unknown receiver is dead-lettered.
+        """
+        message = Message(
+            type=message_type,
+            priority=priority,
+            sender=sender,
+            receiver=receiver,
+            thread_id=thread_id,
+            content=content,
+            metadata=metadata or EMPTY_METADATA,
+            requires_response=requires_response,
+            parent_message_id=parent_message_id,
+            deadline=_deadline(ttl, deadline)
+        )
+
+        self._on_loop(self._route_message, message)
+
+        if _log.isEnabledFor(logging.INFO):
+            _log.info(
+                "📨 [%s] → [%s]: %s (priority: %s)", sender, receiver, message_type.value, priority.name,
+                extra=fields(event="send", id=message.id, sender=sender, receiver=receiver,
+                             type=message_type.value, priority=priority.name, thread_id=thread_id)
+            )
+
+        return message
+
+    def _on_loop(self, callback: Callable, *args):
+        """Run callback now if on the loop thread (or no loop runs), else hand it to the loop"""
+        if self._on_loop_thread() or self._loop is None or not self._loop.is_running():
+            callback(*args)
+        else:
+            self._loop.call_soon_threadsafe(callback, *args)
+
+    def send_many(
+        self,
+        sender: str,
+        receivers: List[str],
+        content: Dict[str, Any],
+        thread_id: Optional[str] = None,
+        message_type: MessageType = MessageType.REQUEST,
+        priority: MessagePriority = MessagePriority.NORMAL,
+        requires_response: bool = False,
+        metadata: Optional[Dict] = None,
+        topic: Optional[str] = None,
+        ttl: Optional[float] = None
+    ) -> List[Message]:
+        """
+        Send the same content to several agents (see MessageBus.send_many).
+
+        Unknown receivers are dead-lettered. Returns every delivery; from
+        another thread they are queued once the loop runs the hand-off.
+        """
+        record = Message(
+            type=message_type,
+            priority=priority,
+            sender=sender,
+            receiver="",
+            receivers=list(receivers),
+            thread_id=thread_id,
+            content=FrozenPayload(content),
+            metadata=FrozenPayload(metadata) if metadata else EMPTY_METADATA,
+            requires_response=requires_response,
+            topic=topic,
+            deadline=_deadline(ttl, None)
+        )
+        deliveries = [record.for_receiver(receiver) for receiver in record.receivers]
+        self._on_loop(self._route_many, record, deliveries)
+
+        if _log.isEnabledFor(logging.INFO):
+            _log.info(
+                "📨 [%s] → %d agents: %s (priority: %s)", sender, len(deliveries), message_type.value, priority.name,
+                extra=fields(event="send_many", sender=sender, delivered=len(deliveries),
+                             type=message_type.value, priority=priority.name, thread_id=thread_id)
+            )
+        return deliveries
+
+    def subscribe(self, agent_name: str, pattern: str):
+        """Subscribe an agent to a topic pattern ("*" one segment, "#" zero or more)"""
+        if agent_name not in self.agent_queues:
+            raise ValueError(f"Agent {agent_name} not registered")
+        self.topics.subscribe(pattern, agent_name)
+        _log.info("   ✅ %s subscribed to %s", agent_name, pattern)
+
+    def unsubscribe(self, agent_name: str, pattern: Optional[str] = None):
+        """Remove one topic subscription (or all of the agent's)"""
+        self.topics.unsubscribe(agent_name, pattern)
+
+    def publish(
+        self,
+        sender: str,
+        topic: str,
+        content: Dict[str, Any],
+        thread_id: Optional[str] = None,
+        priority: MessagePriority = MessagePriority.NORMAL,
+        metadata: Optional[Dict] = None,
+        ttl: Optional[float] = None
+    ) -> List[Message]:
+        """Publish a NOTIFICATION to the agents subscribed to a matching pattern"""
+        validate_topic(topic)
+        receivers = sorted(name for name in self.topics.match(topic) if name != sender)
+        if not receivers:
+            return []
+        return self.send_many(
+            sender=sender,
+            receivers=receivers,
+            content=content,
+            thread_id=thread_id,
+            message_type=MessageType.NOTIFICATION,
+            priority=priority,
+            metadata=metadata,
+            topic=topic,
+            ttl=ttl
+        )
+
+    def _on_loop_thread(self) -> bool:
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            return False
+        self._bind_loop()
+        return running is self._loop
+
+    def broadcast(
+        self,
+        sender: str,
+        content: Dict[str, Any],
+        thread_id: Optional[str] = None,
+        priority: MessagePriority = MessagePriority.NORMAL,
+        exclude: Optional[List[str]] = None
+    ) -> List[Message]:
+        """Broadcast a message to all registered agents"""
+        exclude = exclude or []
+        receivers = [name for name in sorted(self.agents) if name not in exclude and name != sender]
+        return self.send_many(
+            sender=sender,
+            receivers=receivers,
+            content=content,
+            thread_id=thread_id,
+            message_type=MessageType.BROADCAST,
+            priority=priority
+        )
+
+    async def receive(self, agent_name: str, timeout: Optional[float] = None) -> Optional[Message]:
+        """
+        Wait for the next message for an agent.
+
+        Returns None on timeout (timeout=None waits indefinitely). Expired
+        messages are dead-lettered and skipped.
+        """
+        self._bind_loop()
+        queue = self.agent_queues.get(agent_name)
+        if queue is None:
+            _log.warning("⚠️  Agent %s not registered", agent_name)
+            return None
+
+        metrics = self.agent_metrics[agent_name]
+        give_up = time.monotonic() + timeout if timeout is not None else None
+        while True:
+            try:
+                if give_up is None:
+                    _, _, enqueued_at, message = await queue.get()
+                else:
+                    remaining = give_up - time.monotonic()
+                    if remaining <= 0:
+                        return None
+                    _, _, enqueued_at, message = await asyncio.wait_for(queue.get(), remaining)
+            except asyncio.TimeoutError:
+                return None
+
+            now = time.monotonic()
+            metrics.on_dequeue(now, now - enqueued_at)
+
+            # Lazy expiry: stale messages are skipped, not handled
+            if message.is_expired():
+                metrics.on_expired()
+                self.dead_letters.add(message, DeadLetterReason.EXPIRED, f"expired before {agent_name} received it")
+                continue
+            break
+
+        if _log.isEnabledFor(logging.INFO):
+            _log.info(
+                "📬 [%s] received: %s from %s", agent_name, message.type.value, message.sender,
+                extra=fields(event="receive", id=message.id, agent=agent_name, sender=message.sender,
+                             type=message.type.value, thread_id=message.thread_id)
+            )
+        return message
+
+    async def messages(self, agent_name: str, stop: Optional[asyncio.Event] = None) -> AsyncIterator[Message]:
+        """Async subscription to an agent's queue: `async for message in bus.messages(name)`"""
+        while stop is None or not stop.is_set():
+            if stop is None:
+                message = await self.receive(agent_name)
+            else:
+                # Wake up when stop is set even if no message arrives
+                get = asyncio.ensure_future(self.receive(agent_name))
+                halt = asyncio.ensure_future(stop.wait())
+                done, _ = await asyncio.wait({get, halt}, return_when=asyncio.FIRST_COMPLETED)
+                if get not in done:
+                    get.cancel()
+                    return
+                halt.cancel()
+                message = get.result()
+            if message is not None:
+                yield message
+
+    def is_routable(self, agent_name: str) -> bool:
+        """Whether the agent is registered (there are no remote nodes)"""
+        return agent_name in self.agent_queues
+
+    def has_messages(self, agent_name: str) -> bool:
+        """Check if agent has pending messages"""
+        queue = self.agent_queues.get(agent_name)
+        return bool(queue) and not queue.empty()
+
+    def pending_count(self, agent_name: str) -> int:
+        """Get count of pending messages for agent"""
+        queue = self.agent_queues.get(agent_name)
+        return queue.qsize() if queue else 0
+
+    def _route_message(self, message: Message):
+        """Put the message in the receiver's queue (event loop thread)"""
+        if self._enqueue(message):
+            self.history.add(message)
+            self._dispatch_callbacks(message)
+
+    def _route_many(self, record: Message, deliveries: List[Message]):
+        """Queue a fan-out (event loop thread): one history entry for all deliveries"""
+        sent = [message for message in deliveries if self._enqueue(message)]
+        self.history.add(record)
+        for message in sent:
+            self._dispatch_callbacks(message)
+
+    def _enqueue(self, message: Message) -> bool:
+        queue = self.agent_queues.get(message.receiver)
+        if queue is None:
+            _log.warning("⚠️  Receiver %s not registered - message dead-lettered", message.receiver)
+            self.dead_letters.add(message, DeadLetterReason.UNDELIVERABLE, "receiver not registered")
+            return False
+
+        now = time.monotonic()
+        queue.put_nowait((message.priority.value, next(self._sequence), now, message))
+        self.agent_metrics[message.receiver].on_enqueue(now)
+        if queue.qsize() > self.high_water[message.receiver]:
+            self.high_water[message.receiver] = queue.qsize()
+        return True
+
+    def _dispatch_callbacks(self, message: Message):
+        for callback in self.callbacks.get(message.type, []):
+            try:
+                result = callback(message)
+                if inspect.isawaitable(result):
+                    task = asyncio.ensure_future(result)
+                    self._callback_tasks.add(task)
+                    task.add_done_callback(self._callback_done)
+            except Exception as e:
+                _log.warning("⚠️  Callback error: %s", e)
+
+    def _callback_done(self, task: asyncio.Future):
+        self._callback_tasks.discard(task)
+        if not task.cancelled() and task.exception():
+            _log.warning("⚠️  Callback error: %s", task.exception())
+
+    def register_callback(self, message_type: MessageType, callback: Callable):
+        """Register a callback (plain function or coroutine function) for a message type"""
+        self.callbacks[message_type].append(callback)
+        _log.info("   ✅ Registered callback for %s", message_type.value)
+
+    def dead_letter(self, message: Message, reason: DeadLetterReason, detail: str = ""):
+        """Move a message to the dead-letter queue (e.g. after its handler failed)"""
+        _log.warning("☠️  Dead-lettered %s (%s): %s", message.id, reason.value, detail)
+        self.dead_letters.add(message, reason, detail)
+
+    def replay_dead_letters(
+        self,
+        reason: Optional[DeadLetterReason] = None,
+        predicate: Optional[Callable] = None,
+        limit: Optional[int] = None,
+        ttl: Optional[float] = None
+    ) -> List[Message]:
+        """Re-send dead letters (see DeadLetterQueue.replay)"""
+        return self.dead_letters.replay(self, reason, predicate, limit, ttl)
+
+    def get_message(self, message_id: str) -> Optional[Message]:
+        """Look up a message by id"""
+        return self.history.get(message_id)
+
+    def get_thread_messages(self, thread_id: str) -> List[Message]:
+        """Get all messages in a thread"""
+        return self.history.thread(thread_id)
+
+    def get_conversation(self, agent1: str, agent2: str) -> List[Message]:
+        """Get conversation between two agents"""
+        return self.history.conversation(agent1, agent2)
+
+    def record_handler_time(self, agent_name: str, seconds: float, failed: bool = False):
+        """Report how long an agent's handler took for one message"""
+        metrics = self.agent_metrics.get(agent_name)
+        if metrics:
+            metrics.on_handled(seconds, failed)
+
+    def metrics_snapshot(self) -> Dict[str, Any]:
+        """Per-agent queue and handler metrics (same layout as MessageBus.metrics_snapshot)"""
+        agents = {}
+        for name, agent in list(self.agent_metrics.items()):
+            data = agent.snapshot()
+            queue = self.agent_queues.get(name)
+            if queue is not None:
+                data.update(depth=queue.qsize(), high_water=self.high_water.get(name, 0))
+            else:
+                data.update(depth=0, registered=False)
+            agents[name] = data
+
+        return {
+            "timestamp": time.time(),
+            "uptime_seconds": round(time.time() - self.metrics_started, 3),
+            "window_seconds": self.metrics_window,
+            "agents": agents
+        }
+
+    def start_metrics_dump(self, interval: float = 10.0, path: Optional[str] = None):
+        """Write a metrics snapshot every interval seconds (see MessageBus.start_metrics_dump)"""
+        self.stop_metrics_dump(final_dump=False)
+        self.metrics_dumper = MetricsDumper(self.metrics_snapshot, interval, path)
+
+    def stop_metrics_dump(self, final_dump: bool = True):
+        """Stop the periodic dump (writing one last snapshot)"""
+        if self.metrics_dumper:
+            self.metrics_dumper.stop(final_dump)
+            self.metrics_dumper = None
+
+    def get_stats(self) -> Dict:
+        """Get message bus statistics"""
+        return {
+            "registered_agents": len(self.agents),
+            "total_messages": self.history.total_recorded,
+            "active_threads": self.history.thread_count(),
+            "history": self.history.get_stats(),
+            "subscriptions": self.topics.subscriptions(),
+            "dead_letters": self.dead_letters.get_stats(),
+            "pending_callbacks": len(self._callback_tasks),
+            "pending_by_agent": {
+                name: queue.qsize()
+                for name, queue in self.agent_queues.items()
+            }
+        }
+
+    def clear_history(self):
+        """Clear message history (for testing)"""
+        self.history.clear()
+        _log.info("🗑️  Message history cleared")
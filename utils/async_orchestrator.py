@@ -0,0 +1,229 @@
+# utils/async_orchestrator.py
+"""
+Asyncio Claim Orchestrator
+
+Features:
+- Runs the claim workflow over an AsyncMessageBus: agents serve with
+  aserve() and call the model through acall_model (no thread per request)
+- Many claims in flight on one event loop (bounded by max_concurrent_claims)
+- Stage requests carry a TTL; responses are correlated by parent_message_id
+- Same ClaimWorkflow records, triage, final-decision payload, running
+  status counts and retention (WorkflowRegistry) as MultiAgentOrchestrator
+  (speculation, worker pools and remote nodes stay with MultiAgentOrchestrator)
+
+Usage:
+    orchestrator = AsyncOrchestrator()
+    orchestrator.register_agent(SIUInvestigatorAgent())
+    ...
+    async with orchestrator:
+        workflows = await orchestrator.process_claims(claims)
+"""
+
+from typing import Dict, List, Optional, Iterable, Tuple
+from datetime import datetime, timezone
+import asyncio
+import logging
+from langsmith import uuid7
+
+from utils.async_message_bus import AsyncMessageBus
+from utils.message_bus import Message, MessageType, MessagePriority
+from utils.orchestrator import ClaimWorkflow, WorkflowRegistry, default_workflow, claim_metadata, upstream_content
+from utils.triage import TriageEngine
+from utils.workflow_archive import RetentionPolicy
+from utils.tracing import get_tracer
+from utils.log import get_logger, fields
+from agents.advanced_agent import AdvancedAgent
+
+_log = get_logger("orchestrator")
+
+
+class AsyncOrchestrator:
+    """Claim workflows on one event loop"""
+
+    def __init__(
+        self,
+        triage_engine: Optional[TriageEngine] = None,
+        response_timeout: float = 120.0,
+        max_concurrent_claims: int = 16,
+        max_agent_concurrency: int = 100,
+        message_bus: Optional[AsyncMessageBus] = None,
+        retention: Optional[RetentionPolicy] = None
+    ):
+        self.coordinator_name = "Orchestrator"
+        self.message_bus = message_bus or AsyncMessageBus()
+        self.message_bus.register_agent(self.coordinator_name, self)
+
+        self.agents: Dict[str, AdvancedAgent] = {}
+        # Workflows, their running status counts and retention
+        self.registry = WorkflowRegistry(retention)
+        self.workflows = self.registry.workflows
+        self.triage_engine = triage_engine
+        self.response_timeout = response_timeout
+        self.max_concurrent_claims = max_concurrent_claims
+        self.max_agent_concurrency = max_agent_concurrency
+
+        # Stage request id -> future resolved with the agent's response content
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._tasks: List[asyncio.Task] = []
+        self._stop: Optional[asyncio.Event] = None
+
+        _log.info("🎯 Async Orchestrator initialized")
+
+    def register_agent(self, agent: AdvancedAgent):
+        """Register an agent (before start())"""
+        agent.connect_to_bus(self.message_bus)
+        self.agents[agent.name] = agent
+        _log.info("   ✅ Registered: %s (%s)", agent.name, agent.role)
+
+    async def start(self):
+        """Start the agents' serve loops and the response collector"""
+        if self._stop is not None:
+            return
+        self._stop = asyncio.Event()
+        self._tasks = [
+            asyncio.create_task(agent.aserve(self._stop, self.max_agent_concurrency))
+            for agent in self.agents.values()
+        ]
+        self._tasks.append(asyncio.create_task(self._collect_responses()))
+
+    async def stop(self):
+        """Stop serving (in-flight handlers finish first)"""
+        if self._stop is None:
+            return
+        self._stop.set()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._stop = None
+
+    async def __aenter__(self) -> "AsyncOrchestrator":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.stop()
+
+    async def _collect_responses(self):
+        """Resolve each waiting stage with the response that replies to its request"""
+        async for message in self.message_bus.messages(self.coordinator_name, stop=self._stop):
+            future = self._pending.pop(message.parent_message_id, None)
+            if future is not None and not future.done():
+                future.set_result(message.content)
+
+    async def process_claims(self, claims: Iterable[Tuple[str, Dict]]) -> List[ClaimWorkflow]:
+        """Process (claim_id, claim_data) pairs concurrently"""
+        slots = asyncio.Semaphore(self.max_concurrent_claims)
+
+        async def run(claim_id: str, claim_data: Dict) -> ClaimWorkflow:
+            async with slots:
+                return await self.process_claim(claim_id, claim_data)
+
+        return list(await asyncio.gather(*(run(claim_id, data) for claim_id, data in claims)))
+
+    async def process_claim(
+        self,
+        claim_id: str,
+        claim_data: Dict,
+        workflow_steps: Optional[List[Dict]] = None
+    ) -> ClaimWorkflow:
+        """Process one claim through the workflow (see MultiAgentOrchestrator.process_claim)"""
+        if self._stop is None:
+            raise RuntimeError("AsyncOrchestrator not started - use 'async with' or await start()")
+
+        thread_id = str(uuid7())
+        _log.info("🚀 Starting claim %s (thread %s)", claim_id, thread_id,
+                  extra=fields(event="claim_start", claim_id=claim_id, thread_id=thread_id,
+                               amount=claim_data.get("claim_amount", 0)))
+
+        workflow = self.registry.create(claim_id, claim_data, thread_id)
+
+        if not workflow_steps:
+            workflow_steps = default_workflow()
+            if self.triage_engine:
+                workflow_steps, decision = self.triage_engine.select_workflow(claim_data, workflow_steps)
+                workflow.triage = decision.to_dict()
+
+        for step in workflow_steps:
+            workflow.add_stage(step["name"], step["agent"])
+        workflow.status = "in_progress"
+
+        with get_tracer().span("claim", trace_id=thread_id, claim_id=claim_id, stages=len(workflow_steps), mode="async"):
+            for step in workflow_steps:
+                await self._execute_step(workflow, step)
+
+        workflow.completed_at = datetime.now(timezone.utc)
+        workflow.status = "completed"
+        self.registry.completed(workflow)
+
+        if _log.isEnabledFor(logging.INFO):
+            duration = (workflow.completed_at - workflow.started_at).total_seconds()
+            _log.info("✅ Claim %s complete in %.2fs", claim_id, duration,
+                      extra=fields(event="claim_complete", claim_id=claim_id, thread_id=thread_id,
+                                   duration_s=round(duration, 3), stages=len(workflow.stages)))
+        return workflow
+
+    async def _execute_step(self, workflow: ClaimWorkflow, step: Dict):
+        stage_name = step["name"]
+        agent_name = step["agent"]
+
+        if agent_name not in self.agents:
+            _log.warning("   ⚠️  Agent %s not registered - skipping", agent_name)
+            workflow.complete_stage(stage_name, {"error": "Agent not found"})
+            return
+
+        if _log.isEnabledFor(logging.INFO):
+            _log.info("📍 %s: %s → %s", workflow.claim_id, stage_name, agent_name,
+                      extra=fields(event="stage_start", thread_id=workflow.thread_id, stage=stage_name, agent=agent_name))
+
+        workflow.start_stage(stage_name)
+        content = {
+            "type": stage_name,
+            "claim": workflow.claim_data,
+            "claim_id": workflow.claim_id,
+            "stage": stage_name,
+            **(upstream_content(workflow, step) or {})
+        }
+        with get_tracer().span(f"stage:{stage_name}", trace_id=workflow.thread_id, agent=agent_name):
+            response = await self._request(workflow, agent_name, content)
+        workflow.complete_stage(stage_name, response)
+
+    async def _request(self, workflow: ClaimWorkflow, agent_name: str, content: Dict) -> Dict:
+        """Send a stage request and await the correlated response"""
+        request: Message = self.message_bus.send(
+            sender=self.coordinator_name,
+            receiver=agent_name,
+            content=content,
+            thread_id=workflow.thread_id,
+            message_type=MessageType.REQUEST,
+            priority=MessagePriority.HIGH,
+            requires_response=True,
+            metadata=claim_metadata(workflow.claim_data),
+            ttl=self.response_timeout
+        )
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request.id] = future
+        try:
+            return await asyncio.wait_for(future, self.response_timeout)
+        except asyncio.TimeoutError:
+            _log.warning("   ⚠️  No response from %s within %ss", agent_name, self.response_timeout)
+            return {"status": "no_response", "agent": agent_name}
+        finally:
+            self._pending.pop(request.id, None)
+
+    def get_workflow_status(self, claim_id: str, include_results: bool = False) -> Optional[Dict]:
+        """Status of a workflow (evicted ones are served from the archive)"""
+        return self.registry.get_status(claim_id, include_results)
+
+    def forget_workflow(self, claim_id: str):
+        """Drop a workflow from memory (and from the running counts)"""
+        self.registry.forget(claim_id)
+
+    def get_stats(self) -> Dict:
+        """Get orchestrator statistics"""
+        return {
+            "registered_agents": len(self.agents),
+            **self.registry.get_stats(),
+            "pending_requests": len(self._pending),
+            "triage_stats": self.triage_engine.get_stats() if self.triage_engine else None,
+            "message_bus_stats": self.message_bus.get_stats(),
+            "agent_stats": {name: agent.get_stats() for name, agent in self.agents.items()}
+        }
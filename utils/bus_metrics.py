@@ -0,0 +1,205 @@
+# utils/bus_metrics.py
+"""
+Message Bus Metrics
+
+Features:
+- Per-agent enqueue/dequeue counts and rates over a sliding window
+- Queue-wait histograms (enqueue → receive) and handler-time histograms
+- Expired / dropped / rejected counts, queue depth and high-water marks
+  (merged from the AgentQueue stats)
+- Snapshot API (plain dicts) and an optional periodic dump thread writing
+  JSON lines to a file or the "claims.metrics" logger
+
+Histograms use fixed log-spaced buckets, so recording is O(log buckets)
+and memory stays constant however many messages flow through.
+"""
+
+from typing import Dict, List, Optional, Any, Callable
+from bisect import bisect_left
+from collections import deque
+import json
+import threading
+import time
+
+from utils.log import get_logger, fields
+
+
+_log = get_logger("metrics")
+
+# Bucket upper bounds in seconds: 50µs .. ~105s, doubling
+DEFAULT_BOUNDS = tuple(0.00005 * 2 ** i for i in range(22))
+
+
+class Histogram:
+    """Fixed-bucket latency histogram (not thread-safe: callers hold a lock)"""
+
+    __slots__ = ("bounds", "counts", "count", "total", "min", "max")
+
+    def __init__(self, bounds=DEFAULT_BOUNDS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def record(self, value: float):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def percentile(self, p: float) -> Optional[float]:
+        """Upper bound of the bucket holding the p-th percentile (max for the overflow bucket)"""
+        if not self.count:
+            return None
+        rank = max(1, round(p / 100 * self.count))
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                return min(self.bounds[i], self.max) if i < len(self.bounds) else self.max
+        return self.max
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else None,
+            "min": self.min,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+            "max": self.max
+        }
+
+
+class RateWindow:
+    """Event count per second over the last `window` seconds"""
+
+    __slots__ = ("window", "seconds")
+
+    def __init__(self, window: float = 60.0):
+        self.window = window
+        self.seconds: deque = deque()   # [second, count]
+
+    def add(self, now: float, n: int = 1):
+        second = int(now)
+        if self.seconds and self.seconds[-1][0] == second:
+            self.seconds[-1][1] += n
+        else:
+            self.seconds.append([second, n])
+            self._trim(second)
+
+    def _trim(self, second: int):
+        while self.seconds and self.seconds[0][0] <= second - self.window:
+            self.seconds.popleft()
+
+    def rate(self, now: float) -> float:
+        self._trim(int(now))
+        if not self.seconds:
+            return 0.0
+        return sum(n for _, n in self.seconds) / self.window
+
+
+class AgentMetrics:
+    """
+    Metrics for one agent's queue and handler.
+
+    Event times passed in are time.monotonic() values (the queue already
+    has them, so recording costs no extra clock reads).
+    """
+
+    def __init__(self, window: float = 60.0):
+        self.lock = threading.Lock()
+        self.enqueued = 0
+        self.dequeued = 0
+        self.expired = 0
+        self.handled = 0
+        self.failed = 0
+        self.enqueue_rate = RateWindow(window)
+        self.dequeue_rate = RateWindow(window)
+        self.queue_wait = Histogram()
+        self.handler_time = Histogram()
+
+    def on_enqueue(self, now: float):
+        with self.lock:
+            self.enqueued += 1
+            self.enqueue_rate.add(now)
+
+    def on_dequeue(self, now: float, wait_seconds: float):
+        with self.lock:
+            self.dequeued += 1
+            self.dequeue_rate.add(now)
+            self.queue_wait.record(wait_seconds)
+
+    def on_expired(self):
+        with self.lock:
+            self.expired += 1
+
+    def on_handled(self, seconds: float, failed: bool = False):
+        with self.lock:
+            self.handled += 1
+            if failed:
+                self.failed += 1
+            self.handler_time.record(seconds)
+
+    def snapshot(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        with self.lock:
+            return {
+                "enqueued": self.enqueued,
+                "dequeued": self.dequeued,
+                "enqueue_per_second": round(self.enqueue_rate.rate(now), 3),
+                "dequeue_per_second": round(self.dequeue_rate.rate(now), 3),
+                "queue_wait": self.queue_wait.to_dict(),
+                "handled": self.handled,
+                "handler_failed": self.failed,
+                "handler_time": self.handler_time.to_dict(),
+                "expired": self.expired
+            }
+
+
+class MetricsDumper:
+    """Background thread writing a snapshot every `interval` seconds"""
+
+    def __init__(self, snapshot: Callable[[], Dict[str, Any]], interval: float, path: Optional[str] = None):
+        self.snapshot = snapshot
+        self.interval = interval
+        self.path = path
+        self.dumps = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="bus-metrics", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.dump()
+
+    def dump(self):
+        data = self.snapshot()
+        if self.path:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(data, default=str) + "\n")
+        else:
+            _log.info("📊 Bus metrics: %s", _summary(data), extra=fields(event="bus_metrics", **data))
+        self.dumps += 1
+
+    def stop(self, final_dump: bool = True):
+        self._stop.set()
+        self._thread.join()
+        if final_dump:
+            self.dump()
+
+
+def _summary(snapshot: Dict[str, Any]) -> str:
+    parts: List[str] = []
+    for name, agent in snapshot.get("agents", {}).items():
+        wait = agent["queue_wait"]["p90"]
+        parts.append(
+            f"{name} depth={agent['depth']} in={agent['enqueue_per_second']}/s "
+            f"out={agent['dequeue_per_second']}/s wait_p90={wait * 1000 if wait is not None else 0:.1f}ms"
+        )
+    return "; ".join(parts) or "no agents"
@@ -0,0 +1,172 @@
+# utils/dead_letter.py
+"""
+Dead-Letter Queue
+
+Features:
+- Captures messages the bus could not deliver or that were never handled
+- Reason codes: undeliverable, expired, rejected, dropped, handler_failed
+- Bounded (oldest dead letters are discarded first) with per-reason counts
+- Replay back through the bus, optionally with a fresh TTL
+"""
+
+from typing import Dict, List, Optional, Callable, Any, TYPE_CHECKING
+from collections import deque
+from dataclasses import dataclass, field
+from enum import Enum
+from datetime import datetime, timezone
+import threading
+import time
+
+if TYPE_CHECKING:
+    from utils.message_bus import Message, MessageBus
+
+
+class DeadLetterReason(Enum):
+    """Why a message ended up in the dead-letter queue"""
+    UNDELIVERABLE = "undeliverable"     # receiver unknown locally and remotely
+    EXPIRED = "expired"                 # deadline passed before it was received
+    REJECTED = "rejected"               # full queue with the reject policy
+    DROPPED = "dropped"                 # evicted by the drop_oldest policy
+    HANDLER_FAILED = "handler_failed"   # the receiving agent raised
+
+
+@dataclass
+class DeadLetter:
+    """A dead message with its reason"""
+    message: "Message"
+    reason: DeadLetterReason
+    detail: str = ""
+    timestamp: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "message": self.message.to_dict(),
+            "reason": self.reason.value,
+            "detail": self.detail,
+            "timestamp": self.timestamp.isoformat()
+        }
+
+
+class DeadLetterQueue:
+    """Bounded, thread-safe store of dead letters"""
+
+    def __init__(self, max_size: Optional[int] = 10000):
+        self.letters: deque = deque(maxlen=max_size)
+        self.counts: Dict[str, int] = {reason.value: 0 for reason in DeadLetterReason}
+        self.replayed = 0
+        self.lock = threading.Lock()
+
+    def add(self, message: "Message", reason: DeadLetterReason, detail: str = ""):
+        with self.lock:
+            self.letters.append(DeadLetter(message, reason, detail))
+            self.counts[reason.value] += 1
+
+    def list(
+        self,
+        reason: Optional[DeadLetterReason] = None,
+        predicate: Optional[Callable[[DeadLetter], bool]] = None
+    ) -> List[DeadLetter]:
+        with self.lock:
+            return [
+                letter for letter in self.letters
+                if (reason is None or letter.reason == reason) and (predicate is None or predicate(letter))
+            ]
+
+    def take(
+        self,
+        reason: Optional[DeadLetterReason] = None,
+        predicate: Optional[Callable[[DeadLetter], bool]] = None,
+        limit: Optional[int] = None
+    ) -> List[DeadLetter]:
+        """Remove and return matching dead letters (oldest first)"""
+        with self.lock:
+            taken, kept = [], deque(maxlen=self.letters.maxlen)
+            for letter in self.letters:
+                matches = (reason is None or letter.reason == reason) and (predicate is None or predicate(letter))
+                if matches and (limit is None or len(taken) < limit):
+                    taken.append(letter)
+                else:
+                    kept.append(letter)
+            self.letters = kept
+            return taken
+
+    def replay(
+        self,
+        bus: "MessageBus",
+        reason: Optional[DeadLetterReason] = None,
+        predicate: Optional[Callable[[DeadLetter], bool]] = None,
+        limit: Optional[int] = None,
+        ttl: Optional[float] = None
+    ) -> List["Message"]:
+        """
+        Send matching dead letters again (as new messages, same content).
+
+        Letters that cannot be delivered now stay in the queue: the receiver
+        is not routable, or the deadline has passed (without a fresh ttl).
+        Only messages the bus accepted are returned and counted as replayed;
+        one the bus dead-letters again is not.
+
+        Args:
+            ttl: Fresh time-to-live; without it the original deadline is kept
+                 (an expired message would expire again)
+        """
+        from utils.message_bus import BackpressureError
+
+        now = time.time()
+
+        def replayable(letter: DeadLetter) -> bool:
+            deadline = letter.message.deadline
+            if ttl is None and deadline is not None and deadline <= now:
+                return False
+            return bus.is_routable(letter.message.receiver)
+
+        # Chosen outside the lock: routability asks the bus
+        chosen = [letter for letter in self.list(reason, predicate) if replayable(letter)]
+        chosen_ids = {id(letter) for letter in chosen[:limit]}
+
+        replayed = []
+        for letter in self.take(predicate=lambda letter: id(letter) in chosen_ids):
+            original = letter.message
+            deadline = time.time() + ttl if ttl is not None else original.deadline
+            mark = self._total()
+            try:
+                message = bus.send(
+                    sender=original.sender,
+                    receiver=original.receiver,
+                    content=dict(original.content),
+                    thread_id=original.thread_id,
+                    message_type=original.type,
+                    priority=original.priority,
+                    requires_response=original.requires_response,
+                    metadata=dict(original.metadata, replay_of=original.id, dead_letter_reason=letter.reason.value),
+                    parent_message_id=original.parent_message_id,
+                    deadline=deadline
+                )
+            except BackpressureError:
+                # The bus dead-lettered it again
+                continue
+            if self._added_since(mark, message.id):
+                # Receiver went away between the check and the send
+                continue
+            replayed.append(message)
+
+        with self.lock:
+            self.replayed += len(replayed)
+        return replayed
+
+    def _total(self) -> int:
+        with self.lock:
+            return sum(self.counts.values())
+
+    def _added_since(self, mark: int, message_id: str) -> bool:
+        """Whether message_id is among the letters added since _total() was mark"""
+        with self.lock:
+            added = min(sum(self.counts.values()) - mark, len(self.letters))
+            return any(self.letters[-1 - i].message.id == message_id for i in range(added))
+
+    def __len__(self) -> int:
+        return len(self.letters)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self.lock:
+            return {"size": len(self.letters), "replayed": self.replayed, "by_reason": dict(self.counts)}
@@ -0,0 +1,266 @@
+# utils/ingestion.py
+"""
+Streaming JSONL Claim Ingestion
+
+Features:
+- Lazy line-by-line reading from a JSONL file or stdin
+- Validation / coercion into InsuranceClaim
+- Backpressure: the reader only pulls a new line when a slot is free
+- Optional batch fraud pre-scoring (BatchFraudScorer) of each read-ahead batch
+- Decisions written back as JSONL as each workflow completes
+- Flat memory use regardless of input size
+"""
+
+from typing import Dict, Any, Iterator, List, Optional, Tuple, TextIO, Union
+from concurrent.futures import ThreadPoolExecutor, Future
+from dataclasses import fields
+import contextlib
+import json
+import sys
+import threading
+import time
+
+from org.tasks import InsuranceClaim
+
+
+class ClaimValidationError(ValueError):
+    """Raised when an input record cannot be turned into an InsuranceClaim"""
+
+
+_CLAIM_FIELDS = {f.name for f in fields(InsuranceClaim)}
+_REQUIRED_FIELDS = ("claim_id", "claim_type", "claim_amount")
+
+
+def _open_source(source: Union[str, TextIO]) -> Tuple[TextIO, bool]:
+    """Open a path (or '-' for stdin); returns (stream, should_close)"""
+    if source == "-":
+        return sys.stdin, False
+    if isinstance(source, str):
+        return open(source, "r", encoding="utf-8"), True
+    return source, False
+
+
+def iter_claim_records(source: Union[str, TextIO]) -> Iterator[Tuple[int, Any]]:
+    """
+    Lazily yield (line_number, record) from a JSONL source.
+
+    Malformed lines are yielded as ClaimValidationError instances instead of
+    stopping the stream, so one bad row does not abort a nightly export.
+    """
+    stream, should_close = _open_source(source)
+    try:
+        for line_number, line in enumerate(stream, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield line_number, json.loads(line)
+            except json.JSONDecodeError as e:
+                yield line_number, ClaimValidationError(f"invalid JSON: {e}")
+    finally:
+        if should_close:
+            stream.close()
+
+
+def _coerce_amount(value: Any) -> float:
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        cleaned = value.replace("$", "").replace("£", "").replace(",", "").strip()
+        try:
+            return float(cleaned)
+        except ValueError:
+            pass
+    raise ClaimValidationError(f"claim_amount is not a number: {value!r}")
+
+
+def coerce_claim(record: Any) -> InsuranceClaim:
+    """
+    Validate a raw record and coerce it into an InsuranceClaim.
+
+    Unknown keys are ignored; missing optional fields take their defaults.
+    """
+    if not isinstance(record, dict):
+        raise ClaimValidationError(f"expected a JSON object, got {type(record).__name__}")
+
+    missing = [name for name in _REQUIRED_FIELDS if record.get(name) in (None, "")]
+    if missing:
+        raise ClaimValidationError(f"missing required fields: {', '.join(missing)}")
+
+    amount = _coerce_amount(record["claim_amount"])
+    if amount < 0:
+        raise ClaimValidationError(f"claim_amount must be non-negative: {amount}")
+
+    values = {key: value for key, value in record.items() if key in _CLAIM_FIELDS}
+    values["claim_id"] = str(record["claim_id"])
+    values["claim_type"] = str(record["claim_type"])
+    values["claim_amount"] = amount
+    values["claimant_name"] = str(record.get("claimant_name") or "Unknown")
+    values["description"] = str(record.get("description") or "")
+
+    try:
+        if values.get("prior_claims") is not None:
+            values["prior_claims"] = int(values["prior_claims"])
+        if values.get("coverage_change_days") is not None:
+            values["coverage_change_days"] = int(values["coverage_change_days"])
+    except (TypeError, ValueError) as e:
+        raise ClaimValidationError(f"invalid claimant history field: {e}")
+
+    return InsuranceClaim(**values)
+
+
+class ClaimIngestionPipeline:
+    """
+    Streams claims from JSONL through the orchestrator.
+
+    At most ``max_pending`` claims are in flight (queued or executing) at
+    any time; the reader blocks until one completes before pulling the next
+    line, so memory stays flat for arbitrarily large inputs.
+
+    With a ``scorer`` (utils.fraud_scoring.BatchFraudScorer), valid claims
+    are read ahead ``score_batch`` at a time and pre-scored in one vectorized
+    pass; the ``fraud_prescore`` / ``fraud_signals`` keys then travel with
+    the claim data (triage rules, SIU prompt, message metadata).
+    """
+
+    def __init__(self, orchestrator, workers: int = 1, max_pending: int = 2, scorer=None, score_batch: int = 256):
+        self.orchestrator = orchestrator
+        self.workers = max(1, workers)
+        self.max_pending = max(self.workers, max_pending)
+        self.scorer = scorer
+        self.score_batch = max(1, score_batch)
+
+        self.slots = threading.BoundedSemaphore(self.max_pending)
+        self.write_lock = threading.Lock()
+
+        # Statistics
+        self.stats: Dict[str, int] = {
+            "read": 0,
+            "rejected": 0,
+            "submitted": 0,
+            "prescored": 0,
+            "completed": 0,
+            "failed": 0
+        }
+
+    def run(self, source: Union[str, TextIO], output: Union[str, TextIO]) -> Dict[str, Any]:
+        """
+        Ingest every claim in ``source`` and write decisions to ``output``.
+
+        Args:
+            source: JSONL path, open stream, or '-' for stdin
+            output: JSONL path, open stream, or '-' for stdout
+
+        Returns:
+            Ingestion statistics
+        """
+        started = time.perf_counter()
+
+        diagnostics = contextlib.nullcontext()
+        if output == "-":
+            out, should_close = sys.stdout, False
+            # Decisions own stdout: progress prints and logs go to stderr meanwhile
+            diagnostics = contextlib.redirect_stdout(sys.stderr)
+        elif isinstance(output, str):
+            out, should_close = open(output, "w", encoding="utf-8"), True
+        else:
+            out, should_close = output, False
+
+        with diagnostics:
+            return self._run(source, out, should_close, started)
+
+    def _run(self, source: Union[str, TextIO], out: TextIO, should_close: bool, started: float) -> Dict[str, Any]:
+        print(f"📥 Ingesting claims from {source if isinstance(source, str) else 'stream'}")
+        print(f"   Workers: {self.workers} | Max pending: {self.max_pending}")
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="ingest") as executor:
+                batch: List[InsuranceClaim] = []
+                for line_number, record in iter_claim_records(source):
+                    self.stats["read"] += 1
+
+                    try:
+                        if isinstance(record, ClaimValidationError):
+                            raise record
+                        claim = coerce_claim(record)
+                    except ClaimValidationError as e:
+                        self._write(out, {
+                            "line": line_number,
+                            "claim_id": record.get("claim_id") if isinstance(record, dict) else None,
+                            "status": "rejected",
+                            "error": str(e)
+                        }, "rejected")
+                        continue
+
+                    batch.append(claim)
+                    if self.scorer is None or len(batch) >= self.score_batch:
+                        self._submit_batch(executor, batch, out)
+                        batch = []
+                self._submit_batch(executor, batch, out)
+        finally:
+            if should_close:
+                out.close()
+
+        self.stats["elapsed_seconds"] = round(time.perf_counter() - started, 3)
+        print(f"📤 Ingestion complete: {self.stats}")
+        return dict(self.stats)
+
+    def _submit_batch(self, executor: ThreadPoolExecutor, claims: List[InsuranceClaim], out: TextIO):
+        """Pre-score (optional) and submit claims, waiting for a free slot for each"""
+        if not claims:
+            return
+        if self.scorer is not None:
+            records = self.scorer.annotate(claims)
+            self.stats["prescored"] += len(records)
+        else:
+            records = [dict(claim.__dict__) for claim in claims]
+
+        for claim, claim_data in zip(claims, records):
+            # Backpressure: wait for a free slot before reading on
+            self.slots.acquire()
+            self.stats["submitted"] += 1
+            future = executor.submit(self._process, claim, claim_data)
+            future.add_done_callback(lambda f, c=claim: self._on_done(f, c, out))
+
+    def _process(self, claim: InsuranceClaim, claim_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Run a single claim through the orchestrator"""
+        workflow = self.orchestrator.process_claim(
+            claim_id=claim.claim_id,
+            claim_data=claim_data
+        )
+        return self._decision_record(workflow)
+
+    @staticmethod
+    def _decision_record(workflow) -> Dict[str, Any]:
+        """Compact output row for a completed workflow"""
+        final = workflow.results.get("final_decision") or {}
+        duration = None
+        if workflow.completed_at:
+            duration = round((workflow.completed_at - workflow.started_at).total_seconds(), 3)
+        return {
+            "claim_id": workflow.claim_id,
+            "thread_id": workflow.thread_id,
+            "status": workflow.status,
+            "triage": workflow.triage,
+            "decision": final.get("decision") if isinstance(final, dict) else final,
+            "duration_seconds": duration
+        }
+
+    def _on_done(self, future: Future, claim: InsuranceClaim, out: TextIO):
+        """Write the decision and release the slot"""
+        try:
+            record = future.result()
+            outcome = "completed"
+        except Exception as e:
+            record = {"claim_id": claim.claim_id, "status": "failed", "error": str(e)}
+            outcome = "failed"
+        finally:
+            self.slots.release()
+        self._write(out, record, outcome)
+
+    def _write(self, out: TextIO, record: Dict[str, Any], outcome: Optional[str] = None):
+        with self.write_lock:
+            if outcome:
+                self.stats[outcome] += 1
+            out.write(json.dumps(record, default=str) + "\n")
+            out.flush()
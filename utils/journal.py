@@ -0,0 +1,211 @@
+# utils/journal.py
+"""
+Write-Ahead Journal for Durable Message Queues
+
+Features:
+- Append-only JSONL journal of enqueued and acknowledged messages
+- Group commit: one fsync covers every record written since the last one
+- Sync after fsync_every records or fsync_interval seconds (background flusher)
+- Optional wait_for_sync so send() only returns once the message is on disk
+- Recovery of unacknowledged messages on startup
+- Compaction rewrites the journal with only pending messages
+
+Usage:
+    journal = MessageJournal("state/bus.journal", fsync_every=64)
+    bus = MessageBus(journal=journal)
+"""
+
+from typing import Dict, List, Optional
+import json
+import os
+import threading
+import time
+
+
+class MessageJournal:
+    """
+    Durable record of messages sitting in MessageBus queues.
+
+    Records are {"op": "enq", "message": {...}} and {"op": "ack", "id": ...}.
+    Delivery is at-least-once: an ack that did not reach the disk before a
+    crash means the message is redelivered after restart.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        fsync_every: int = 64,
+        fsync_interval: Optional[float] = 0.05,
+        wait_for_sync: bool = False,
+        compact_after: int = 10000
+    ):
+        """
+        Args:
+            path: Journal file
+            fsync_every: Sync once this many records are unsynced (1 = every record)
+            fsync_interval: Max seconds a record stays unsynced (None = only by count)
+            wait_for_sync: Block enqueue until its record is synced
+            compact_after: Rewrite the journal after this many acks
+        """
+        self.path = path
+        self.fsync_every = max(1, fsync_every)
+        self.fsync_interval = fsync_interval
+        self.wait_for_sync = wait_for_sync
+        self.compact_after = compact_after
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+        # message_id -> serialized enq record, for compaction
+        self._pending: Dict[str, str] = {}
+        self._acks_since_compact = 0
+
+        self._lock = threading.Lock()
+        self._synced = threading.Condition(self._lock)
+        self._written_seq = 0
+        self._synced_seq = 0
+        self._closed = False
+
+        self.stats = {"enqueued": 0, "acked": 0, "fsyncs": 0, "compactions": 0, "recovered": 0}
+
+        self._recovered = self._load()
+        self.stats["recovered"] = len(self._recovered)
+        self._file = open(path, "a", encoding="utf-8")
+        with self._lock:
+            self._compact_locked()
+
+        self._flusher = None
+        if fsync_interval:
+            self._flusher = threading.Thread(target=self._flush_loop, name="journal-flusher", daemon=True)
+            self._flusher.start()
+
+    def _load(self) -> List[Dict]:
+        """Replay the journal: enqueued messages without an ack, in order"""
+        if not os.path.exists(self.path):
+            return []
+
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # Torn final write
+                    continue
+                if record.get("op") == "enq":
+                    self._pending[record["message"]["id"]] = line.rstrip("\n")
+                elif record.get("op") == "ack":
+                    self._pending.pop(record["id"], None)
+
+        return [json.loads(line)["message"] for line in self._pending.values()]
+
+    def recovered_messages(self) -> List[Dict]:
+        """Unacknowledged messages found on startup (Message.to_dict form)"""
+        return list(self._recovered)
+
+    def append(self, message_data: Dict) -> int:
+        """Record an enqueue; returns the record's sequence number"""
+        line = json.dumps({"op": "enq", "message": message_data}, default=str)
+        with self._lock:
+            self._pending[message_data["id"]] = line
+            self.stats["enqueued"] += 1
+            return self._write_locked(line)
+
+    def append_many(self, messages_data: List[Dict]) -> int:
+        """Record several enqueues under one lock; returns the last sequence number"""
+        lines = [(data["id"], json.dumps({"op": "enq", "message": data}, default=str)) for data in messages_data]
+        with self._lock:
+            seq = self._written_seq
+            for message_id, line in lines:
+                self._pending[message_id] = line
+                self.stats["enqueued"] += 1
+                seq = self._write_locked(line)
+            return seq
+
+    def ack(self, message_id: str):
+        """Record that a message was consumed"""
+        line = json.dumps({"op": "ack", "id": message_id})
+        with self._lock:
+            if self._pending.pop(message_id, None) is None:
+                return
+            self.stats["acked"] += 1
+            self._write_locked(line)
+            self._acks_since_compact += 1
+            if self._acks_since_compact >= self.compact_after:
+                self._compact_locked()
+
+    def wait_synced(self, seq: int, timeout: Optional[float] = None) -> bool:
+        """
+        Block until the record with this sequence number is on disk.
+        
+        Without a background flusher (fsync_interval=None) nothing else would
+        sync a short batch, so the waiter syncs it itself.
+        """
+        with self._lock:
+            if self._flusher is None and not self._closed and self._synced_seq < seq:
+                self._sync_locked()
+            return self._synced.wait_for(lambda: self._synced_seq >= seq or self._closed, timeout)
+
+    def _write_locked(self, line: str) -> int:
+        self._file.write(line + "\n")
+        self._written_seq += 1
+        if self._written_seq - self._synced_seq >= self.fsync_every:
+            self._sync_locked()
+        return self._written_seq
+
+    def _sync_locked(self):
+        if self._synced_seq == self._written_seq:
+            return
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._synced_seq = self._written_seq
+        self.stats["fsyncs"] += 1
+        self._synced.notify_all()
+
+    def sync(self):
+        """Force everything written so far to disk"""
+        with self._lock:
+            self._sync_locked()
+
+    def _flush_loop(self):
+        while not self._closed:
+            time.sleep(self.fsync_interval)
+            with self._lock:
+                if not self._closed:
+                    self._sync_locked()
+
+    def _compact_locked(self):
+        """Rewrite the journal with only pending enq records (atomic rename)"""
+        tmp_path = self.path + ".compact"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for line in self._pending.values():
+                f.write(line + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+        self._file.close()
+        os.replace(tmp_path, self.path)
+        self._file = open(self.path, "a", encoding="utf-8")
+        self._synced_seq = self._written_seq
+        self._acks_since_compact = 0
+        self.stats["compactions"] += 1
+        self._synced.notify_all()
+
+    def pending_count(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {
+                **self.stats,
+                "pending": len(self._pending),
+                "unsynced_records": self._written_seq - self._synced_seq
+            }
+
+    def close(self):
+        with self._lock:
+            self._sync_locked()
+            self._closed = True
+            self._file.close()
+            self._synced.notify_all()
+        if self._flusher:
+            self._flusher.join(timeout=1)
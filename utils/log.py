@@ -0,0 +1,208 @@
+# utils/log.py
+"""
+Structured Logging
+
+Features:
+- Per-subsystem loggers under "claims" (claims.bus, claims.agent, ...)
+- Global and per-subsystem levels
+- Text output (the familiar emoji lines) or JSON lines with structured fields
+- Sampling of high-volume DEBUG/INFO records per subsystem
+- Synchronous stderr output by default, so importing a module never starts
+  a thread and stdout stays free for program output
+- Optional asynchronous output (entry points opt in): records go through a
+  QueueHandler and are written by a QueueListener thread, so slow
+  terminals/pipes never block the hot path
+
+Hot paths check enabled-ness before building arguments:
+
+    _log = get_logger("bus")
+    if _log.isEnabledFor(logging.INFO):
+        _log.info("📨 [%s] → [%s]", sender, receiver, extra=fields(sender=sender, receiver=receiver))
+
+Usage:
+    from utils.log import configure_logging
+    configure_logging(level="WARNING")                       # quiet
+    configure_logging(levels={"bus": "DEBUG"}, fmt="json")   # structured
+    configure_logging(asynchronous=True)                     # in a __main__
+"""
+
+from typing import Any, Dict, Optional, TextIO
+from logging.handlers import QueueHandler, QueueListener
+import atexit
+import itertools
+import json
+import logging
+import queue
+import sys
+
+
+ROOT = "claims"
+
+_listener: Optional[QueueListener] = None
+_handler: Optional[logging.Handler] = None
+
+
+def get_logger(subsystem: str) -> logging.Logger:
+    """Logger for a subsystem (e.g. "bus", "orchestrator", "agent", "memory")"""
+    return logging.getLogger(f"{ROOT}.{subsystem}")
+
+
+def fields(**values: Any) -> Dict[str, Any]:
+    """Structured fields for a record: logger.info(msg, extra=fields(...))"""
+    return {"fields": values}
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keeps 1 in N records below WARNING for sampled loggers.
+
+    rates: logger name (or subsystem) -> fraction kept, e.g. {"bus": 0.01}
+    """
+
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        self.every = {
+            _qualify(name): max(1, round(1 / rate)) if rate > 0 else None
+            for name, rate in rates.items()
+        }
+        self.counters = {name: itertools.count() for name in self.every}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        name = record.name
+        while name:
+            if name in self.every:
+                every = self.every[name]
+                return every is not None and next(self.counters[name]) % every == 0
+            name = name.rpartition(".")[0]
+        return True
+
+
+class TextFormatter(logging.Formatter):
+    """The message alone, as the print-based output looked"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        message = record.getMessage()
+        if record.exc_info:
+            message += "\n" + self.formatException(record.exc_info)
+        return message
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record, with structured fields flattened in"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            "ts": round(record.created, 6),
+            "level": record.levelname,
+            "logger": record.name,
+            "thread": record.threadName,
+            "msg": record.getMessage()
+        }
+        data.update(getattr(record, "fields", None) or {})
+        if record.exc_info:
+            data["exc"] = self.formatException(record.exc_info)
+        return json.dumps(data, default=str, ensure_ascii=False)
+
+
+class _StderrHandler(logging.StreamHandler):
+    """Writes to the current sys.stderr (so redirection keeps working)"""
+
+    def __init__(self):
+        super().__init__(sys.stderr)
+
+    @property
+    def stream(self) -> TextIO:
+        return sys.stderr
+
+    @stream.setter
+    def stream(self, value):
+        pass
+
+
+def _qualify(name: str) -> str:
+    return name if name == ROOT or name.startswith(ROOT + ".") else f"{ROOT}.{name}"
+
+
+def _level(value) -> int:
+    return logging._checkLevel(value.upper() if isinstance(value, str) else value)
+
+
+def configure_logging(
+    level="INFO",
+    levels: Optional[Dict[str, Any]] = None,
+    fmt: str = "text",
+    stream: Optional[TextIO] = None,
+    sample: Optional[Dict[str, float]] = None,
+    asynchronous: bool = False
+) -> logging.Logger:
+    """
+    (Re)configure logging for every subsystem.
+
+    Args:
+        level: Level of the "claims" root logger
+        levels: Per-subsystem overrides, e.g. {"bus": "WARNING"}
+        fmt: "text" or "json"
+        stream: Output stream (default: the current sys.stderr)
+        sample: Fraction of DEBUG/INFO records kept per subsystem
+        asynchronous: Write from a background QueueListener thread
+    """
+    global _listener, _handler
+
+    shutdown_logging()
+
+    root = logging.getLogger(ROOT)
+    root.setLevel(_level(level))
+    root.propagate = False
+    for name, logger in list(logging.Logger.manager.loggerDict.items()):
+        if name.startswith(ROOT + ".") and isinstance(logger, logging.Logger):
+            logger.setLevel(logging.NOTSET)
+    for name, value in (levels or {}).items():
+        logging.getLogger(_qualify(name)).setLevel(_level(value))
+
+    output = logging.StreamHandler(stream) if stream is not None else _StderrHandler()
+    if fmt == "json":
+        output.setFormatter(JsonFormatter())
+    elif fmt == "text":
+        output.setFormatter(TextFormatter())
+    else:
+        raise ValueError(f"Unknown log format: {fmt}")
+
+    if asynchronous:
+        records: queue.SimpleQueue = queue.SimpleQueue()
+        _handler = QueueHandler(records)
+        _listener = QueueListener(records, output, respect_handler_level=False)
+        _listener.start()
+    else:
+        _handler = output
+
+    if sample:
+        _handler.addFilter(SamplingFilter(sample))
+    root.addHandler(_handler)
+    return root
+
+
+def flush_logging():
+    """Wait until queued records are written (restarts the listener)"""
+    if _listener is not None:
+        _listener.stop()
+        _listener.start()
+
+
+def shutdown_logging():
+    """Stop the listener (writing what is queued) and detach handlers"""
+    global _listener, _handler
+
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+    if _handler is not None:
+        logging.getLogger(ROOT).removeHandler(_handler)
+        _handler = None
+
+
+# Default: synchronous INFO text lines on stderr
+if not logging.getLogger(ROOT).handlers:
+    configure_logging()
+atexit.register(shutdown_logging)
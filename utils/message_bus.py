@@ -5,19 +5,48 @@ Advanced Message Bus for Multi-Agent Communication
 Features:
 - Asynchronous message delivery
 - Message queues per agent
-- Priority handling
+- Priority handling (FIFO within a priority)
+- Bounded queues with backpressure (block / drop-oldest / reject)
 - Message routing
-- Broadcast capabilities
-- Message history tracking
+- Broadcast / batch send (one shared payload, one history entry)
+- Topic publish/subscribe with wildcards (see utils/topics.py)
+- Message TTL / deadlines and a dead-letter queue (see utils/dead_letter.py)
+- Bounded message history with optional disk spill (see utils/message_store.py)
+- Optional transport for multi-node routing (see utils/transport.py)
+- Optional write-ahead journal for durable queues (see utils/journal.py)
+- Split locking (registry / history / per-queue) and callbacks run on a
+  bounded executor outside any bus lock
+- Compact slotted messages (ULID ids, ns timestamps, interned agent names);
+  binary codec in utils/message_codec.py (transport frames, history spill)
+- Level-controlled logging on the "claims.bus" logger (see utils/log.py)
+- Per-agent metrics: rates, queue-wait / handler-time histograms, high-water
+  marks; snapshot API and periodic dump (see utils/bus_metrics.py)
 """
 
 from typing import Dict, List, Optional, Callable, Any
 from dataclasses import dataclass, field
 from enum import Enum
-from datetime import datetime
-from queue import PriorityQueue, Queue
+from datetime import datetime, timezone
+from queue import Queue, Empty
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import base64
+import itertools
+import logging
+import random
+import sys
 import threading
-import uuid
+import time
+
+from utils.message_store import MessageStore
+from utils.topics import TopicTrie, validate_topic
+from utils.dead_letter import DeadLetterQueue, DeadLetterReason
+from utils.tracing import get_tracer
+from utils.log import get_logger, fields
+from utils.bus_metrics import AgentMetrics, MetricsDumper
+
+
+_log = get_logger("bus")
 
 
 class MessagePriority(Enum):
@@ -37,24 +66,367 @@ class MessageType(Enum):
     HANDOFF = "handoff"
 
 
-@dataclass
+_message_sequence = itertools.count()
+
+# RFC 4648 base32 -> Crockford base32, whose alphabet is in ASCII order
+_CROCKFORD = str.maketrans("ABCDEFGHIJKLMNOPQRSTUVWXYZ234567", "0123456789ABCDEFGHJKMNPQRSTVWXYZ")
+
+
+def new_message_id() -> str:
+    """ULID-style id: 48-bit ms timestamp + 80 random bits, 26 sortable chars"""
+    value = (time.time_ns() // 1_000_000) << 80 | random.getrandbits(80)
+    return base64.b32encode(value.to_bytes(16, "big")).decode("ascii")[:26].translate(_CROCKFORD)
+
+
+def _iso_to_ns(value: str) -> int:
+    """Naive-UTC ISO timestamp (older journal/spill records) to epoch ns"""
+    return int(datetime.fromisoformat(value).replace(tzinfo=timezone.utc).timestamp() * 1e9)
+
+
+def _deadline(ttl: Optional[float], deadline: Optional[float]) -> Optional[float]:
+    """Earliest of an absolute deadline and now + ttl"""
+    if ttl is not None:
+        expires = time.time() + ttl
+        return expires if deadline is None else min(deadline, expires)
+    return deadline
+
+
+class FrozenPayload(dict):
+    """Read-only dict shared by every delivery of a batch send"""
+    
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("Shared message payload is read-only")
+    
+    __setitem__ = __delitem__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+
+# Shared by messages sent without metadata
+EMPTY_METADATA = FrozenPayload()
+
+
+@dataclass(slots=True)
 class Message:
-    """Enhanced message structure"""
-    id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    """
+    Enhanced message structure.
+    
+    Slotted; created_ns is wall-clock nanoseconds (comparable across
+    processes) and sequence gives the in-process creation order.
+    """
+    id: str = field(default_factory=new_message_id)
     type: MessageType = MessageType.REQUEST
     priority: MessagePriority = MessagePriority.NORMAL
     sender: str = ""
     receiver: str = ""
     thread_id: Optional[str] = None
     content: Dict[str, Any] = field(default_factory=dict)
-    metadata: Dict[str, Any] = field(default_factory=dict)
-    timestamp: datetime = field(default_factory=datetime.utcnow)
+    # Read-only shared empty dict unless metadata is given
+    metadata: Dict[str, Any] = field(default_factory=lambda: EMPTY_METADATA)
+    created_ns: int = field(default_factory=time.time_ns)
     parent_message_id: Optional[str] = None
     requires_response: bool = False
+    # Fan-out record of a batch send: every receiver (receiver is then "")
+    receivers: Optional[List[str]] = None
+    # Topic of a published message
+    topic: Optional[str] = None
+    # Wall-clock (epoch seconds) after which the message is no longer worth handling
+    deadline: Optional[float] = None
+    # Creation order, used to break priority ties
+    sequence: int = field(default_factory=lambda: next(_message_sequence), compare=False, repr=False)
+    
+    def __post_init__(self):
+        # Agent names repeat across millions of messages
+        self.sender = sys.intern(self.sender)
+        self.receiver = sys.intern(self.receiver)
+    
+    @property
+    def timestamp(self) -> datetime:
+        """Creation time (naive UTC)"""
+        return datetime.fromtimestamp(self.created_ns / 1e9, timezone.utc).replace(tzinfo=None)
     
     def __lt__(self, other):
-        """For priority queue sorting"""
-        return self.priority.value < other.priority.value
+        """For priority queue sorting (older first within a priority)"""
+        return (self.priority.value, self.sequence) < (other.priority.value, other.sequence)
+    
+    def is_expired(self, now: Optional[float] = None) -> bool:
+        """Whether the deadline has passed"""
+        return self.deadline is not None and (now or time.time()) >= self.deadline
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-safe representation (for transports)"""
+        return {
+            "id": self.id,
+            "type": self.type.value,
+            "priority": self.priority.value,
+            "sender": self.sender,
+            "receiver": self.receiver,
+            "thread_id": self.thread_id,
+            "content": self.content,
+            "metadata": self.metadata,
+            "timestamp": self.timestamp.isoformat(),
+            "created_ns": self.created_ns,
+            "parent_message_id": self.parent_message_id,
+            "requires_response": self.requires_response,
+            "receivers": self.receivers,
+            "topic": self.topic,
+            "deadline": self.deadline
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Message":
+        """Rebuild a message from to_dict() output"""
+        return cls(
+            id=data["id"],
+            type=MessageType(data["type"]),
+            priority=MessagePriority(data["priority"]),
+            sender=data["sender"],
+            receiver=data["receiver"],
+            thread_id=data.get("thread_id"),
+            content=data.get("content") or {},
+            metadata=data.get("metadata") or {},
+            created_ns=data["created_ns"] if "created_ns" in data else _iso_to_ns(data["timestamp"]),
+            parent_message_id=data.get("parent_message_id"),
+            requires_response=data.get("requires_response", False),
+            receivers=data.get("receivers"),
+            topic=data.get("topic"),
+            deadline=data.get("deadline")
+        )
+    
+    def for_receiver(self, receiver: str) -> "Message":
+        """Delivery of a fan-out record to one receiver (shares content and metadata)"""
+        return Message(
+            id=f"{self.id}:{receiver}",
+            type=self.type,
+            priority=self.priority,
+            sender=self.sender,
+            receiver=receiver,
+            thread_id=self.thread_id,
+            content=self.content,
+            metadata=self.metadata,
+            created_ns=self.created_ns,
+            parent_message_id=self.parent_message_id,
+            requires_response=self.requires_response,
+            topic=self.topic,
+            deadline=self.deadline
+        )
+
+
+class BackpressureError(Exception):
+    """Raised to the sender when a full queue rejects a message"""
+
+
+class AgentQueue:
+    """
+    Per-agent message queue: strict FIFO within each priority level.
+    
+    With a capacity, a full queue applies the backpressure policy:
+    - "block": the sender waits for space (BackpressureError after put_timeout)
+    - "drop_oldest": the oldest message of the lowest queued priority is dropped
+      (the incoming message itself when every queued one outranks it)
+    - "reject": BackpressureError is raised to the sender
+    
+    Exposes the PriorityQueue methods the bus uses (put/get/qsize/empty).
+    Entries carry their enqueue time, so get() reports the queue wait to
+    the optional AgentMetrics.
+    """
+    
+    POLICIES = ("block", "drop_oldest", "reject")
+    
+    def __init__(
+        self,
+        capacity: Optional[int] = None,
+        policy: str = "block",
+        put_timeout: Optional[float] = None,
+        on_drop: Optional[Callable[["Message"], None]] = None,
+        metrics: Optional[AgentMetrics] = None
+    ):
+        if policy not in self.POLICIES:
+            raise ValueError(f"Unknown backpressure policy: {policy}")
+        self.capacity = capacity
+        self.policy = policy
+        self.put_timeout = put_timeout
+        self.on_drop = on_drop
+        self.metrics = metrics
+        
+        # priority -> deque of (enqueue monotonic time, message)
+        self.levels: Dict[int, deque] = {p.value: deque() for p in MessagePriority}
+        self.order = sorted(self.levels)
+        self.size = 0
+        
+        self.mutex = threading.Lock()
+        self.not_empty = threading.Condition(self.mutex)
+        self.not_full = threading.Condition(self.mutex)
+        
+        self.stats = {
+            "enqueued": 0, "dequeued": 0, "dropped": 0, "rejected": 0,
+            "blocked": 0, "blocked_seconds": 0.0, "high_water": 0
+        }
+    
+    def put(self, message: "Message", force: bool = False):
+        """Add a message; force bypasses the capacity (journal recovery)"""
+        dropped = None
+        with self.mutex:
+            if not force and self.capacity is not None and self.size >= self.capacity:
+                if self.policy == "reject":
+                    self.stats["rejected"] += 1
+                    raise BackpressureError(f"Queue full ({self.capacity}) for {message.receiver}")
+                if self.policy == "drop_oldest":
+                    dropped = self._drop_oldest_locked(message)
+                else:
+                    self.stats["blocked"] += 1
+                    start = time.perf_counter()
+                    has_space = self.not_full.wait_for(lambda: self.size < self.capacity, self.put_timeout)
+                    self.stats["blocked_seconds"] += time.perf_counter() - start
+                    if not has_space:
+                        self.stats["rejected"] += 1
+                        raise BackpressureError(
+                            f"Queue full ({self.capacity}) for {message.receiver} after {self.put_timeout}s"
+                        )
+            
+            enqueued = dropped is not message
+            if enqueued:
+                now = time.monotonic()
+                self.levels[message.priority.value].append((now, message))
+                self.size += 1
+                self.stats["enqueued"] += 1
+                if self.size > self.stats["high_water"]:
+                    self.stats["high_water"] = self.size
+                self.not_empty.notify()
+        
+        if enqueued and self.metrics:
+            self.metrics.on_enqueue(now)
+        if dropped is not None and self.on_drop:
+            self.on_drop(dropped)
+    
+    def _drop_oldest_locked(self, incoming: "Message") -> "Message":
+        """Evict for ``incoming``; a higher priority never makes way for a lower one"""
+        self.stats["dropped"] += 1
+        for level in reversed(self.order):
+            if self.levels[level]:
+                if level < incoming.priority.value:
+                    return incoming
+                self.size -= 1
+                return self.levels[level].popleft()[1]
+        return incoming
+    
+    def get(self, block: bool = True, timeout: Optional[float] = None) -> "Message":
+        """Next message (highest priority, oldest first); raises queue.Empty"""
+        with self.mutex:
+            if not block:
+                if not self.size:
+                    raise Empty
+            elif not self.not_empty.wait_for(lambda: self.size > 0, timeout):
+                raise Empty
+            
+            for level in self.order:
+                if self.levels[level]:
+                    enqueued_at, message = self.levels[level].popleft()
+                    break
+            self.size -= 1
+            self.stats["dequeued"] += 1
+            self.not_full.notify()
+        
+        if self.metrics:
+            now = time.monotonic()
+            self.metrics.on_dequeue(now, now - enqueued_at)
+        return message
+    
+    def remove(self, predicate: Callable[["Message"], bool]) -> List["Message"]:
+        """Take the queued messages matching predicate out of the queue"""
+        removed = []
+        with self.mutex:
+            for level in self.order:
+                kept = deque()
+                for entry in self.levels[level]:
+                    (removed if predicate(entry[1]) else kept).append(entry)
+                self.levels[level] = kept
+            if removed:
+                self.size -= len(removed)
+                self.stats["dequeued"] += len(removed)
+                self.not_full.notify_all()
+        
+        # Taken out instead of received, but they waited all the same
+        if self.metrics and removed:
+            now = time.monotonic()
+            for enqueued_at, _ in removed:
+                self.metrics.on_dequeue(now, now - enqueued_at)
+        return [message for _, message in removed]
+    
+    def qsize(self) -> int:
+        return self.size
+    
+    def empty(self) -> bool:
+        return self.size == 0
+    
+    def get_stats(self) -> Dict[str, Any]:
+        with self.mutex:
+            return dict(self.stats, size=self.size, capacity=self.capacity, policy=self.policy)
+
+
+class CallbackDispatcher:
+    """
+    Runs message callbacks on a small thread pool with per-callback latency stats.
+    
+    At most max_backlog callbacks wait for a worker; beyond that the sender
+    thread runs the callback itself, so a slow callback slows its own
+    producers instead of queueing without bound. workers=0 runs every
+    callback inline (in order).
+    """
+    
+    def __init__(self, workers: int = 4, max_backlog: int = 1000):
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bus-callback") if workers else None
+        self.backlog = threading.BoundedSemaphore(max_backlog) if workers else None
+        self.stats_lock = threading.Lock()
+        self.stats: Dict[str, Dict[str, float]] = {}
+        self.inline_runs = 0
+    
+    def dispatch(self, callbacks: List[Callable], message: "Message"):
+        for callback in callbacks:
+            if self.executor and self.backlog.acquire(blocking=False):
+                self.executor.submit(self._run_queued, callback, message)
+            else:
+                if self.executor:
+                    with self.stats_lock:
+                        self.inline_runs += 1
+                self._run(callback, message)
+    
+    def _run_queued(self, callback: Callable, message: "Message"):
+        try:
+            self._run(callback, message)
+        finally:
+            self.backlog.release()
+    
+    def _run(self, callback: Callable, message: "Message"):
+        start = time.perf_counter()
+        error = False
+        try:
+            callback(message)
+        except Exception as e:
+            error = True
+            _log.warning("⚠️  Callback error: %s", e, exc_info=_log.isEnabledFor(logging.DEBUG))
+        elapsed = time.perf_counter() - start
+        
+        name = getattr(callback, "__qualname__", repr(callback))
+        with self.stats_lock:
+            entry = self.stats.setdefault(name, {"calls": 0, "errors": 0, "total_seconds": 0.0, "max_seconds": 0.0})
+            entry["calls"] += 1
+            entry["errors"] += error
+            entry["total_seconds"] += elapsed
+            entry["max_seconds"] = max(entry["max_seconds"], elapsed)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        with self.stats_lock:
+            return {
+                "inline_runs": self.inline_runs,
+                "callbacks": {
+                    name: dict(entry, mean_seconds=entry["total_seconds"] / entry["calls"] if entry["calls"] else 0.0)
+                    for name, entry in self.stats.items()
+                }
+            }
+    
+    def shutdown(self, wait: bool = True):
+        if self.executor:
+            self.executor.shutdown(wait=wait)
 
 
 class MessageBus:
@@ -67,40 +439,111 @@ class MessageBus:
     - Async message delivery
     - Message history
     - Thread tracking
+    - Remote delivery through an optional Transport
     """
     
-    def __init__(self):
-        # Agent message queues: agent_name -> PriorityQueue
-        self.agent_queues: Dict[str, PriorityQueue] = {}
+    def __init__(
+        self,
+        transport: Optional[Any] = None,
+        history_limit: Optional[int] = 10000,
+        history_spill_dir: Optional[str] = None,
+        history_max_segments: Optional[int] = 20,
+        journal: Optional[Any] = None,
+        callback_workers: int = 4,
+        callback_backlog: int = 1000,
+        queue_capacity: Optional[int] = None,
+        backpressure: str = "block",
+        put_timeout: Optional[float] = None,
+        dead_letter_limit: Optional[int] = 10000,
+        metrics_window: float = 60.0
+    ):
+        # Agent message queues: agent_name -> AgentQueue
+        # (queue_capacity=None keeps them unbounded)
+        self.agent_queues: Dict[str, AgentQueue] = {}
+        if backpressure not in AgentQueue.POLICIES:
+            raise ValueError(f"Unknown backpressure policy: {backpressure}")
+        self.queue_capacity = queue_capacity
+        self.backpressure = backpressure
+        self.put_timeout = put_timeout
+        
+        # Per-agent metrics (rates over metrics_window seconds); kept after
+        # an agent unregisters so its numbers stay in snapshots
+        self.metrics_window = metrics_window
+        self.agent_metrics: Dict[str, AgentMetrics] = {}
+        self.metrics_started = time.time()
+        self.metrics_dumper: Optional[MetricsDumper] = None
         
         # Registered agents: agent_name -> agent_instance
         self.agents: Dict[str, Any] = {}
         
-        # Message history for tracing
-        self.message_history: List[Message] = []
+        # Message history for tracing: the most recent history_limit messages
+        # stay in memory (indexed by id, thread and agent pair); older ones
+        # are spilled to history_spill_dir if set, otherwise dropped
+        self.history = MessageStore(
+            max_messages=history_limit,
+            spill_dir=history_spill_dir,
+            max_segments=history_max_segments
+        )
+        
+        # Undeliverable, expired, rejected, dropped and failed messages
+        self.dead_letters = DeadLetterQueue(dead_letter_limit)
         
-        # Thread tracking: thread_id -> list of message_ids
-        self.threads: Dict[str, List[str]] = {}
+        # Topic subscriptions: pattern trie -> agent names
+        self.topics = TopicTrie()
         
         # Callbacks: message_type -> list of callbacks
         self.callbacks: Dict[MessageType, List[Callable]] = {
             mt: [] for mt in MessageType
         }
         
-        # Lock for thread safety
+        # Locking is split so routing never serializes on one lock:
+        # - lock: agent registry (register/unregister)
+        # - history_lock: history store, held only for O(1) updates/queries
+        # - each AgentQueue has its own internal lock
         self.lock = threading.Lock()
+        self.history_lock = threading.Lock()
         
-        print("🚌 Message Bus initialized")
+        # Callbacks run outside the locks, on a bounded pool
+        self.callback_dispatcher = CallbackDispatcher(callback_workers, callback_backlog)
+        
+        # Called with the names of remote agents whose node went away
+        self.agent_lost_callbacks: List[Callable[[List[str]], None]] = []
+        
+        # Optional write-ahead journal: queued messages survive a restart and
+        # are put back into their agent's queue when the agent registers
+        self.journal = journal
+        self.recovered: Dict[str, List[Message]] = {}
+        if journal:
+            for data in journal.recovered_messages():
+                message = Message.from_dict(data)
+                self.recovered.setdefault(message.receiver, []).append(message)
+        
+        # Optional transport to agents on other nodes
+        self.transport = transport
+        if transport:
+            transport.start(self._deliver_remote, self._on_agents_lost)
+        
+        _log.info("🚌 Message Bus initialized")
     
-    def register_agent(self, agent_name: str, agent_instance: Any):
-        """Register an agent with the message bus"""
+    def register_agent(self, agent_name: str, agent_instance: Any, capacity: Optional[int] = None):
+        """Register an agent with the message bus (capacity overrides queue_capacity)"""
         with self.lock:
             if agent_name not in self.agent_queues:
-                self.agent_queues[agent_name] = PriorityQueue()
+                self.agent_queues[agent_name] = AgentQueue(
+                    capacity=capacity if capacity is not None else self.queue_capacity,
+                    policy=self.backpressure,
+                    put_timeout=self.put_timeout,
+                    on_drop=self._on_message_dropped,
+                    metrics=self.agent_metrics.setdefault(agent_name, AgentMetrics(self.metrics_window))
+                )
                 self.agents[agent_name] = agent_instance
-                print(f"   ✅ Registered: {agent_name}")
+                for message in self.recovered.pop(agent_name, []):
+                    self.agent_queues[agent_name].put(message, force=True)
+                if self.transport:
+                    self.transport.announce(agent_name)
+                _log.info("   ✅ Registered: %s", agent_name, extra=fields(event="register", agent=agent_name))
             else:
-                print(f"   ⚠️  Agent {agent_name} already registered")
+                _log.warning("   ⚠️  Agent %s already registered", agent_name)
     
     def unregister_agent(self, agent_name: str):
         """Unregister an agent"""
@@ -108,7 +551,10 @@ class MessageBus:
             if agent_name in self.agent_queues:
                 del self.agent_queues[agent_name]
                 del self.agents[agent_name]
-                print(f"   ❌ Unregistered: {agent_name}")
+                self.topics.unsubscribe(agent_name)
+                if self.transport:
+                    self.transport.withdraw(agent_name)
+                _log.info("   ❌ Unregistered: %s", agent_name, extra=fields(event="unregister", agent=agent_name))
     
     def send(
         self,
@@ -119,7 +565,10 @@ class MessageBus:
         message_type: MessageType = MessageType.REQUEST,
         priority: MessagePriority = MessagePriority.NORMAL,
         requires_response: bool = False,
-        metadata: Optional[Dict] = None
+        metadata: Optional[Dict] = None,
+        parent_message_id: Optional[str] = None,
+        ttl: Optional[float] = None,
+        deadline: Optional[float] = None
     ) -> Message:
         """
         Send a message from one agent to another.
@@ -133,6 +582,9 @@ class MessageBus:
             priority: Message priority
             requires_response: Whether sender expects a response
             metadata: Additional metadata
+            parent_message_id: Message this one replies to (request/response correlation)
+            ttl: Seconds until the message expires (sets deadline)
+            deadline: Absolute expiry time (epoch seconds)
         
         Returns:
             Message object that was sent
@@ -146,18 +598,164 @@ class MessageBus:
             receiver=receiver,
             thread_id=thread_id,
             content=content,
-            metadata=metadata or {},
-            requires_response=requires_response
+            metadata=metadata or EMPTY_METADATA,
+            requires_response=requires_response,
+            parent_message_id=parent_message_id,
+            deadline=_deadline(ttl, deadline)
         )
         
         # Route message
-        self._route_message(message)
+        with get_tracer().span("bus.send", trace_id=thread_id, sender=sender, receiver=receiver, type=message_type.value):
+            self._route_message(message)
         
-        # Log
-        print(f"📨 [{sender}] → [{receiver}]: {message_type.value} (priority: {priority.name})")
+        # Log (arguments are only built when INFO is enabled)
+        if _log.isEnabledFor(logging.INFO):
+            _log.info(
+                "📨 [%s] → [%s]: %s (priority: %s)", sender, receiver, message_type.value, priority.name,
+                extra=fields(event="send", id=message.id, sender=sender, receiver=receiver,
+                             type=message_type.value, priority=priority.name, thread_id=thread_id)
+            )
         
         return message
     
+    def send_many(
+        self,
+        sender: str,
+        receivers: List[str],
+        content: Dict[str, Any],
+        thread_id: Optional[str] = None,
+        message_type: MessageType = MessageType.REQUEST,
+        priority: MessagePriority = MessagePriority.NORMAL,
+        requires_response: bool = False,
+        metadata: Optional[Dict] = None,
+        topic: Optional[str] = None,
+        ttl: Optional[float] = None
+    ) -> List[Message]:
+        """
+        Send the same content to several agents.
+        
+        The payload is frozen once and shared by every delivery, history gets
+        a single fan-out entry (Message.receivers), the journal is appended in
+        one batch and a single summary line is logged. Delivery ids are
+        "<fan-out id>:<receiver>" and resolve through get_message.
+        
+        Receivers that are unknown, or whose full queue rejects the message,
+        are skipped (and the delivery dead-lettered).
+        
+        Returns:
+            Deliveries that were queued (or handed to the transport)
+        """
+        
+        record = Message(
+            type=message_type,
+            priority=priority,
+            sender=sender,
+            receiver="",
+            receivers=list(receivers),
+            thread_id=thread_id,
+            content=FrozenPayload(content),
+            metadata=FrozenPayload(metadata) if metadata else EMPTY_METADATA,
+            requires_response=requires_response,
+            topic=topic,
+            deadline=_deadline(ttl, None)
+        )
+        deliveries = [record.for_receiver(receiver) for receiver in record.receivers]
+        
+        with get_tracer().span("bus.send_many", trace_id=thread_id, sender=sender, receivers=len(deliveries), type=message_type.value):
+            local, remote = [], []
+            for message in deliveries:
+                queue = self.agent_queues.get(message.receiver)
+                if queue is not None:
+                    local.append((queue, message))
+                elif self.transport and self.transport.has_route(message.receiver):
+                    remote.append(message)
+                else:
+                    self.dead_letters.add(message, DeadLetterReason.UNDELIVERABLE, "receiver not registered")
+            
+            # One journal batch and one history update for the whole fan-out
+            seq = self.journal.append_many([m.to_dict() for _, m in local]) if self.journal and local else None
+            self._record(record, dispatch=False)
+            
+            sent = []
+            for queue, message in local:
+                try:
+                    queue.put(message)
+                except BackpressureError as e:
+                    if self.journal:
+                        self.journal.ack(message.id)
+                    self.dead_letters.add(message, DeadLetterReason.REJECTED, str(e))
+                    continue
+                sent.append(message)
+            for message in remote:
+                if self.transport.send(message):
+                    sent.append(message)
+                else:
+                    self.dead_letters.add(message, DeadLetterReason.UNDELIVERABLE, "transport send failed")
+            
+            for message in sent:
+                self._dispatch_callbacks(message)
+            
+            if seq is not None and self.journal.wait_for_sync:
+                self.journal.wait_synced(seq)
+        
+        if _log.isEnabledFor(logging.INFO):
+            skipped = len(deliveries) - len(sent)
+            _log.info(
+                "📨 [%s] → %d agents: %s (priority: %s)%s", sender, len(sent), message_type.value, priority.name,
+                f", {skipped} skipped" if skipped else "",
+                extra=fields(event="send_many", sender=sender, delivered=len(sent), skipped=skipped,
+                             type=message_type.value, priority=priority.name, thread_id=thread_id)
+            )
+        
+        return sent
+    
+    def subscribe(self, agent_name: str, pattern: str):
+        """
+        Subscribe a local agent to a topic pattern.
+        
+        "*" matches one segment and "#" zero or more: "claims.auto.*", "audit.#".
+        """
+        if agent_name not in self.agent_queues:
+            raise ValueError(f"Agent {agent_name} not registered")
+        self.topics.subscribe(pattern, agent_name)
+        _log.info("   ✅ %s subscribed to %s", agent_name, pattern)
+    
+    def unsubscribe(self, agent_name: str, pattern: Optional[str] = None):
+        """Remove one topic subscription (or all of the agent's)"""
+        self.topics.unsubscribe(agent_name, pattern)
+    
+    def publish(
+        self,
+        sender: str,
+        topic: str,
+        content: Dict[str, Any],
+        thread_id: Optional[str] = None,
+        priority: MessagePriority = MessagePriority.NORMAL,
+        metadata: Optional[Dict] = None,
+        ttl: Optional[float] = None
+    ) -> List[Message]:
+        """
+        Publish a NOTIFICATION to the agents subscribed to a matching pattern.
+        
+        Only subscribers are woken; the sender never receives its own
+        publication. Subscriptions are local to this bus.
+        """
+        validate_topic(topic)
+        receivers = sorted(name for name in self.topics.match(topic) if name != sender)
+        if not receivers:
+            return []
+        return self.send_many(
+            sender=sender,
+            receivers=receivers,
+            content=content,
+            thread_id=thread_id,
+            message_type=MessageType.NOTIFICATION,
+            priority=priority,
+            metadata=metadata,
+            topic=topic,
+            ttl=ttl
+        )
+    
     def broadcast(
         self,
         sender: str,
@@ -181,25 +779,21 @@ class MessageBus:
         """
         
         exclude = exclude or []
-        messages = []
         
         with self.lock:
-            receivers = [name for name in self.agents.keys() if name not in exclude and name != sender]
-        
-        for receiver in receivers:
-            msg = self.send(
-                sender=sender,
-                receiver=receiver,
-                content=content,
-                thread_id=thread_id,
-                message_type=MessageType.BROADCAST,
-                priority=priority
-            )
-            messages.append(msg)
+            names = set(self.agents.keys())
+        if self.transport:
+            names |= self.transport.remote_agents()
+        receivers = [name for name in sorted(names) if name not in exclude and name != sender]
         
-        print(f"📢 [{sender}] broadcasted to {len(messages)} agents")
-        
-        return messages
+        return self.send_many(
+            sender=sender,
+            receivers=receivers,
+            content=content,
+            thread_id=thread_id,
+            message_type=MessageType.BROADCAST,
+            priority=priority
+        )
     
     def receive(self, agent_name: str, timeout: Optional[float] = None) -> Optional[Message]:
         """
@@ -214,19 +808,61 @@ class MessageBus:
         """
         
         if agent_name not in self.agent_queues:
-            print(f"⚠️  Agent {agent_name} not registered")
+            _log.warning("⚠️  Agent %s not registered", agent_name)
             return None
         
         try:
             queue = self.agent_queues[agent_name]
-            message = queue.get(timeout=timeout) if timeout else queue.get()
+            give_up = time.monotonic() + timeout if timeout else None
+            with get_tracer().span("bus.receive", agent=agent_name) as span:
+                while True:
+                    remaining = give_up - time.monotonic() if give_up is not None else None
+                    if remaining is not None and remaining <= 0:
+                        return None
+                    message = queue.get(timeout=remaining) if remaining is not None else queue.get()
+                    
+                    if self.journal:
+                        self.journal.ack(message.id)
+                    
+                    # Lazy expiry: stale messages are skipped, not handled
+                    if message.is_expired():
+                        if queue.metrics:
+                            queue.metrics.on_expired()
+                        self.dead_letters.add(message, DeadLetterReason.EXPIRED, f"expired before {agent_name} received it")
+                        continue
+                    break
+                if span:
+                    span.set("message_thread", message.thread_id)
+                    span.set("sender", message.sender)
             
-            print(f"📬 [{agent_name}] received: {message.type.value} from {message.sender}")
+            if _log.isEnabledFor(logging.INFO):
+                _log.info(
+                    "📬 [%s] received: %s from %s", agent_name, message.type.value, message.sender,
+                    extra=fields(event="receive", id=message.id, agent=agent_name, sender=message.sender,
+                                 type=message.type.value, thread_id=message.thread_id)
+                )
             
             return message
         except:
             return None
     
+    def consume(self, agent_name: str, predicate: Callable[[Message], bool]) -> List[Message]:
+        """
+        Acknowledge queued messages an agent read some other way.
+        
+        The orchestrator finds responses in thread history instead of
+        receiving them; consuming them takes them out of its queue and the
+        journal, which would otherwise keep every response for replay.
+        """
+        queue = self.agent_queues.get(agent_name)
+        if queue is None:
+            return []
+        messages = queue.remove(predicate)
+        if self.journal:
+            for message in messages:
+                self.journal.ack(message.id)
+        return messages
+    
     def has_messages(self, agent_name: str) -> bool:
         """Check if agent has pending messages"""
         if agent_name not in self.agent_queues:
@@ -240,68 +876,217 @@ class MessageBus:
         return self.agent_queues[agent_name].qsize()
     
     def _route_message(self, message: Message):
-        """Route message to appropriate queue"""
-        with self.lock:
-            # Add to receiver's queue
-            if message.receiver in self.agent_queues:
-                self.agent_queues[message.receiver].put(message)
-            else:
-                print(f"⚠️  Receiver {message.receiver} not registered - message dropped")
-                return
-            
-            # Track in history
-            self.message_history.append(message)
-            
-            # Track in thread
-            if message.thread_id:
-                if message.thread_id not in self.threads:
-                    self.threads[message.thread_id] = []
-                self.threads[message.thread_id].append(message.id)
-            
-            # Trigger callbacks
-            for callback in self.callbacks.get(message.type, []):
-                try:
-                    callback(message)
-                except Exception as e:
-                    print(f"⚠️  Callback error: {e}")
+        """Route message to appropriate queue (or to a remote node)"""
+        # Dict lookups are atomic; the queue has its own lock
+        queue = self.agent_queues.get(message.receiver)
+        if queue is not None:
+            self._enqueue(queue, message)
+        elif self.transport and self.transport.send(message):
+            self._record(message)
+        else:
+            _log.warning("⚠️  Receiver %s not registered - message dead-lettered", message.receiver)
+            self.dead_letters.add(message, DeadLetterReason.UNDELIVERABLE, "receiver not registered")
+    
+    def _enqueue(self, queue: AgentQueue, message: Message):
+        """
+        Journal, record and queue a local message.
+        
+        May block or raise BackpressureError when the receiver's queue is full.
+        """
+        # Write-ahead: journaled before it becomes visible to the receiver
+        seq = self.journal.append(message.to_dict()) if self.journal else None
+        
+        # Recorded before queueing so a received message is always in history
+        self._record(message, dispatch=False)
+        try:
+            queue.put(message)
+        except BackpressureError as e:
+            _log.warning("⚠️  Queue full for %s - message rejected", message.receiver)
+            if self.journal:
+                self.journal.ack(message.id)
+            self.dead_letters.add(message, DeadLetterReason.REJECTED, str(e))
+            raise
+        self._dispatch_callbacks(message)
+        
+        # Outside any lock, so concurrent senders share one fsync
+        if seq is not None and self.journal.wait_for_sync:
+            self.journal.wait_synced(seq)
+    
+    def _on_message_dropped(self, message: Message):
+        """A drop_oldest queue discarded a message"""
+        _log.warning("⚠️  Queue full for %s - dropped message %s", message.receiver, message.id)
+        if self.journal:
+            self.journal.ack(message.id)
+        self.dead_letters.add(message, DeadLetterReason.DROPPED, "queue full (drop_oldest)")
+    
+    def dead_letter(self, message: Message, reason: DeadLetterReason, detail: str = ""):
+        """Move a message to the dead-letter queue (e.g. after its handler failed)"""
+        _log.warning("☠️  Dead-lettered %s (%s): %s", message.id, reason.value, detail)
+        self.dead_letters.add(message, reason, detail)
+    
+    def replay_dead_letters(
+        self,
+        reason: Optional[DeadLetterReason] = None,
+        predicate: Optional[Callable] = None,
+        limit: Optional[int] = None,
+        ttl: Optional[float] = None
+    ) -> List[Message]:
+        """Re-send dead letters (see DeadLetterQueue.replay)"""
+        return self.dead_letters.replay(self, reason, predicate, limit, ttl)
+    
+    def _deliver_remote(self, message: Message):
+        """Enqueue a message that arrived from another node"""
+        queue = self.agent_queues.get(message.receiver)
+        if queue is None:
+            _log.warning("⚠️  Remote message for unknown agent %s dropped", message.receiver)
+            return
+        try:
+            self._enqueue(queue, message)
+        except BackpressureError:
+            # Already reported; never raise into the transport's reader
+            pass
+    
+    def _on_agents_lost(self, agent_names: List[str]):
+        """Notify listeners that remote agents became unreachable"""
+        _log.warning("⚠️  Lost remote agents: %s", ", ".join(agent_names))
+        for callback in list(self.agent_lost_callbacks):
+            try:
+                callback(agent_names)
+            except Exception as e:
+                _log.warning("⚠️  Agent-lost callback error: %s", e)
+    
+    def register_agent_lost_callback(self, callback: Callable[[List[str]], None]):
+        """Register a callback for remote node loss"""
+        self.agent_lost_callbacks.append(callback)
+    
+    def is_routable(self, agent_name: str) -> bool:
+        """Whether the agent is local or reachable through the transport"""
+        return agent_name in self.agent_queues or bool(self.transport and self.transport.has_route(agent_name))
+    
+    def _record(self, message: Message, dispatch: bool = True):
+        """Track a routed message in history (thread and conversation indexes included)"""
+        with self.history_lock:
+            self.history.add(message)
+        if dispatch:
+            self._dispatch_callbacks(message)
+    
+    def _dispatch_callbacks(self, message: Message):
+        callbacks = self.callbacks.get(message.type)
+        if callbacks:
+            self.callback_dispatcher.dispatch(callbacks, message)
     
     def register_callback(self, message_type: MessageType, callback: Callable):
         """Register a callback for specific message type"""
         self.callbacks[message_type].append(callback)
-        print(f"   ✅ Registered callback for {message_type.value}")
+        _log.info("   ✅ Registered callback for %s", message_type.value)
+    
+    @property
+    def message_history(self) -> List[Message]:
+        """In-memory (most recent) part of the history"""
+        with self.history_lock:
+            return list(self.history)
+    
+    def get_message(self, message_id: str) -> Optional[Message]:
+        """Look up a message by id"""
+        with self.history_lock:
+            return self.history.get(message_id)
     
     def get_thread_messages(self, thread_id: str) -> List[Message]:
-        """Get all messages in a thread"""
-        if thread_id not in self.threads:
-            return []
-        
-        message_ids = self.threads[thread_id]
-        return [msg for msg in self.message_history if msg.id in message_ids]
+        """Get all messages in a thread (spilled ones included)"""
+        with self.history_lock:
+            return self.history.thread(thread_id)
     
     def get_conversation(self, agent1: str, agent2: str) -> List[Message]:
-        """Get conversation between two agents"""
-        return [
-            msg for msg in self.message_history
-            if (msg.sender == agent1 and msg.receiver == agent2) or
-               (msg.sender == agent2 and msg.receiver == agent1)
-        ]
+        """Get conversation between two agents (spilled ones included)"""
+        with self.history_lock:
+            return self.history.conversation(agent1, agent2)
+    
+    def record_handler_time(self, agent_name: str, seconds: float, failed: bool = False):
+        """Report how long an agent's handler took for one message"""
+        metrics = self.agent_metrics.get(agent_name)
+        if metrics:
+            metrics.on_handled(seconds, failed)
+    
+    def metrics_snapshot(self) -> Dict[str, Any]:
+        """
+        Per-agent queue and handler metrics.
+        
+        Per agent: depth, high-water mark, enqueue/dequeue counts and rates,
+        queue-wait and handler-time histograms (seconds), and expired /
+        dropped / rejected / blocked counts.
+        """
+        with self.lock:
+            queues = dict(self.agent_queues)
+            metrics = dict(self.agent_metrics)
+        
+        agents = {}
+        for name, agent in metrics.items():
+            data = agent.snapshot()
+            queue = queues.get(name)
+            if queue is not None:
+                stats = queue.get_stats()
+                data.update(
+                    depth=stats["size"],
+                    high_water=stats["high_water"],
+                    dropped=stats["dropped"],
+                    rejected=stats["rejected"],
+                    blocked=stats["blocked"],
+                    blocked_seconds=round(stats["blocked_seconds"], 6)
+                )
+            else:
+                data.update(depth=0, registered=False)
+            agents[name] = data
+        
+        return {
+            "timestamp": time.time(),
+            "uptime_seconds": round(time.time() - self.metrics_started, 3),
+            "window_seconds": self.metrics_window,
+            "agents": agents
+        }
+    
+    def start_metrics_dump(self, interval: float = 10.0, path: Optional[str] = None):
+        """
+        Write a metrics snapshot every interval seconds: JSON lines appended
+        to path, or an INFO record on the "claims.metrics" logger.
+        """
+        self.stop_metrics_dump(final_dump=False)
+        self.metrics_dumper = MetricsDumper(self.metrics_snapshot, interval, path)
+    
+    def stop_metrics_dump(self, final_dump: bool = True):
+        """Stop the periodic dump (writing one last snapshot)"""
+        if self.metrics_dumper:
+            self.metrics_dumper.stop(final_dump)
+            self.metrics_dumper = None
     
     def get_stats(self) -> Dict:
         """Get message bus statistics"""
+        with self.history_lock:
+            history = {
+                "total_messages": self.history.total_recorded,
+                "active_threads": self.history.thread_count(),
+                "history": self.history.get_stats()
+            }
         with self.lock:
             return {
                 "registered_agents": len(self.agents),
-                "total_messages": len(self.message_history),
-                "active_threads": len(self.threads),
+                **history,
+                "remote_agents": len(self.transport.remote_agents()) if self.transport else 0,
+                "journal": self.journal.get_stats() if self.journal else None,
+                "callbacks": self.callback_dispatcher.get_stats(),
+                "subscriptions": self.topics.subscriptions(),
+                "dead_letters": self.dead_letters.get_stats(),
                 "pending_by_agent": {
                     name: queue.qsize()
                     for name, queue in self.agent_queues.items()
+                },
+                "queues": {
+                    name: queue.get_stats()
+                    for name, queue in self.agent_queues.items()
                 }
             }
     
     def clear_history(self):
         """Clear message history (for testing)"""
-        with self.lock:
-            self.message_history.clear()
-            self.threads.clear()
-        print("🗑️  Message history cleared")
\ No newline at end of file
+        with self.history_lock:
+            self.history.clear()
+        _log.info("🗑️  Message history cleared")
\ No newline at end of file
@@ -0,0 +1,254 @@
+# utils/message_codec.py
+"""
+Binary Message Codec
+
+Features:
+- Compact binary frames for persistence and IPC (vs. JSON via to_dict)
+- Fixed header (struct) + length-prefixed strings + opaque payload
+- Payload (content + metadata) encoded with ormsgpack when installed,
+  JSON otherwise; the frame records which
+- MessageView: reads header fields straight from the buffer and exposes the
+  payload as a memoryview, decoding it only on access (routers never
+  deserialize payloads)
+- Length-prefixed framing helpers for streams and files
+
+Frame layout (little-endian):
+    B version | B flags | B type | B priority | q created_ns | d deadline
+    6 x (H length + utf-8)  id, sender, receiver, thread_id, parent, topic
+    [H count + count x (H length + utf-8)]  receivers (flag)
+    I payload length + payload bytes
+"""
+
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple, Union
+import json
+import struct
+
+try:
+    import ormsgpack
+except ImportError:
+    ormsgpack = None
+
+from utils.message_bus import Message, MessageType, MessagePriority
+
+
+VERSION = 1
+
+FLAG_REQUIRES_RESPONSE = 0x01
+FLAG_HAS_DEADLINE = 0x02
+FLAG_MSGPACK = 0x04
+FLAG_HAS_RECEIVERS = 0x08
+
+_HEADER = struct.Struct("<BBBBqd")
+_U16 = struct.Struct("<H")
+_U32 = struct.Struct("<I")
+_NONE = 0xFFFF
+
+# Bytes of the length prefix before each frame written by pack_frames
+FRAME_PREFIX = _U32.size
+
+_TYPES = list(MessageType)
+_TYPE_CODES = {t: i for i, t in enumerate(_TYPES)}
+_PRIORITIES = {p.value: p for p in MessagePriority}
+
+Buffer = Union[bytes, bytearray, memoryview]
+
+
+class CodecError(ValueError):
+    """Malformed or unsupported frame"""
+
+
+def _pack_str(parts: List[bytes], value: Optional[str]):
+    if value is None:
+        parts.append(_U16.pack(_NONE))
+        return
+    data = value.encode("utf-8")
+    if len(data) >= _NONE:
+        raise CodecError(f"String field too long ({len(data)} bytes)")
+    parts.append(_U16.pack(len(data)))
+    parts.append(data)
+
+
+def _encode_payload(content: Dict[str, Any], metadata: Dict[str, Any]) -> Tuple[bytes, int]:
+    if ormsgpack is not None:
+        try:
+            return ormsgpack.packb([content, metadata], option=ormsgpack.OPT_NON_STR_KEYS), FLAG_MSGPACK
+        except TypeError:
+            # Types msgpack cannot express fall back to JSON (default=str)
+            pass
+    return json.dumps([content, metadata], default=str, separators=(",", ":")).encode("utf-8"), 0
+
+
+def _decode_payload(data: memoryview, flags: int) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    if flags & FLAG_MSGPACK:
+        if ormsgpack is None:
+            raise CodecError("Frame payload is msgpack but ormsgpack is not installed")
+        content, metadata = ormsgpack.unpackb(data)
+    else:
+        content, metadata = json.loads(bytes(data))
+    return content, metadata
+
+
+def encode(message: Message) -> bytes:
+    """Serialize a message to a binary frame"""
+    payload, flags = _encode_payload(message.content, message.metadata)
+    if message.requires_response:
+        flags |= FLAG_REQUIRES_RESPONSE
+    if message.deadline is not None:
+        flags |= FLAG_HAS_DEADLINE
+    if message.receivers is not None:
+        flags |= FLAG_HAS_RECEIVERS
+
+    parts = [_HEADER.pack(
+        VERSION,
+        flags,
+        _TYPE_CODES[message.type],
+        message.priority.value,
+        message.created_ns,
+        message.deadline if message.deadline is not None else 0.0
+    )]
+    for value in (message.id, message.sender, message.receiver, message.thread_id, message.parent_message_id, message.topic):
+        _pack_str(parts, value)
+    if message.receivers is not None:
+        parts.append(_U16.pack(len(message.receivers)))
+        for receiver in message.receivers:
+            _pack_str(parts, receiver)
+    parts.append(_U32.pack(len(payload)))
+    parts.append(payload)
+    return b"".join(parts)
+
+
+class MessageView:
+    """
+    Zero-copy reader over an encoded frame.
+
+    Header fields are parsed eagerly (cheap); content and metadata are
+    decoded from the payload memoryview on first access.
+    """
+
+    __slots__ = ("buffer", "flags", "type", "priority", "created_ns", "deadline",
+                 "id", "sender", "receiver", "thread_id", "parent_message_id", "topic",
+                 "receivers", "payload", "_decoded")
+
+    def __init__(self, buffer: Buffer):
+        view = memoryview(buffer)
+        if len(view) < _HEADER.size:
+            raise CodecError("Frame shorter than header")
+        version, flags, type_code, priority, created_ns, deadline = _HEADER.unpack_from(view, 0)
+        if version != VERSION:
+            raise CodecError(f"Unsupported frame version {version}")
+
+        self.buffer = view
+        self.flags = flags
+        self.type = _TYPES[type_code]
+        self.priority = _PRIORITIES[priority]
+        self.created_ns = created_ns
+        self.deadline = deadline if flags & FLAG_HAS_DEADLINE else None
+
+        offset = _HEADER.size
+        fields = []
+        for _ in range(6):
+            value, offset = self._read_str(view, offset)
+            fields.append(value)
+        self.id, self.sender, self.receiver, self.thread_id, self.parent_message_id, self.topic = fields
+
+        self.receivers: Optional[List[str]] = None
+        if flags & FLAG_HAS_RECEIVERS:
+            (count,) = _U16.unpack_from(view, offset)
+            offset += _U16.size
+            self.receivers = []
+            for _ in range(count):
+                value, offset = self._read_str(view, offset)
+                self.receivers.append(value)
+
+        (length,) = _U32.unpack_from(view, offset)
+        offset += _U32.size
+        if offset + length > len(view):
+            raise CodecError("Truncated payload")
+        self.payload = view[offset:offset + length]
+        self._decoded: Optional[Tuple[Dict, Dict]] = None
+
+    @staticmethod
+    def _read_str(view: memoryview, offset: int) -> Tuple[Optional[str], int]:
+        (length,) = _U16.unpack_from(view, offset)
+        offset += _U16.size
+        if length == _NONE:
+            return None, offset
+        return str(view[offset:offset + length], "utf-8"), offset + length
+
+    @property
+    def requires_response(self) -> bool:
+        return bool(self.flags & FLAG_REQUIRES_RESPONSE)
+
+    def _payload(self) -> Tuple[Dict, Dict]:
+        if self._decoded is None:
+            self._decoded = _decode_payload(self.payload, self.flags)
+        return self._decoded
+
+    @property
+    def content(self) -> Dict[str, Any]:
+        return self._payload()[0]
+
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        return self._payload()[1]
+
+    def to_message(self) -> Message:
+        return Message(
+            id=self.id,
+            type=self.type,
+            priority=self.priority,
+            sender=self.sender,
+            receiver=self.receiver,
+            thread_id=self.thread_id,
+            content=self.content,
+            metadata=self.metadata,
+            created_ns=self.created_ns,
+            parent_message_id=self.parent_message_id,
+            requires_response=self.requires_response,
+            receivers=self.receivers,
+            topic=self.topic,
+            deadline=self.deadline
+        )
+
+
+def decode(buffer: Buffer) -> Message:
+    """Deserialize a frame into a Message"""
+    return MessageView(buffer).to_message()
+
+
+def pack_frames(messages: List[Message]) -> bytes:
+    """Concatenate length-prefixed frames"""
+    parts = []
+    for message in messages:
+        frame = encode(message)
+        parts.append(_U32.pack(len(frame)))
+        parts.append(frame)
+    return b"".join(parts)
+
+
+def iter_frames(buffer: Buffer) -> Iterator[MessageView]:
+    """Views over length-prefixed frames (no copies of the underlying buffer)"""
+    view = memoryview(buffer)
+    offset = 0
+    while offset + _U32.size <= len(view):
+        (length,) = _U32.unpack_from(view, offset)
+        offset += _U32.size
+        if offset + length > len(view):
+            raise CodecError("Truncated frame")
+        yield MessageView(view[offset:offset + length])
+        offset += length
+
+
+def read_frame(stream: BinaryIO) -> Optional[bytes]:
+    """Next length-prefixed frame from a binary stream (None at the end or on a torn frame)"""
+    prefix = stream.read(_U32.size)
+    if len(prefix) < _U32.size:
+        return None
+    (length,) = _U32.unpack(prefix)
+    frame = stream.read(length)
+    return frame if len(frame) == length else None
+
+
+def codec_name() -> str:
+    """Payload encoding used for new frames"""
+    return "ormsgpack" if ormsgpack is not None else "json"
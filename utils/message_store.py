@@ -0,0 +1,369 @@
+# utils/message_store.py
+"""
+Bounded Message History
+
+Features:
+- In-memory ring buffer of recent messages with id / thread / pair indexes
+- O(1) eviction of the oldest message (indexes are per-key deques)
+- Optional spill of evicted messages to an on-disk segment log of binary
+  frames (utils/message_codec.py); scans filter on frame headers and only
+  decode the payloads of matching messages
+- Per-segment thread / pair summaries so queries only read relevant segments
+- Bounded spill: at most max_segments segments (oldest removed first) and
+  frame offsets indexed for the newest indexed_segments only; older
+  segments are located by id range and scanned as a stream
+- Running distinct-thread count across both tiers
+- Thread and conversation queries transparently span both tiers
+"""
+
+from typing import Dict, List, Optional, Tuple, Set, Deque, Iterator, TYPE_CHECKING
+from collections import deque, OrderedDict
+import os
+
+if TYPE_CHECKING:
+    from utils.message_bus import Message
+    from utils.message_codec import MessageView
+
+
+PairKey = Tuple[str, str]
+
+
+def message_pairs(sender: str, receiver: str, receivers: Optional[List[str]]) -> List[PairKey]:
+    """Conversation keys of a message (one per receiver for fan-out records)"""
+    if receivers is not None:
+        return [pair_key(sender, r) for r in receivers]
+    return [pair_key(sender, receiver)]
+
+
+def _codec():
+    # Imported lazily: message_codec imports message_bus, which imports this module
+    from utils import message_codec
+    return message_codec
+
+
+def pair_key(agent1: str, agent2: str) -> PairKey:
+    """Unordered agent pair used to index conversations"""
+    return (agent1, agent2) if agent1 <= agent2 else (agent2, agent1)
+
+
+class SegmentLog:
+    """
+    Append-only segments of length-prefixed message frames for spilled messages.
+
+    Only a small summary per segment (which threads and agent pairs it
+    contains, and its id range) is kept in memory, plus the frame offsets
+    of the newest indexed_segments segments; message bodies live on disk.
+    At most max_segments segments are kept (None keeps every segment).
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        segment_max_messages: int = 50000,
+        max_segments: Optional[int] = 20,
+        indexed_segments: int = 2
+    ):
+        self.directory = directory
+        self.segment_max_messages = segment_max_messages
+        self.max_segments = max_segments
+        self.indexed_segments = max(1, indexed_segments)
+        os.makedirs(directory, exist_ok=True)
+
+        # segment path -> (threads, pairs)
+        self.segments: "OrderedDict[str, Tuple[Set[str], Set[PairKey]]]" = OrderedDict()
+        # segment path -> [lowest id, highest id] (ids sort by creation time)
+        self.id_ranges: Dict[str, List[str]] = {}
+        # newest segments only: path -> {message id -> (frame offset, frame length)}
+        self.indexes: "OrderedDict[str, Dict[str, Tuple[int, int]]]" = OrderedDict()
+        # thread id -> number of segments containing it
+        self.thread_refs: Dict[str, int] = {}
+        self._file = None
+        self._count = 0
+        self._sequence = 0
+        self.spilled = 0
+
+        self._load_existing()
+
+    def _load_existing(self):
+        """Rebuild segment summaries after a restart"""
+        names = sorted(n for n in os.listdir(self.directory) if n.startswith("segment-") and n.endswith(".frames"))
+        for name in names:
+            path = os.path.join(self.directory, name)
+            # Adding a segment drops the index of the oldest indexed one
+            self._add_segment(path)
+            threads, pairs = self.segments[path]
+            index = self.indexes[path]
+            for offset, view in self._read(path):
+                index[view.id] = (offset, len(view.buffer))
+                self._note_id(path, view.id)
+                if view.thread_id and view.thread_id not in threads:
+                    threads.add(view.thread_id)
+                    self.thread_refs[view.thread_id] = self.thread_refs.get(view.thread_id, 0) + 1
+                pairs.update(message_pairs(view.sender, view.receiver, view.receivers))
+            self._sequence = max(self._sequence, int(name[8:-7]) + 1)
+        self._drop_old_segments()
+
+    def _add_segment(self, path: str):
+        self.segments[path] = (set(), set())
+        self.indexes[path] = {}
+        while len(self.indexes) > self.indexed_segments:
+            # Older segments are found through their id range and a scan
+            self.indexes.popitem(last=False)
+
+    def _note_id(self, path: str, message_id: str):
+        id_range = self.id_ranges.get(path)
+        if id_range is None:
+            self.id_ranges[path] = [message_id, message_id]
+        elif message_id < id_range[0]:
+            id_range[0] = message_id
+        elif message_id > id_range[1]:
+            id_range[1] = message_id
+
+    def _drop_old_segments(self) -> List[str]:
+        """Remove segments beyond max_segments; returns threads no longer in any segment"""
+        dropped: List[str] = []
+        if self.max_segments is None:
+            return dropped
+        while len(self.segments) > self.max_segments:
+            oldest, (threads, _) = self.segments.popitem(last=False)
+            self.indexes.pop(oldest, None)
+            self.id_ranges.pop(oldest, None)
+            for thread_id in threads:
+                self.thread_refs[thread_id] -= 1
+                if not self.thread_refs[thread_id]:
+                    del self.thread_refs[thread_id]
+                    dropped.append(thread_id)
+            os.remove(oldest)
+        return dropped
+
+    def _rotate(self) -> List[str]:
+        """Start a new segment; returns threads no longer in any segment"""
+        if self._file:
+            self._file.close()
+        path = os.path.join(self.directory, f"segment-{self._sequence:08d}.frames")
+        self._sequence += 1
+        self._file = open(path, "ab")
+        self._count = 0
+        self._add_segment(path)
+        return self._drop_old_segments()
+
+    def append(self, message: "Message") -> List[str]:
+        """Spill a message; returns threads whose last segment was removed"""
+        dropped: List[str] = []
+        if self._file is None or self._count >= self.segment_max_messages:
+            dropped = self._rotate()
+        codec = _codec()
+        path = self._file.name
+        data = codec.pack_frames([message])
+        offset = self._file.tell() + codec.FRAME_PREFIX
+        self._file.write(data)
+        self._count += 1
+        self.spilled += 1
+        self.indexes[path][message.id] = (offset, len(data) - codec.FRAME_PREFIX)
+        self._note_id(path, message.id)
+
+        threads, pairs = self.segments[path]
+        if message.thread_id and message.thread_id not in threads:
+            threads.add(message.thread_id)
+            self.thread_refs[message.thread_id] = self.thread_refs.get(message.thread_id, 0) + 1
+        pairs.update(message_pairs(message.sender, message.receiver, message.receivers))
+        return dropped
+
+    def flush(self):
+        if self._file:
+            self._file.flush()
+
+    @staticmethod
+    def _read(path: str) -> Iterator[Tuple[int, "MessageView"]]:
+        """(offset, view) of each frame, streamed (a torn final frame ends the segment)"""
+        codec = _codec()
+        with open(path, "rb") as f:
+            offset = 0
+            while True:
+                frame = codec.read_frame(f)
+                if frame is None:
+                    return
+                offset += codec.FRAME_PREFIX
+                try:
+                    view = codec.MessageView(frame)
+                except codec.CodecError:
+                    return
+                yield offset, view
+                offset += len(frame)
+
+    def _scan(self, paths: List[str]) -> Iterator["MessageView"]:
+        self.flush()
+        for path in paths:
+            for _, view in self._read(path):
+                yield view
+
+    def thread_messages(self, thread_id: str) -> List["Message"]:
+        paths = [p for p, (threads, _) in self.segments.items() if thread_id in threads]
+        return [v.to_message() for v in self._scan(paths) if v.thread_id == thread_id]
+
+    def conversation(self, key: PairKey) -> List["Message"]:
+        paths = [p for p, (_, pairs) in self.segments.items() if key in pairs]
+        return [
+            v.to_message() for v in self._scan(paths)
+            if key in message_pairs(v.sender, v.receiver, v.receivers)
+        ]
+
+    def find(self, message_id: str) -> Optional["Message"]:
+        """
+        Read one spilled message by id.
+
+        Indexed segments read a single frame; older segments are scanned
+        only when the id falls within their id range, so an unknown id
+        usually reads nothing.
+        """
+        for path, index in reversed(self.indexes.items()):
+            location = index.get(message_id)
+            if location is not None:
+                offset, length = location
+                self.flush()
+                with open(path, "rb") as f:
+                    f.seek(offset)
+                    return _codec().decode(f.read(length))
+
+        candidates = [
+            path for path in reversed(self.segments)
+            if path not in self.indexes
+            and path in self.id_ranges
+            and self.id_ranges[path][0] <= message_id <= self.id_ranges[path][1]
+        ]
+        for view in self._scan(candidates):
+            if view.id == message_id:
+                return view.to_message()
+        return None
+
+    def has_thread(self, thread_id: str) -> bool:
+        return thread_id in self.thread_refs
+
+    def close(self):
+        if self._file:
+            self._file.close()
+            self._file = None
+
+
+class MessageStore:
+    """
+    Two-tier message history: bounded memory ring buffer plus optional disk.
+
+    Not thread-safe on its own; the MessageBus calls it under its lock.
+    """
+
+    def __init__(
+        self,
+        max_messages: Optional[int] = 10000,
+        spill_dir: Optional[str] = None,
+        segment_max_messages: int = 50000,
+        max_segments: Optional[int] = 20,
+        indexed_segments: int = 2
+    ):
+        self.max_messages = max_messages
+        self.recent: Deque["Message"] = deque()
+        self.by_id: Dict[str, "Message"] = {}
+        self.by_thread: Dict[str, Deque["Message"]] = {}
+        self.by_pair: Dict[PairKey, Deque["Message"]] = {}
+        self.spill = SegmentLog(spill_dir, segment_max_messages, max_segments, indexed_segments) if spill_dir else None
+        self.evicted = 0
+        self.total_recorded = 0
+        # Distinct threads across memory and spill, kept up to date as
+        # messages are added, evicted and dropped with old segments
+        self.threads = len(self.spill.thread_refs) if self.spill else 0
+
+    def add(self, message: "Message"):
+        self.recent.append(message)
+        self.by_id[message.id] = message
+        if message.thread_id:
+            thread = self.by_thread.get(message.thread_id)
+            if thread is None:
+                thread = self.by_thread[message.thread_id] = deque()
+                if not (self.spill and self.spill.has_thread(message.thread_id)):
+                    self.threads += 1
+            thread.append(message)
+        for key in message_pairs(message.sender, message.receiver, message.receivers):
+            self.by_pair.setdefault(key, deque()).append(message)
+        self.total_recorded += 1
+
+        if self.max_messages is not None:
+            while len(self.recent) > self.max_messages:
+                self._evict_oldest()
+
+    def _evict_oldest(self):
+        message = self.recent.popleft()
+        self.by_id.pop(message.id, None)
+
+        # The oldest message overall is also the oldest of its thread / pair
+        if message.thread_id:
+            thread = self.by_thread.get(message.thread_id)
+            if thread:
+                thread.popleft()
+                if not thread:
+                    del self.by_thread[message.thread_id]
+                    if not self.spill:
+                        self.threads -= 1
+        for key in message_pairs(message.sender, message.receiver, message.receivers):
+            pair = self.by_pair.get(key)
+            if pair:
+                pair.popleft()
+                if not pair:
+                    del self.by_pair[key]
+
+        if self.spill:
+            for thread_id in self.spill.append(message):
+                if thread_id not in self.by_thread:
+                    self.threads -= 1
+        self.evicted += 1
+
+    def get(self, message_id: str) -> Optional["Message"]:
+        """Message by id; a fan-out delivery id ("<id>:<receiver>") resolves to its record"""
+        message = self._get(message_id)
+        if message is None and ":" in message_id:
+            message = self._get(message_id.rsplit(":", 1)[0])
+        return message
+
+    def _get(self, message_id: str) -> Optional["Message"]:
+        message = self.by_id.get(message_id)
+        if message is None and self.spill:
+            message = self.spill.find(message_id)
+        return message
+
+    def thread(self, thread_id: str) -> List["Message"]:
+        recent = list(self.by_thread.get(thread_id, ()))
+        if self.spill:
+            return self.spill.thread_messages(thread_id) + recent
+        return recent
+
+    def conversation(self, agent1: str, agent2: str) -> List["Message"]:
+        key = pair_key(agent1, agent2)
+        recent = list(self.by_pair.get(key, ()))
+        if self.spill:
+            return self.spill.conversation(key) + recent
+        return recent
+
+    def thread_count(self) -> int:
+        return self.threads
+
+    def __len__(self) -> int:
+        return len(self.recent)
+
+    def __iter__(self) -> Iterator["Message"]:
+        return iter(self.recent)
+
+    def clear(self):
+        self.recent.clear()
+        self.by_id.clear()
+        self.by_thread.clear()
+        self.by_pair.clear()
+        self.threads = len(self.spill.thread_refs) if self.spill else 0
+
+    def get_stats(self) -> Dict:
+        return {
+            "in_memory": len(self.recent),
+            "max_in_memory": self.max_messages,
+            "total_recorded": self.total_recorded,
+            "evicted": self.evicted,
+            "spilled": self.spill.spilled if self.spill else 0,
+            "segments": len(self.spill.segments) if self.spill else 0
+        }
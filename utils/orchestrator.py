@@ -10,82 +10,438 @@ Features:
 - Status tracking
 """
 
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Callable, Iterable, Iterator, Set
+from collections import OrderedDict
 from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
+import logging
+import threading
 import time
 from langsmith import uuid7
 
 from utils.message_bus import MessageBus, MessageType, MessagePriority
 from agents.advanced_agent import AdvancedAgent
 from org.schemas import AgentDecision
+from utils import speculation, triage
+from utils.triage import TriageEngine
+from utils.speculation import default_speculation_check, SpeculationStats
+from utils.workflow_archive import WorkflowArchive, RetentionPolicy
+from utils.worker_pool import WorkerPool
+from utils.transport import Transport
+from utils.tracing import get_tracer
+from utils.log import get_logger, fields
+
+_log = get_logger("orchestrator")
+
+_RULE = "=" * 70
+_STAGE_RULE = "-" * 70
+
+
+def _parse_datetime(value: Any) -> Optional[datetime]:
+    if value is None or isinstance(value, datetime):
+        return value
+    try:
+        return datetime.fromisoformat(str(value))
+    except ValueError:
+        return None
+
+
+def default_workflow() -> List[Dict]:
+    """Insurance-specific workflow matching industry process"""
+    return [
+        {
+            "name": "siu_investigation",
+            "agent": "SIU_Investigator",
+            "description": "Fraud investigation with confidence assessment"
+        },
+        {
+            "name": "claims_adjustment",
+            "agent": "ClaimsAdjuster",
+            "description": "Policy review, legal risk, and valuation"
+        },
+        {
+            "name": "transparency_audit",
+            "agent": "TransparencyAuditor",
+            "description": "Audit reasoning and decision transparency"
+        },
+        {
+            "name": "final_decision",
+            "agent": "ClaimsManager",
+            "description": "Final binding decision with cost-benefit analysis"
+        }
+    ]
+
+
+def claim_metadata(claim_data: Dict) -> Dict:
+    """Routing metadata forwarded with every stage request"""
+    metadata = {}
+    if "fraud_prescore" in claim_data:
+        metadata["fraud_prescore"] = claim_data["fraud_prescore"]
+    return metadata
+
+
+class WorkflowStage:
+    """Single stage of a claim workflow"""
+    
+    __slots__ = ("name", "agent", "status", "started_at", "completed_at")
+    
+    def __init__(self, name: str, agent: str, status: str = "pending"):
+        self.name = name
+        self.agent = agent
+        self.status = status
+        self.started_at: Optional[datetime] = None
+        self.completed_at: Optional[datetime] = None
+    
+    def to_dict(self) -> Dict:
+        return {
+            "name": self.name,
+            "agent": self.agent,
+            "status": self.status,
+            "started_at": self.started_at,
+            "completed_at": self.completed_at
+        }
 
 
 class ClaimWorkflow:
-    """Workflow for processing a single claim"""
+    """
+    Workflow for processing a single claim.
     
-    def __init__(self, claim_id: str, claim_data: Dict, thread_id: str):
+    Stages are indexed by name and the completed count is maintained
+    incrementally, so stage updates and status queries are O(1). The status
+    dict is cached until the workflow next changes.
+    
+    A compacted workflow keeps only its summary in memory; ``claim_data``
+    and ``results`` are reloaded from the archive on access (as copies) and
+    its stages can no longer change.
+    """
+    
+    __slots__ = (
+        "claim_id", "_claim_data", "thread_id", "_status", "stages", "_stage_index",
+        "_completed_count", "started_at", "completed_at", "_results", "triage",
+        "speculation", "_status_cache", "on_status_change", "_archive"
+    )
+    
+    def __init__(
+        self,
+        claim_id: str,
+        claim_data: Dict,
+        thread_id: str,
+        on_status_change: Optional[Callable[["ClaimWorkflow", Optional[str], str], None]] = None
+    ):
         self.claim_id = claim_id
-        self.claim_data = claim_data
+        self._claim_data: Optional[Dict] = claim_data
         self.thread_id = thread_id
-        self.status = "initialized"
-        self.stages: List[Dict] = []
+        self.stages: List[WorkflowStage] = []
+        self._stage_index: Dict[str, WorkflowStage] = {}
+        self._completed_count = 0
         self.started_at = datetime.now(timezone.utc)
         self.completed_at: Optional[datetime] = None
-        self.results: Dict[str, Any] = {}
+        self._results: Optional[Dict[str, Any]] = {}
+        self.triage: Optional[Dict] = None
+        self.speculation: Optional[str] = None
+        self._status_cache: Optional[Dict] = None
+        self._archive: Optional[WorkflowArchive] = None
+        self.on_status_change = on_status_change
+        self._status = "initialized"
+        if on_status_change:
+            on_status_change(self, None, self._status)
+    
+    @property
+    def claim_data(self) -> Dict:
+        if self._claim_data is None:
+            return self._load_archived().get("claim_data") or {}
+        return self._claim_data
+    
+    @claim_data.setter
+    def claim_data(self, value: Dict):
+        self._claim_data = value
+    
+    @property
+    def results(self) -> Dict[str, Any]:
+        if self._results is None:
+            return self._load_archived().get("results") or {}
+        return self._results
+    
+    @property
+    def is_compacted(self) -> bool:
+        return self._archive is not None and self._results is None
+    
+    def compact(self, archive: WorkflowArchive):
+        """Move claim data and results to the archive, keeping the summary"""
+        if self.is_compacted:
+            return
+        if self._archive is None:
+            archive.store(self.to_dict())
+        self.get_status()  # Materialize the summary before dropping data
+        self._archive = archive
+        self._claim_data = None
+        self._results = None
+    
+    def _load_archived(self) -> Dict:
+        """Read the full record back from the archive (not kept by the workflow)"""
+        record = self._archive.load(self.claim_id) if self._archive else None
+        return record or {}
+    
+    def _check_mutable(self):
+        if self.is_compacted:
+            raise RuntimeError(f"Workflow {self.claim_id} is compacted to the archive and read-only")
+    
+    @classmethod
+    def from_dict(cls, record: Dict, on_status_change=None) -> "ClaimWorkflow":
+        """Rebuild a workflow from a full record (see to_dict)"""
+        workflow = cls(record["claim_id"], record.get("claim_data") or {}, record["thread_id"], on_status_change)
+        for data in record.get("stages", []):
+            workflow.add_stage(data["name"], data["agent"], data["status"])
+            stage = workflow._stage_index[data["name"]]
+            stage.started_at = _parse_datetime(data.get("started_at"))
+            stage.completed_at = _parse_datetime(data.get("completed_at"))
+        workflow._results = record.get("results") or {}
+        workflow.triage = record.get("triage")
+        workflow.speculation = record.get("speculation")
+        workflow.started_at = _parse_datetime(record.get("started_at")) or workflow.started_at
+        workflow.completed_at = _parse_datetime(record.get("completed_at"))
+        workflow.status = record.get("status", "completed")
+        return workflow
+    
+    def to_dict(self) -> Dict:
+        """Full record (status summary plus claim data and results)"""
+        record = dict(self.get_status())
+        if self.is_compacted:
+            archived = self._load_archived()
+            record["claim_data"] = archived.get("claim_data") or {}
+            record["results"] = archived.get("results") or {}
+        else:
+            record["claim_data"] = self._claim_data
+            record["results"] = self._results
+        return record
+    
+    @property
+    def status(self) -> str:
+        return self._status
+    
+    @status.setter
+    def status(self, value: str):
+        self._check_mutable()
+        old = self._status
+        self._status = value
+        self._status_cache = None
+        if self.on_status_change and old != value:
+            self.on_status_change(self, old, value)
     
     def add_stage(self, stage_name: str, agent_name: str, status: str = "pending"):
         """Add a workflow stage"""
-        self.stages.append({
-            "name": stage_name,
-            "agent": agent_name,
-            "status": status,
-            "started_at": None,
-            "completed_at": None
-        })
+        self._check_mutable()
+        stage = WorkflowStage(stage_name, agent_name, status)
+        self.stages.append(stage)
+        self._stage_index[stage_name] = stage
+        if status == "completed":
+            self._completed_count += 1
+        self._status_cache = None
+    
+    def get_stage(self, stage_name: str) -> Optional[WorkflowStage]:
+        """Look up a stage by name"""
+        return self._stage_index.get(stage_name)
     
     def start_stage(self, stage_name: str):
         """Mark stage as started"""
-        for stage in self.stages:
-            if stage["name"] == stage_name:
-                stage["status"] = "in_progress"
-                stage["started_at"] = datetime.now(timezone.utc)
-                break
+        self._check_mutable()
+        stage = self._stage_index.get(stage_name)
+        if stage is None:
+            return
+        if stage.status == "completed":
+            self._completed_count -= 1
+        stage.status = "in_progress"
+        stage.started_at = datetime.now(timezone.utc)
+        self._status_cache = None
     
     def complete_stage(self, stage_name: str, result: Any = None):
         """Mark stage as completed"""
-        for stage in self.stages:
-            if stage["name"] == stage_name:
-                stage["status"] = "completed"
-                stage["completed_at"] = datetime.now(timezone.utc)
-                if result:
-                    self.results[stage_name] = result
-                break
+        self._check_mutable()
+        stage = self._stage_index.get(stage_name)
+        if stage is None:
+            return
+        if stage.status != "completed":
+            self._completed_count += 1
+        stage.status = "completed"
+        stage.completed_at = datetime.now(timezone.utc)
+        if result:
+            self._results[stage_name] = result
+        self._status_cache = None
+    
+    @property
+    def completed_stages(self) -> int:
+        return self._completed_count
     
     def get_status(self) -> Dict:
-        """Get workflow status"""
-        total_stages = len(self.stages)
-        completed_stages = sum(1 for s in self.stages if s["status"] == "completed")
+        """Get workflow status (cached; treat the returned dict as read-only)"""
+        if self._status_cache is None:
+            self._status_cache = {
+                "claim_id": self.claim_id,
+                "thread_id": self.thread_id,
+                "status": self._status,
+                "progress": f"{self._completed_count}/{len(self.stages)}",
+                "stages": [stage.to_dict() for stage in self.stages],
+                "triage": self.triage,
+                "speculation": self.speculation,
+                "started_at": str(self.started_at),
+                "completed_at": str(self.completed_at) if self.completed_at else None
+            }
+        return self._status_cache
+
+
+class WorkflowRegistry:
+    """
+    An orchestrator's workflows with running status counts and retention.
+    
+    Counts per status are kept up to date by ClaimWorkflow status
+    transitions, so stats never scan workflows. With a RetentionPolicy,
+    completed workflows are compacted to a WorkflowArchive and the oldest
+    summaries evicted (served from the archive on demand).
+    """
+    
+    def __init__(self, retention: Optional[RetentionPolicy] = None):
+        self.workflows: Dict[str, ClaimWorkflow] = {}
+        self.counts: Dict[str, int] = {}
+        self._counts_lock = threading.Lock()
+        
+        self.retention = retention
+        self.archive = WorkflowArchive(retention.archive_path, max_records=retention.max_archived) if retention else None
+        self._retained: "OrderedDict[str, ClaimWorkflow]" = OrderedDict()   # full, oldest first
+        self._compacted: "OrderedDict[str, ClaimWorkflow]" = OrderedDict()  # summary only
+        self._retention_lock = threading.Lock()
+        self.evicted = 0
+    
+    def create(self, claim_id: str, claim_data: Dict, thread_id: str) -> ClaimWorkflow:
+        """New workflow for a claim (replacing any earlier one)"""
+        return self._add(ClaimWorkflow(claim_id, claim_data, thread_id, on_status_change=self._on_status))
+    
+    def adopt(self, record: Dict) -> ClaimWorkflow:
+        """Register a workflow that was executed elsewhere"""
+        workflow = self._add(ClaimWorkflow.from_dict(record, on_status_change=self._on_status))
+        if workflow.status == "completed":
+            self.completed(workflow)
+        return workflow
+    
+    def _add(self, workflow: ClaimWorkflow) -> ClaimWorkflow:
+        previous = self.workflows.get(workflow.claim_id)
+        self.workflows[workflow.claim_id] = workflow
+        if previous is not None:
+            self._on_status(previous, previous.status, None)
+        return workflow
+    
+    def completed(self, workflow: ClaimWorkflow):
+        """Hand a completed workflow to retention"""
+        if self.retention:
+            with self._retention_lock:
+                self._retained[workflow.claim_id] = workflow
+            self.apply_retention()
+    
+    def forget(self, claim_id: str):
+        """Drop a workflow from memory (and from the running counts)"""
+        workflow = self.workflows.pop(claim_id, None)
+        if workflow is not None:
+            self._on_status(workflow, workflow.status, None)
+    
+    def get_status(self, claim_id: str, include_results: bool = False) -> Optional[Dict]:
+        """Status of a workflow (evicted ones are served from the archive)"""
+        workflow = self.workflows.get(claim_id)
+        
+        if workflow is None:
+            record = self.archive.load(claim_id) if self.archive else None
+            if record is None:
+                return None
+            if not include_results:
+                record.pop("claim_data", None)
+                record.pop("results", None)
+            return record
+        
+        if not include_results:
+            return workflow.get_status()
+        
+        status = dict(workflow.get_status())
+        status["results"] = workflow.results
+        return status
+    
+    def apply_retention(self):
+        """Compact and evict completed workflows according to the retention policy"""
         
+        if not self.retention:
+            return
+        
+        policy = self.retention
+        now = datetime.now(timezone.utc)
+        
+        with self._retention_lock:
+            while self._retained:
+                claim_id, oldest = next(iter(self._retained.items()))
+                too_many = policy.max_workflows is not None and len(self._retained) > policy.max_workflows
+                too_old = (
+                    policy.max_age_seconds is not None
+                    and (now - oldest.completed_at).total_seconds() > policy.max_age_seconds
+                )
+                if not (too_many or too_old):
+                    break
+                
+                self._retained.popitem(last=False)
+                oldest.compact(self.archive)
+                self._compacted[claim_id] = oldest
+            
+            while policy.max_summaries is not None and len(self._compacted) > policy.max_summaries:
+                claim_id, evicted = self._compacted.popitem(last=False)
+                if self.workflows.get(claim_id) is evicted:
+                    del self.workflows[claim_id]
+                    self._on_status(evicted, evicted.status, None)
+                    self.evicted += 1
+    
+    def _on_status(self, workflow: ClaimWorkflow, old: Optional[str], new: Optional[str]):
+        """Update running counts on a workflow status transition"""
+        with self._counts_lock:
+            if old is not None:
+                self.counts[old] = self.counts.get(old, 0) - 1
+            if new is not None:
+                self.counts[new] = self.counts.get(new, 0) + 1
+    
+    def get_stats(self) -> Dict:
+        with self._counts_lock:
+            completed = self.counts.get("completed", 0)
+            in_progress = self.counts.get("in_progress", 0)
         return {
-            "claim_id": self.claim_id,
-            "thread_id": self.thread_id,
-            "status": self.status,
-            "progress": f"{completed_stages}/{total_stages}",
-            "stages": self.stages,
-            "started_at": str(self.started_at),
-            "completed_at": str(self.completed_at) if self.completed_at else None
+            "total_workflows": len(self.workflows),
+            "completed_workflows": completed,
+            "in_progress_workflows": in_progress,
+            "compacted_workflows": len(self._compacted),
+            "evicted_workflows": self.evicted,
+            "archive_stats": self.archive.get_stats() if self.archive else None
         }
 
 
+def upstream_content(workflow: ClaimWorkflow, step: Dict) -> Optional[Dict]:
+    """The final decision is made on the results of every earlier stage"""
+    if step["name"] != "final_decision":
+        return None
+    return {"upstream_results": dict(workflow.results)}
+
+
 class MultiAgentOrchestrator:
     """Orchestrator with message bus registration"""
     
-    def __init__(self):
+    def __init__(
+        self,
+        triage_engine: Optional[TriageEngine] = None,
+        speculative_decision: bool = False,
+        speculation_check: Optional[Callable[[Dict, Dict], bool]] = None,
+        speculate_after: str = "siu_investigation",
+        retention: Optional[RetentionPolicy] = None,
+        transport: Optional[Transport] = None,
+        remote_timeout: float = 120.0,
+        max_redispatch: int = 2
+    ):
         # Coordinator agent name (must be set before registering)
         self.coordinator_name = "Orchestrator"
         
-        # Initialize message bus
-        self.message_bus = MessageBus()
+        # Initialize message bus (optionally spanning nodes via a transport)
+        self.message_bus = MessageBus(transport=transport)
+        self.message_bus.register_agent_lost_callback(self._on_agents_lost)
         
         # Register orchestrator itself to receive responses
         self.message_bus.register_agent(self.coordinator_name, self)
@@ -93,10 +449,32 @@ class MultiAgentOrchestrator:
         # Registered agents
         self.agents: Dict[str, AdvancedAgent] = {}
         
-        # Active workflows
-        self.workflows: Dict[str, ClaimWorkflow] = {}
+        # Agents hosted on other nodes, reached through the transport
+        self.remote_agents: Set[str] = set()
+        self.remote_timeout = remote_timeout
+        self.max_redispatch = max_redispatch
+        self._agent_loss_generation: Dict[str, int] = {}
         
-        print("🎯 Multi-Agent Orchestrator initialized")
+        # Active workflows, their running status counts and retention
+        self.registry = WorkflowRegistry(retention)
+        self.workflows = self.registry.workflows
+        self.retention = retention
+        self.archive = self.registry.archive
+        
+        # Optional multi-process workers (see start_worker_pool)
+        self.worker_pool: Optional[WorkerPool] = None
+        
+        # Optional pre-stage triage (reduces the default workflow)
+        self.triage_engine = triage_engine
+        
+        # Optional speculative execution of the final decision stage
+        self.speculative_decision = speculative_decision
+        self.speculation_check = speculation_check or default_speculation_check
+        self.speculate_after = speculate_after
+        self.speculation_stats = SpeculationStats()
+        self._speculation_pool: Optional[ThreadPoolExecutor] = None
+        
+        _log.info("🎯 Multi-Agent Orchestrator initialized")
     
     def register_agent(self, agent: AdvancedAgent):
         """Register an agent with the orchestrator"""
@@ -107,7 +485,24 @@ class MultiAgentOrchestrator:
         # Store reference
         self.agents[agent.name] = agent
         
-        print(f"   ✅ Registered: {agent.name} ({agent.role})")
+        _log.info("   ✅ Registered: %s (%s)", agent.name, agent.role)
+    
+    def register_remote_agent(self, agent_name: str):
+        """Register an agent that runs on another node"""
+        self.remote_agents.add(agent_name)
+        _log.info("   ✅ Registered remote: %s", agent_name)
+    
+    def _on_agents_lost(self, agent_names: List[str]):
+        """Bump the loss generation so waiting stages re-dispatch"""
+        for name in agent_names:
+            self._agent_loss_generation[name] = self._agent_loss_generation.get(name, 0) + 1
+    
+    def _has_agent(self, agent_name: str) -> bool:
+        return agent_name in self.agents or agent_name in self.remote_agents
+    
+    def set_triage_engine(self, triage_engine: Optional[TriageEngine]):
+        """Enable (or disable with None) rule-based triage"""
+        self.triage_engine = triage_engine
     
     def process_claim(
         self,
@@ -121,7 +516,7 @@ class MultiAgentOrchestrator:
         Args:
             claim_id: Unique claim identifier
             claim_data: Claim information
-            workflow_steps: Custom workflow steps (or use default)
+            workflow_steps: Custom workflow steps (or use default, reduced by triage)
         
         Returns:
             ClaimWorkflow object for tracking
@@ -130,21 +525,30 @@ class MultiAgentOrchestrator:
         # Create thread for this claim
         thread_id = str(uuid7())
         
-        print("\n" + "=" * 70)
-        print(f"🚀 Starting Claim Processing")
-        print("=" * 70)
-        print(f"   Claim ID: {claim_id}")
-        print(f"   Thread ID: {thread_id}")
-        print(f"   Amount: ${claim_data.get('claim_amount', 0):,.2f}")
-        print("=" * 70 + "\n")
+        if _log.isEnabledFor(logging.INFO):
+            _log.info(
+                "\n%s\n🚀 Starting Claim Processing\n%s\n   Claim ID: %s\n   Thread ID: %s\n   Amount: $%s\n%s\n",
+                _RULE, _RULE, claim_id, thread_id, f"{claim_data.get('claim_amount', 0):,.2f}", _RULE,
+                extra=fields(event="claim_start", claim_id=claim_id, thread_id=thread_id,
+                             amount=claim_data.get("claim_amount", 0))
+            )
         
         # Create workflow
-        workflow = ClaimWorkflow(claim_id, claim_data, thread_id)
-        self.workflows[claim_id] = workflow
+        workflow = self.registry.create(claim_id, claim_data, thread_id)
         
         # Define workflow steps (or use provided)
         if not workflow_steps:
             workflow_steps = self._default_workflow()
+            
+            # Triage only applies to the default workflow
+            if self.triage_engine:
+                workflow_steps, decision = self.triage_engine.select_workflow(claim_data, workflow_steps)
+                workflow.triage = decision.to_dict()
+                _log.info(
+                    "🚦 Triage: %s (rule: %s)%s", decision.action, decision.rule or "none",
+                    f"\n   Skipping: {', '.join(decision.skip_stages)}" if decision.skip_stages else "",
+                    extra=fields(event="triage", claim_id=claim_id, action=decision.action, rule=decision.rule)
+                )
         
         # Initialize stages
         for step in workflow_steps:
@@ -153,20 +557,30 @@ class MultiAgentOrchestrator:
         workflow.status = "in_progress"
         
         # Execute workflow
-        for step in workflow_steps:
-            self._execute_step(workflow, step)
+        with get_tracer().span("claim", trace_id=thread_id, claim_id=claim_id, stages=len(workflow_steps)):
+            if self.speculative_decision and self._can_speculate(workflow_steps):
+                self._execute_speculative(workflow, workflow_steps)
+            else:
+                for step in workflow_steps:
+                    self._execute_step(workflow, step, upstream_content(workflow, step))
+        
+        # Responses that arrived after their stage gave up on them
+        self._consume_responses(thread_id, f"{thread_id}:speculative")
         
         # Mark workflow as completed
-        workflow.status = "completed"
         workflow.completed_at = datetime.now(timezone.utc)
+        workflow.status = "completed"
+        
+        self.registry.completed(workflow)
         
-        print("\n" + "=" * 70)
-        print("✅ Claim Processing Complete")
-        print("=" * 70)
-        print(f"   Claim ID: {claim_id}")
-        print(f"   Duration: {(workflow.completed_at - workflow.started_at).total_seconds():.2f}s")
-        print(f"   Stages: {len(workflow.stages)}")
-        print("=" * 70 + "\n")
+        if _log.isEnabledFor(logging.INFO):
+            duration = (workflow.completed_at - workflow.started_at).total_seconds()
+            _log.info(
+                "\n%s\n✅ Claim Processing Complete\n%s\n   Claim ID: %s\n   Duration: %.2fs\n   Stages: %d\n%s\n",
+                _RULE, _RULE, claim_id, duration, len(workflow.stages), _RULE,
+                extra=fields(event="claim_complete", claim_id=claim_id, thread_id=thread_id,
+                             duration_s=round(duration, 3), stages=len(workflow.stages))
+            )
         
         return workflow
     
@@ -176,78 +590,220 @@ class MultiAgentOrchestrator:
 
     def _default_workflow(self) -> List[Dict]:
         """Insurance-specific workflow matching industry process"""
-        return [
-            {
-                "name": "siu_investigation",
-                "agent": "SIU_Investigator",
-                "description": "Fraud investigation with confidence assessment"
-            },
-            {
-                "name": "claims_adjustment",
-                "agent": "ClaimsAdjuster",
-                "description": "Policy review, legal risk, and valuation"
-            },
-            {
-                "name": "transparency_audit",
-                "agent": "TransparencyAuditor",
-                "description": "Audit reasoning and decision transparency"
-            },
-            {
-                "name": "final_decision",
-                "agent": "ClaimsManager",
-                "description": "Final binding decision with cost-benefit analysis"
-            }
-        ]
+        return default_workflow()
     
-    def _execute_step(self, workflow: ClaimWorkflow, step: Dict):
+    def _execute_step(self, workflow: ClaimWorkflow, step: Dict, extra_content: Optional[Dict] = None):
         """Execute a single workflow step"""
         
         stage_name = step["name"]
         agent_name = step["agent"]
         
-        print(f"\n📍 Stage: {stage_name}")
-        print(f"   Agent: {agent_name}")
-        print("-" * 70)
+        if _log.isEnabledFor(logging.INFO):
+            _log.info("\n📍 Stage: %s\n   Agent: %s\n%s", stage_name, agent_name, _STAGE_RULE,
+                      extra=fields(event="stage_start", thread_id=workflow.thread_id, stage=stage_name, agent=agent_name))
         
         # Check if agent exists
-        if agent_name not in self.agents:
-            print(f"   ⚠️  Agent {agent_name} not registered - skipping")
+        if not self._has_agent(agent_name):
+            _log.warning("   ⚠️  Agent %s not registered - skipping", agent_name)
             workflow.complete_stage(stage_name, {"error": "Agent not found"})
             return
         
-        agent = self.agents[agent_name]
-        
         # Mark stage as started
         workflow.start_stage(stage_name)
         
-        # Send task to agent
-        message = self.message_bus.send(
+        response = self._dispatch_step(workflow, step, workflow.thread_id, extra_content)
+        
+        # Mark stage as completed
+        workflow.complete_stage(stage_name, response)
+        
+        if _log.isEnabledFor(logging.INFO):
+            _log.info("   ✅ %s completed\n%s", stage_name, _STAGE_RULE,
+                      extra=fields(event="stage_complete", thread_id=workflow.thread_id, stage=stage_name, agent=agent_name))
+    
+    def _dispatch_step(
+        self,
+        workflow: ClaimWorkflow,
+        step: Dict,
+        thread_id: str,
+        extra_content: Optional[Dict] = None
+    ) -> Optional[Dict]:
+        """Send a stage request to its agent and wait for the response"""
+        
+        stage_name = step["name"]
+        agent_name = step["agent"]
+        
+        content = {
+            "type": stage_name,
+            "claim": workflow.claim_data,
+            "claim_id": workflow.claim_id,
+            "stage": stage_name
+        }
+        if extra_content:
+            content.update(extra_content)
+        
+        with get_tracer().span(
+            f"stage:{stage_name}",
+            trace_id=workflow.thread_id,
+            agent=agent_name,
+            speculative=thread_id != workflow.thread_id
+        ):
+            if agent_name not in self.agents:
+                return self._dispatch_remote(workflow, agent_name, thread_id, content)
+            
+            agent = self.agents[agent_name]
+            response_timeout = 5.0
+            
+            # Send task to agent (expires once nobody waits for the answer)
+            self._send_stage_request(workflow, agent_name, thread_id, content, ttl=1.0 + response_timeout)
+            
+            # Process agent's messages
+            time.sleep(0.5)  # Give agent time to process
+            agent.process_messages(max_messages=5, timeout=0.5)
+            
+            # Wait for response
+            return self._wait_for_response(agent_name, thread_id, timeout=response_timeout)
+    
+    def _send_stage_request(
+        self,
+        workflow: ClaimWorkflow,
+        agent_name: str,
+        thread_id: str,
+        content: Dict,
+        ttl: Optional[float] = None
+    ):
+        return self.message_bus.send(
             sender=self.coordinator_name,
             receiver=agent_name,
-            content={
-                "type": stage_name,
-                "claim": workflow.claim_data,
-                "claim_id": workflow.claim_id,
-                "stage": stage_name
-            },
-            thread_id=workflow.thread_id,
+            content=content,
+            thread_id=thread_id,
             message_type=MessageType.REQUEST,
             priority=MessagePriority.HIGH,
-            requires_response=True
+            requires_response=True,
+            metadata=claim_metadata(workflow.claim_data),
+            ttl=ttl
         )
+    
+    def _dispatch_remote(
+        self,
+        workflow: ClaimWorkflow,
+        agent_name: str,
+        thread_id: str,
+        content: Dict,
+        poll_interval: float = 0.2
+    ) -> Dict:
+        """
+        Send a stage request to an agent on another node and wait for the
+        correlated response, re-dispatching if the hosting node is lost.
+        """
         
-        # Process agent's messages
-        time.sleep(0.5)  # Give agent time to process
-        agent.process_messages(max_messages=5, timeout=0.5)
+        for attempt in range(self.max_redispatch + 1):
+            # After a node loss, wait for the agent to reappear on another node
+            deadline = time.monotonic() + self.remote_timeout
+            while not self.message_bus.is_routable(agent_name):
+                if time.monotonic() > deadline:
+                    _log.warning("   ⚠️  %s is not reachable on any node", agent_name)
+                    return {"status": "unreachable", "agent": agent_name}
+                time.sleep(poll_interval)
+            
+            generation = self._agent_loss_generation.get(agent_name, 0)
+            request = self._send_stage_request(workflow, agent_name, thread_id, content, ttl=self.remote_timeout)
+            
+            while time.monotonic() < deadline:
+                response = self._find_response(thread_id, request.id)
+                if response is not None:
+                    _log.info("   📬 Got response from %s (remote)", agent_name)
+                    self._consume_responses(thread_id)
+                    return response.content
+                if self._agent_loss_generation.get(agent_name, 0) != generation:
+                    _log.warning("   🔁 Node hosting %s lost - re-dispatching (attempt %d)", agent_name, attempt + 2)
+                    break
+                time.sleep(poll_interval)
+            else:
+                _log.warning("   ⚠️  No response from %s within %ss", agent_name, self.remote_timeout)
+                return {"status": "no_response", "agent": agent_name}
+        
+        return {"status": "node_lost", "agent": agent_name}
+    
+    def _find_response(self, thread_id: str, request_id: str):
+        """Response correlated to a request via parent_message_id"""
+        for msg in reversed(self.message_bus.get_thread_messages(thread_id)):
+            if msg.type == MessageType.RESPONSE and msg.parent_message_id == request_id:
+                return msg
+        return None
+    
+    def _can_speculate(self, workflow_steps: List[Dict]) -> bool:
+        """Speculation needs the anchor stage followed later by a final decision"""
+        names = [step["name"] for step in workflow_steps]
+        return (
+            len(names) > 2
+            and names[-1] == "final_decision"
+            and self.speculate_after in names[:-2]
+            and self._has_agent(workflow_steps[-1]["agent"])
+        )
+    
+    def _execute_speculative(self, workflow: ClaimWorkflow, workflow_steps: List[Dict]):
+        """
+        Run the workflow, starting the final decision as soon as the anchor
+        stage (SIU by default) completes.
         
-        # Wait for response
-        response = self._wait_for_response(agent_name, workflow.thread_id, timeout=5.0)
+        The speculative decision runs on a side thread id so a discarded
+        attempt never appears in the claim's own conversation. Once the
+        remaining stages finish, the speculation check decides whether it is
+        kept or the final decision is re-run with the complete context.
+        """
         
-        # Mark stage as completed
-        workflow.complete_stage(stage_name, response)
+        final_step = workflow_steps[-1]
+        spec_thread_id = f"{workflow.thread_id}:speculative"
+        speculative_context: Optional[Dict] = None
+        future = None
+        
+        if self._speculation_pool is None:
+            self._speculation_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="speculative")
         
-        print(f"   ✅ {stage_name} completed")
-        print("-" * 70)
+        for step in workflow_steps[:-1]:
+            self._execute_step(workflow, step)
+            
+            if future is None and step["name"] == self.speculate_after:
+                speculative_context = dict(workflow.results)
+                _log.info("\n🔮 Speculatively starting %s after %s", final_step["name"], step["name"])
+                workflow.start_stage(final_step["name"])
+                future = self._speculation_pool.submit(
+                    self._dispatch_step,
+                    workflow,
+                    final_step,
+                    spec_thread_id,
+                    {"upstream_results": speculative_context, "speculative": True}
+                )
+                self.speculation_stats.record("launched")
+        
+        final_context = dict(workflow.results)
+        agent = self.agents.get(final_step["agent"])
+        
+        if self.speculation_check(speculative_context, final_context):
+            response = future.result()
+            workflow.complete_stage(final_step["name"], response)
+            workflow.speculation = "accepted"
+            self.speculation_stats.record("accepted")
+            if agent is not None and isinstance(response, dict) and response.get("status") == "completed":
+                agent.accept_speculative(response, workflow.thread_id)
+            self._drop_speculative_thread(agent, spec_thread_id)
+            _log.info("   ✅ Speculative %s accepted", final_step["name"])
+            return
+        
+        # Material change: discard the speculative result and re-run. Wait for
+        # an in-flight attempt so it cannot consume the re-run request.
+        if not future.cancel():
+            future.result()
+        workflow.speculation = "rejected"
+        self.speculation_stats.record("rejected")
+        self._drop_speculative_thread(agent, spec_thread_id)
+        _log.info("   🔁 Context changed - re-running %s", final_step["name"])
+        self._execute_step(workflow, final_step, upstream_content(workflow, final_step))
+    
+    def _drop_speculative_thread(self, agent: Optional[AdvancedAgent], spec_thread_id: str):
+        """Forget the side thread's conversation once the speculation is decided"""
+        if agent is not None:
+            agent.conversation_store.drop_thread(spec_thread_id)
     
     # org/orchestrator.py - Update the _wait_for_response method
 
@@ -268,21 +824,74 @@ class MultiAgentOrchestrator:
         # Look for most recent response from this agent
         for msg in reversed(messages):
             if msg.sender == agent_name and msg.type == MessageType.RESPONSE:
-                print(f"   📬 Got response from {agent_name}")
+                _log.info("   📬 Got response from %s", agent_name)
+                self._consume_responses(thread_id)
                 return msg.content
         
         # If no response in thread, check if agent sent any messages
-        print(f"   ⚠️  No response found from {agent_name} in thread")
+        _log.warning("   ⚠️  No response found from %s in thread", agent_name)
         return {"status": "no_response", "agent": agent_name}
         
-    def get_workflow_status(self, claim_id: str) -> Optional[Dict]:
-        """Get status of a workflow"""
+    def _consume_responses(self, *thread_ids: str):
+        """Acknowledge the queued responses of threads read from history"""
+        self.message_bus.consume(self.coordinator_name, lambda msg: msg.thread_id in thread_ids)
+    
+    def start_worker_pool(
+        self,
+        agent_factory: Callable[[], List[AdvancedAgent]],
+        num_workers: Optional[int] = None,
+        **orchestrator_kwargs
+    ) -> WorkerPool:
+        """
+        Spawn worker processes that each host their own agents.
         
-        if claim_id not in self.workflows:
-            return None
+        Args:
+            agent_factory: Picklable top-level callable returning the agents for one worker
+            num_workers: Number of processes (default: CPU count)
+            orchestrator_kwargs: Options for the worker orchestrators (triage, speculation, ...)
+        """
+        if self.worker_pool:
+            self.worker_pool.shutdown()
+        self.worker_pool = WorkerPool(agent_factory, num_workers, orchestrator_kwargs)
+        self.worker_pool.start()
+        return self.worker_pool
+    
+    def process_claims_parallel(self, claims: Iterable) -> Iterator[ClaimWorkflow]:
+        """
+        Process (claim_id, claim_data) pairs on the worker pool.
         
-        workflow = self.workflows[claim_id]
-        return workflow.get_status()
+        Completed workflows are registered here as they arrive, so status,
+        stats and retention behave as for in-process claims.
+        """
+        if not self.worker_pool:
+            raise ValueError("Worker pool not started - call start_worker_pool() first")
+        
+        for record in self.worker_pool.map(claims):
+            if record.get("status") == "failed" and "thread_id" not in record:
+                _log.warning("   ❌ %s failed in worker: %s", record["claim_id"], record["error"])
+                continue
+            yield self._adopt_workflow(record)
+    
+    def _adopt_workflow(self, record: Dict) -> ClaimWorkflow:
+        """Register a workflow that was executed elsewhere"""
+        return self.registry.adopt(record)
+    
+    def forget_workflow(self, claim_id: str):
+        """Drop a workflow from memory (and from the running aggregates)"""
+        self.registry.forget(claim_id)
+    
+    def get_workflow_status(self, claim_id: str, include_results: bool = False) -> Optional[Dict]:
+        """
+        Get status of a workflow.
+        
+        Compacted workflows reload their results from the archive on demand;
+        evicted ones are served straight from the archive.
+        """
+        return self.registry.get_status(claim_id, include_results)
+    
+    def apply_retention(self):
+        """Compact and evict completed workflows according to the retention policy"""
+        self.registry.apply_retention()
     
     def get_all_workflows(self) -> List[Dict]:
         """Get status of all workflows"""
@@ -291,15 +900,19 @@ class MultiAgentOrchestrator:
     def get_stats(self) -> Dict:
         """Get orchestrator statistics"""
         
-        total_workflows = len(self.workflows)
-        completed = sum(1 for w in self.workflows.values() if w.status == "completed")
-        in_progress = sum(1 for w in self.workflows.values() if w.status == "in_progress")
+        # Claims run on the worker pool are triaged (and speculated) there
+        triage_stats = [self.triage_engine.get_stats() if self.triage_engine else None]
+        speculation_stats = [self.speculation_stats.to_dict() if self.speculative_decision else None]
+        if self.worker_pool:
+            pool_stats = self.worker_pool.get_stats()
+            triage_stats.append(pool_stats["triage_stats"])
+            speculation_stats.append(pool_stats["speculation_stats"])
         
         return {
             "registered_agents": len(self.agents),
-            "total_workflows": total_workflows,
-            "completed_workflows": completed,
-            "in_progress_workflows": in_progress,
+            **self.registry.get_stats(),
+            "triage_stats": triage.merge_stats(triage_stats),
+            "speculation_stats": speculation.merge_stats(speculation_stats),
             "message_bus_stats": self.message_bus.get_stats(),
             "agent_stats": {
                 name: agent.get_stats()
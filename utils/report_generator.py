@@ -3,6 +3,8 @@ from typing import Dict, List, Any
 from datetime import datetime
 import json
 
+from utils.tracing import get_tracer
+
 class ReportGenerator:
     """
     Generates professional reports for hackathon submission.
@@ -35,6 +37,25 @@ class ReportGenerator:
         Returns: Markdown-formatted report string
         """
         
+        with get_tracer().span("report.generate", claim_id=claim_data.get("claim_id")) as span:
+            report = self._render_report(
+                claim_data, agents_used, auditor_summary, debate_summary, trace_data, final_decision
+            )
+            if span:
+                span.set("report_chars", len(report))
+        return report
+    
+    def _render_report(
+        self,
+        claim_data: Dict,
+        agents_used: List[str],
+        auditor_summary: Dict,
+        debate_summary: Dict,
+        trace_data: Dict,
+        final_decision: str
+    ) -> str:
+        """Build the Markdown report"""
+        
         report = f"""# {self.project_name}
 ## Glass Box AI - Transparent Insurance Claims Processing
 ### Team: {self.team_name}
@@ -0,0 +1,140 @@
+# utils/speculation.py
+"""
+Speculative Final Decision Support
+
+Features:
+- Verdict extraction from stage responses (SIU / adjuster / audit)
+- Default diff check deciding whether a speculative decision still holds
+- Speculation statistics (mergeable across worker processes)
+"""
+
+from typing import Dict, Any, Iterable, Optional
+import json
+import re
+import threading
+
+
+_SIU_VERDICT_RE = re.compile(r"verdict\W*\s*(legitimate|suspicious|fraudulent)", re.IGNORECASE)
+_ADJUSTER_SUMMARY_RE = re.compile(r"summary\W*\s*(covered|denied|partial)", re.IGNORECASE)
+_SHORTCUT_RE = re.compile(r'"risk_of_shortcuts?(?:_score)?"\s*:\s*([0-9.]+)')
+
+# Adjuster positions that agree with each SIU verdict
+_CONSISTENT_POSITIONS = {
+    "legitimate": {"covered"},
+    "suspicious": {"denied", "partial"},
+    "fraudulent": {"denied"},
+}
+
+
+def _text(result: Any, key: str) -> str:
+    if isinstance(result, dict):
+        return str(result.get(key, ""))
+    return str(result or "")
+
+
+def siu_verdict(result: Any) -> Optional[str]:
+    """Extract LEGITIMATE/SUSPICIOUS/FRAUDULENT from an SIU response"""
+    match = _SIU_VERDICT_RE.search(_text(result, "investigation"))
+    return match.group(1).lower() if match else None
+
+
+def adjuster_position(result: Any) -> Optional[str]:
+    """Extract Covered/Denied/Partial from an adjuster response"""
+    match = _ADJUSTER_SUMMARY_RE.search(_text(result, "adjustment"))
+    return match.group(1).lower() if match else None
+
+
+def audit_shortcut_risk(result: Any) -> Optional[float]:
+    """Extract the shortcut-risk score from an audit response"""
+    text = _text(result, "audit")
+    try:
+        data = json.loads(text)
+        value = data.get("risk_of_shortcuts", data.get("risk_of_shortcut_score"))
+        return float(value) if value is not None else None
+    except (ValueError, AttributeError, TypeError):
+        match = _SHORTCUT_RE.search(text)
+        return float(match.group(1)) if match else None
+
+
+def default_speculation_check(
+    speculative_context: Dict[str, Any],
+    final_context: Dict[str, Any],
+    max_shortcut_risk: float = 0.5
+) -> bool:
+    """
+    Decide whether a decision made on ``speculative_context`` still holds
+    given the complete ``final_context``.
+
+    The speculation is accepted only when the stages that finished after it
+    started confirm the SIU verdict: the adjuster's coverage position agrees,
+    the audit does not flag shortcuts, and no stage failed. Anything that
+    cannot be parsed counts as a material change.
+    """
+    new_stages = {k: v for k, v in final_context.items() if k not in speculative_context}
+
+    for result in new_stages.values():
+        if isinstance(result, dict) and (result.get("error") or result.get("status") == "no_response"):
+            return False
+
+    verdict = siu_verdict(speculative_context.get("siu_investigation"))
+    if verdict is None:
+        return False
+
+    if "claims_adjustment" in new_stages:
+        position = adjuster_position(new_stages["claims_adjustment"])
+        if position not in _CONSISTENT_POSITIONS[verdict]:
+            return False
+
+    if "transparency_audit" in new_stages:
+        risk = audit_shortcut_risk(new_stages["transparency_audit"])
+        if risk is None or risk > max_shortcut_risk:
+            return False
+
+    return True
+
+
+class SpeculationStats:
+    """Counters for speculative decisions"""
+
+    def __init__(self):
+        self.launched = 0
+        self.accepted = 0
+        self.rejected = 0
+        self.lock = threading.Lock()
+
+    def record(self, outcome: str):
+        with self.lock:
+            if outcome == "launched":
+                self.launched += 1
+            elif outcome == "accepted":
+                self.accepted += 1
+            elif outcome == "rejected":
+                self.rejected += 1
+
+    def to_dict(self) -> Dict:
+        with self.lock:
+            decided = self.accepted + self.rejected
+            return {
+                "launched": self.launched,
+                "accepted": self.accepted,
+                "rejected": self.rejected,
+                "acceptance_rate": self.accepted / decided if decided else 0.0
+            }
+
+
+def merge_stats(stats: Iterable[Optional[Dict]]) -> Optional[Dict]:
+    """Combine SpeculationStats.to_dict() results (e.g. one per worker process)"""
+    stats = [s for s in stats if s]
+    if not stats:
+        return None
+
+    launched = sum(s["launched"] for s in stats)
+    accepted = sum(s["accepted"] for s in stats)
+    rejected = sum(s["rejected"] for s in stats)
+    decided = accepted + rejected
+    return {
+        "launched": launched,
+        "accepted": accepted,
+        "rejected": rejected,
+        "acceptance_rate": accepted / decided if decided else 0.0
+    }
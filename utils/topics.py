@@ -0,0 +1,130 @@
+# utils/topics.py
+"""
+Topic Routing Table
+
+Features:
+- Dot-separated topics: "claims.auto.theft"
+- Wildcards: "*" matches exactly one segment, "#" matches zero or more
+  ("claims.auto.*", "audit.#", "#.escalated")
+- Trie of subscription patterns: matching walks the topic once instead of
+  testing every pattern
+- Match results cached per topic until subscriptions change
+"""
+
+from typing import Dict, List, Set, Optional, Tuple
+from collections import OrderedDict
+import threading
+
+
+class _Node:
+    __slots__ = ("children", "subscribers")
+
+    def __init__(self):
+        self.children: Dict[str, "_Node"] = {}
+        self.subscribers: Set[str] = set()
+
+
+def validate_pattern(pattern: str) -> List[str]:
+    """Split a subscription pattern into segments"""
+    segments = pattern.split(".")
+    if not pattern or any(not s for s in segments):
+        raise ValueError(f"Invalid topic pattern: {pattern!r}")
+    for s in segments:
+        if s not in ("*", "#") and ("*" in s or "#" in s):
+            raise ValueError(f"Wildcards must be whole segments: {pattern!r}")
+    return segments
+
+
+def validate_topic(topic: str) -> str:
+    """A published topic: non-empty segments, no wildcards"""
+    segments = validate_pattern(topic)
+    if "*" in segments or "#" in segments:
+        raise ValueError(f"Published topics cannot contain wildcards: {topic!r}")
+    return topic
+
+
+class TopicTrie:
+    """Subscription patterns -> subscriber names"""
+
+    def __init__(self, cache_size: int = 1024):
+        self.root = _Node()
+        self.patterns: Dict[str, Set[str]] = {}
+        self.cache: "OrderedDict[str, frozenset]" = OrderedDict()
+        self.cache_size = cache_size
+        self.lock = threading.Lock()
+
+    def subscribe(self, pattern: str, subscriber: str):
+        segments = validate_pattern(pattern)
+        with self.lock:
+            node = self.root
+            for segment in segments:
+                node = node.children.setdefault(segment, _Node())
+            node.subscribers.add(subscriber)
+            self.patterns.setdefault(subscriber, set()).add(pattern)
+            self.cache.clear()
+
+    def unsubscribe(self, subscriber: str, pattern: Optional[str] = None):
+        """Remove one pattern, or every pattern of the subscriber"""
+        with self.lock:
+            patterns = [pattern] if pattern else list(self.patterns.get(subscriber, ()))
+            for p in patterns:
+                self._remove(self.root, p.split("."), 0, subscriber)
+                self.patterns.get(subscriber, set()).discard(p)
+            if not self.patterns.get(subscriber):
+                self.patterns.pop(subscriber, None)
+            self.cache.clear()
+
+    def _remove(self, node: _Node, segments: List[str], index: int, subscriber: str) -> bool:
+        """Returns True when the node became empty and can be pruned"""
+        if index == len(segments):
+            node.subscribers.discard(subscriber)
+        else:
+            child = node.children.get(segments[index])
+            if child and self._remove(child, segments, index + 1, subscriber):
+                del node.children[segments[index]]
+        return not node.subscribers and not node.children
+
+    def match(self, topic: str) -> frozenset:
+        """Subscribers with a pattern matching the topic"""
+        with self.lock:
+            cached = self.cache.get(topic)
+            if cached is not None:
+                self.cache.move_to_end(topic)
+                return cached
+
+            result: Set[str] = set()
+            self._match(self.root, topic.split("."), 0, result, set())
+            matched = frozenset(result)
+
+            self.cache[topic] = matched
+            if len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+            return matched
+
+    def _match(self, node: _Node, segments: List[str], index: int, result: Set[str], seen: Set[Tuple[int, int]]):
+        # "#" can reach the same (node, index) along several paths
+        key = (id(node), index)
+        if key in seen:
+            return
+        seen.add(key)
+
+        hash_child = node.children.get("#")
+        if hash_child:
+            # "#" consumes zero or more segments
+            for skip in range(index, len(segments) + 1):
+                self._match(hash_child, segments, skip, result, seen)
+
+        if index == len(segments):
+            result |= node.subscribers
+            return
+
+        for segment in (segments[index], "*"):
+            child = node.children.get(segment)
+            if child:
+                self._match(child, segments, index + 1, result, seen)
+
+    def subscriptions(self, subscriber: Optional[str] = None) -> Dict[str, List[str]]:
+        with self.lock:
+            if subscriber is not None:
+                return {subscriber: sorted(self.patterns.get(subscriber, ()))}
+            return {name: sorted(patterns) for name, patterns in self.patterns.items()}
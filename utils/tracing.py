@@ -0,0 +1,309 @@
+# utils/tracing.py
+"""
+Lightweight Span Tracing
+
+Features:
+- Nested spans with parent/child relationships (thread-local stack)
+- Spans grouped by trace id = claim thread_id, across threads
+- Local exporters: JSONL and Chrome trace format (chrome://tracing, Perfetto)
+- No network access required (independent of LangSmith)
+- Near-zero overhead when disabled
+
+Usage:
+    from utils.tracing import configure_tracing, get_tracer
+    configure_tracing("traces/claims.json", format="chrome")
+    with get_tracer().span("stage", trace_id=thread_id, claim_id=claim_id):
+        ...
+"""
+
+from typing import Dict, List, Any, Optional
+from collections import deque
+import atexit
+import itertools
+import json
+import os
+import threading
+import time
+
+from utils.log import get_logger
+
+_log = get_logger("tracing")
+
+
+class Span:
+    """A timed operation"""
+
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "start_ns", "end_ns", "attributes", "thread_id", "thread_name")
+
+    def __init__(self, name: str, trace_id: Optional[str], span_id: int, parent_id: Optional[int], attributes: Dict[str, Any]):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = span_id
+        self.parent_id = parent_id
+        self.attributes = attributes
+        self.start_ns = time.perf_counter_ns()
+        self.end_ns: Optional[int] = None
+        current = threading.current_thread()
+        self.thread_id = current.ident
+        self.thread_name = current.name
+
+    def set(self, key: str, value: Any):
+        """Attach an attribute"""
+        self.attributes[key] = value
+
+    @property
+    def duration_ms(self) -> float:
+        return ((self.end_ns or time.perf_counter_ns()) - self.start_ns) / 1e6
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_ns": self.start_ns,
+            "end_ns": self.end_ns,
+            "duration_ms": round(self.duration_ms, 3),
+            "thread": self.thread_name,
+            "attributes": self.attributes
+        }
+
+
+class SpanExporter:
+    """Receives finished spans"""
+
+    def export(self, span: Span):
+        raise NotImplementedError
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.flush()
+
+
+class JsonlSpanExporter(SpanExporter):
+    """One JSON object per finished span"""
+
+    def __init__(self, path: str, buffer_size: int = 256):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.file = open(path, "a", encoding="utf-8")
+        self.buffer: List[str] = []
+        self.buffer_size = buffer_size
+        self.lock = threading.Lock()
+
+    def export(self, span: Span):
+        line = json.dumps(span.to_dict(), default=str)
+        with self.lock:
+            self.buffer.append(line)
+            if len(self.buffer) >= self.buffer_size:
+                self._flush_locked()
+
+    def _flush_locked(self):
+        if self.buffer:
+            self.file.write("\n".join(self.buffer) + "\n")
+            self.file.flush()
+            self.buffer.clear()
+
+    def flush(self):
+        with self.lock:
+            self._flush_locked()
+
+    def close(self):
+        with self.lock:
+            self._flush_locked()
+            self.file.close()
+
+
+class ChromeTraceExporter(SpanExporter):
+    """
+    Chrome trace-event JSON (complete "X" events).
+
+    The file is rewritten on flush, so it is always a valid document. Only
+    the most recent max_events are kept (a ring buffer); the number of
+    older events dropped is recorded in the document's otherData.
+    """
+
+    def __init__(self, path: str, max_events: int = 100000):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.events: deque = deque(maxlen=max_events)
+        self.dropped = 0
+        self.lock = threading.Lock()
+        self.pid = os.getpid()
+
+    def export(self, span: Span):
+        event = {
+            "name": span.name,
+            "cat": span.name.split(".")[0].split(":")[0],
+            "ph": "X",
+            "ts": span.start_ns / 1000,
+            "dur": ((span.end_ns or span.start_ns) - span.start_ns) / 1000,
+            "pid": self.pid,
+            "tid": span.thread_name,
+            "args": dict(span.attributes, trace_id=span.trace_id, span_id=span.span_id, parent_id=span.parent_id)
+        }
+        with self.lock:
+            if len(self.events) == self.events.maxlen:
+                self.dropped += 1
+            self.events.append(event)
+
+    def flush(self):
+        with self.lock:
+            document = {
+                "traceEvents": list(self.events),
+                "displayTimeUnit": "ms",
+                "otherData": {"dropped_events": self.dropped}
+            }
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(document, f, default=str)
+
+
+class _NoopSpanContext:
+    """Returned when tracing is disabled"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return None
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NOOP = _NoopSpanContext()
+
+
+class _SpanContext:
+    __slots__ = ("tracer", "name", "trace_id", "attributes", "span")
+
+    def __init__(self, tracer: "Tracer", name: str, trace_id: Optional[str], attributes: Dict[str, Any]):
+        self.tracer = tracer
+        self.name = name
+        self.trace_id = trace_id
+        self.attributes = attributes
+        self.span: Optional[Span] = None
+
+    def __enter__(self) -> Span:
+        self.span = self.tracer._start(self.name, self.trace_id, self.attributes)
+        return self.span
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.span.set("error", f"{exc_type.__name__}: {exc}")
+        self.tracer._end(self.span)
+        return False
+
+
+class Tracer:
+    """
+    Creates spans and hands finished ones to an exporter.
+
+    Parent resolution: the innermost open span on the current thread if it
+    belongs to the same trace, otherwise the open root span of the trace
+    (so work done on helper threads still nests under its claim).
+    """
+
+    def __init__(self, exporter: Optional[SpanExporter] = None):
+        self.exporter = exporter
+        self.enabled = exporter is not None
+        self._local = threading.local()
+        self._ids = itertools.count(1)
+        self._roots: Dict[str, Span] = {}
+        self._roots_lock = threading.Lock()
+
+    def _stack(self) -> List[Span]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def span(self, name: str, trace_id: Optional[str] = None, **attributes):
+        """Context manager timing a block (no-op when disabled)"""
+        if not self.enabled:
+            return _NOOP
+        return _SpanContext(self, name, trace_id, attributes)
+
+    def current_span(self) -> Optional[Span]:
+        stack = self._stack()
+        return stack[-1] if stack else None
+
+    def _start(self, name: str, trace_id: Optional[str], attributes: Dict[str, Any]) -> Span:
+        stack = self._stack()
+        parent = stack[-1] if stack else None
+
+        if trace_id is None and parent is not None:
+            trace_id = parent.trace_id
+        if parent is not None and parent.trace_id != trace_id:
+            parent = None
+        if parent is None and trace_id is not None:
+            with self._roots_lock:
+                parent = self._roots.get(trace_id)
+
+        span = Span(name, trace_id, next(self._ids), parent.span_id if parent else None, attributes)
+
+        if parent is None and trace_id is not None:
+            with self._roots_lock:
+                self._roots.setdefault(trace_id, span)
+
+        stack.append(span)
+        return span
+
+    def _end(self, span: Span):
+        span.end_ns = time.perf_counter_ns()
+        stack = self._stack()
+        if stack and stack[-1] is span:
+            stack.pop()
+        elif span in stack:
+            stack.remove(span)
+
+        if span.trace_id is not None and span.parent_id is None:
+            with self._roots_lock:
+                if self._roots.get(span.trace_id) is span:
+                    del self._roots[span.trace_id]
+
+        if self.exporter:
+            self.exporter.export(span)
+
+    def flush(self):
+        if self.exporter:
+            self.exporter.flush()
+
+    def shutdown(self):
+        if self.exporter:
+            self.exporter.close()
+        self.enabled = False
+
+
+_tracer = Tracer()
+
+
+def get_tracer() -> Tracer:
+    """Process-wide tracer (disabled until configure_tracing is called)"""
+    return _tracer
+
+
+def configure_tracing(path: Optional[str] = None, format: str = "jsonl") -> Tracer:
+    """
+    Enable span export to a local file.
+
+    Args:
+        path: Output file (default: traces/spans.jsonl or traces/trace.json)
+        format: "jsonl" or "chrome"
+    """
+    global _tracer
+
+    if _tracer.enabled:
+        _tracer.shutdown()
+
+    if format == "chrome":
+        exporter: SpanExporter = ChromeTraceExporter(path or os.path.join("traces", "trace.json"))
+    elif format == "jsonl":
+        exporter = JsonlSpanExporter(path or os.path.join("traces", "spans.jsonl"))
+    else:
+        raise ValueError(f"Unknown trace format: {format}")
+
+    _tracer = Tracer(exporter)
+    atexit.register(_tracer.shutdown)
+    _log.info("🧭 Tracing enabled (%s) → %s", format, getattr(exporter, "path", None) or exporter.file.name)
+    return _tracer
@@ -0,0 +1,420 @@
+# utils/transport.py
+"""
+Pluggable Message Bus Transport
+
+Features:
+- Transport abstraction so agents can live on separate nodes
+- TCP reference implementation: length-prefixed frames, messages in the
+  binary codec (utils/message_codec.py), control ops as JSON
+- Stand-in broker process routing messages between nodes (forwards the
+  message bytes as received; only the frame header is parsed for routing)
+- Routing table broadcast to every node on change
+- Node-loss notification so in-flight work can be re-dispatched
+- A frame that cannot be decoded is NACKed back to the sender's node and
+  skipped; the connection stays up
+
+Run a local broker with:
+    python -m utils.transport --host 127.0.0.1 --port 7878
+"""
+
+from typing import Dict, List, Any, Optional, Callable, Set, Iterator, Tuple
+from abc import ABC, abstractmethod
+import argparse
+import json
+import socket
+import struct
+import threading
+import uuid
+
+from utils.message_bus import Message
+from utils import message_codec
+from utils.log import configure_logging, get_logger
+
+_log = get_logger("transport")
+
+
+class Transport(ABC):
+    """
+    Carries messages between MessageBus instances on different nodes.
+
+    The bus calls ``start`` once with its callbacks, ``announce``/``withdraw``
+    as local agents come and go, and ``send`` for receivers that are not
+    local but routable.
+    """
+
+    def __init__(self, node_id: Optional[str] = None):
+        self.node_id = node_id or f"node-{uuid.uuid4().hex[:8]}"
+        self.deliver: Optional[Callable[[Message], None]] = None
+        self.on_agents_lost: Optional[Callable[[List[str]], None]] = None
+
+    def start(self, deliver: Callable[[Message], None], on_agents_lost: Callable[[List[str]], None]):
+        """Connect the transport to a bus"""
+        self.deliver = deliver
+        self.on_agents_lost = on_agents_lost
+
+    @abstractmethod
+    def announce(self, agent_name: str):
+        """Advertise an agent hosted on this node"""
+
+    @abstractmethod
+    def withdraw(self, agent_name: str):
+        """Stop advertising an agent"""
+
+    @abstractmethod
+    def send(self, message: Message) -> bool:
+        """Send a message to a remote agent; returns False if unroutable"""
+
+    @abstractmethod
+    def has_route(self, agent_name: str) -> bool:
+        """Whether a remote node currently hosts the agent"""
+
+    @abstractmethod
+    def remote_agents(self) -> Set[str]:
+        """Names of agents hosted on other nodes"""
+
+    def stop(self):
+        """Disconnect"""
+
+
+# Wire frame: body length + kind, then the body (a JSON control op or an
+# encoded message)
+_FRAME = struct.Struct("<IB")
+_CONTROL = 0
+_MESSAGE = 1
+
+# Raised by a malformed frame body (codec or JSON); the framing itself is
+# intact, so the next frame can still be read
+_BAD_FRAME = (ValueError, KeyError, IndexError, TypeError, struct.error)
+
+
+def _write_frame(sock: socket.socket, kind: int, body: bytes, lock: threading.Lock):
+    with lock:
+        sock.sendall(_FRAME.pack(len(body), kind) + body)
+
+
+def _write_control(sock: socket.socket, frame: Dict[str, Any], lock: threading.Lock):
+    _write_frame(sock, _CONTROL, json.dumps(frame, default=str).encode("utf-8"), lock)
+
+
+def _read_frames(sock: socket.socket) -> Iterator[Tuple[int, bytes]]:
+    """(kind, body) frames until the connection closes"""
+    reader = sock.makefile("rb")
+    while True:
+        header = reader.read(_FRAME.size)
+        if len(header) < _FRAME.size:
+            return
+        length, kind = _FRAME.unpack(header)
+        body = reader.read(length)
+        if len(body) < length:
+            return
+        yield kind, body
+
+
+class TcpTransport(Transport):
+    """Transport over a TCP connection to a MessageBroker"""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 7878, node_id: Optional[str] = None):
+        super().__init__(node_id)
+        self.host = host
+        self.port = port
+        self.sock: Optional[socket.socket] = None
+        self.write_lock = threading.Lock()
+        self.routes: Dict[str, str] = {}  # agent_name -> node_id
+        self.routes_lock = threading.Lock()
+        self.local_agents: Set[str] = set()
+        self._reader: Optional[threading.Thread] = None
+        self._closed = False
+        self.rejected = 0
+
+    def start(self, deliver: Callable[[Message], None], on_agents_lost: Callable[[List[str]], None]):
+        super().start(deliver, on_agents_lost)
+        self.sock = socket.create_connection((self.host, self.port))
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        _write_control(self.sock, {"op": "hello", "node": self.node_id}, self.write_lock)
+        for agent_name in self.local_agents:
+            _write_control(self.sock, {"op": "announce", "agent": agent_name}, self.write_lock)
+
+        self._reader = threading.Thread(target=self._read_loop, name=f"transport-{self.node_id}", daemon=True)
+        self._reader.start()
+        _log.info("🔌 Transport %s connected to %s:%s", self.node_id, self.host, self.port)
+
+    def announce(self, agent_name: str):
+        self.local_agents.add(agent_name)
+        if self.sock:
+            _write_control(self.sock, {"op": "announce", "agent": agent_name}, self.write_lock)
+
+    def withdraw(self, agent_name: str):
+        self.local_agents.discard(agent_name)
+        if self.sock:
+            _write_control(self.sock, {"op": "withdraw", "agent": agent_name}, self.write_lock)
+
+    def send(self, message: Message) -> bool:
+        if not self.sock or not self.has_route(message.receiver):
+            return False
+        try:
+            _write_frame(self.sock, _MESSAGE, message_codec.encode(message), self.write_lock)
+            return True
+        except OSError as e:
+            _log.warning("⚠️  Transport send failed: %s", e)
+            return False
+
+    def has_route(self, agent_name: str) -> bool:
+        with self.routes_lock:
+            node = self.routes.get(agent_name)
+        return node is not None and node != self.node_id
+
+    def remote_agents(self) -> Set[str]:
+        with self.routes_lock:
+            return {name for name, node in self.routes.items() if node != self.node_id}
+
+    def _read_loop(self):
+        try:
+            for kind, body in _read_frames(self.sock):
+                if kind == _MESSAGE:
+                    self._receive_message(body)
+                    continue
+                try:
+                    self._handle_control(json.loads(body))
+                except _BAD_FRAME as e:
+                    _log.warning("⚠️  Transport %s skipped a malformed control frame: %s", self.node_id, e)
+        except OSError as e:
+            if not self._closed:
+                _log.warning("⚠️  Transport %s lost broker connection: %s", self.node_id, e)
+        finally:
+            if not self._closed:
+                # Without the broker every remote agent is unreachable
+                lost = list(self.remote_agents())
+                with self.routes_lock:
+                    self.routes.clear()
+                if lost:
+                    self.on_agents_lost(lost)
+
+    def _receive_message(self, body: bytes):
+        """Deliver one message frame; one that cannot be decoded is NACKed and skipped"""
+        try:
+            message = message_codec.decode(body)
+        except _BAD_FRAME as e:
+            self._reject(body, e)
+            return
+        self.deliver(message)
+
+    def _reject(self, body: bytes, error: Exception):
+        self.rejected += 1
+        try:
+            # The header usually parses even when the payload does not
+            # (e.g. a msgpack payload on a node without ormsgpack)
+            view = message_codec.MessageView(body)
+            message_id, sender, receiver = view.id, view.sender, view.receiver
+        except _BAD_FRAME:
+            message_id = sender = receiver = None
+        _log.warning("⚠️  Transport %s could not decode message %s from %s: %s", self.node_id, message_id, sender, error)
+        if sender is None:
+            return
+        try:
+            _write_control(self.sock, {
+                "op": "nack",
+                "message_id": message_id,
+                "sender": sender,
+                "receiver": receiver,
+                "reason": str(error)
+            }, self.write_lock)
+        except OSError:
+            pass  # The read loop notices the lost connection
+
+    def _handle_control(self, frame: Dict[str, Any]):
+        op = frame.get("op")
+
+        if op == "routes":
+            with self.routes_lock:
+                self.routes = dict(frame["routes"])
+
+        elif op == "agents_lost":
+            with self.routes_lock:
+                for name in frame["agents"]:
+                    self.routes.pop(name, None)
+            self.on_agents_lost(frame["agents"])
+
+        elif op == "undeliverable":
+            _log.warning("⚠️  Broker could not deliver %s to %s%s", frame.get("message_id"), frame.get("receiver"),
+                         f" ({frame['reason']})" if frame.get("reason") else "")
+
+    def stop(self):
+        self._closed = True
+        if self.sock:
+            try:
+                self.sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            self.sock.close()
+            self.sock = None
+
+
+class MessageBroker:
+    """
+    Stand-in broker routing messages between TCP transports.
+
+    Keeps an agent -> node routing table, forwards message frames to the
+    node hosting the receiver, and tells every node which agents were lost
+    when a node disconnects.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 7878):
+        self.host = host
+        self.port = port
+        self.server: Optional[socket.socket] = None
+        self.nodes: Dict[str, socket.socket] = {}
+        self.node_locks: Dict[str, threading.Lock] = {}
+        self.routes: Dict[str, str] = {}
+        self.lock = threading.Lock()
+        self.running = False
+        self.forwarded = 0
+        self.rejected = 0
+
+    def start(self) -> "MessageBroker":
+        """Start accepting connections on a background thread"""
+        self.server = socket.create_server((self.host, self.port), reuse_port=False)
+        self.port = self.server.getsockname()[1]
+        self.running = True
+        threading.Thread(target=self._accept_loop, name="broker-accept", daemon=True).start()
+        _log.info("📡 Message broker listening on %s:%s", self.host, self.port)
+        return self
+
+    def serve_forever(self):
+        self.start()
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            self.stop()
+
+    def _accept_loop(self):
+        while self.running:
+            try:
+                conn, _ = self.server.accept()
+            except OSError:
+                break
+            conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            threading.Thread(target=self._serve_node, args=(conn,), daemon=True).start()
+
+    def _send_to(self, node_id: str, frame: Dict[str, Any]) -> bool:
+        return self._write_to(node_id, _CONTROL, json.dumps(frame, default=str).encode("utf-8"))
+
+    def _write_to(self, node_id: str, kind: int, body: bytes) -> bool:
+        with self.lock:
+            conn = self.nodes.get(node_id)
+            write_lock = self.node_locks.get(node_id)
+        if conn is None:
+            return False
+        try:
+            _write_frame(conn, kind, body, write_lock)
+            return True
+        except OSError:
+            return False
+
+    def _broadcast_routes(self):
+        with self.lock:
+            frame = {"op": "routes", "routes": dict(self.routes)}
+            node_ids = list(self.nodes)
+        for node_id in node_ids:
+            self._send_to(node_id, frame)
+
+    def _serve_node(self, conn: socket.socket):
+        node_id = None
+        try:
+            for kind, body in _read_frames(conn):
+                try:
+                    if kind == _MESSAGE:
+                        self._route(node_id, body)
+                        continue
+                    frame = json.loads(body)
+                except _BAD_FRAME as e:
+                    # Skip the frame, keep the node
+                    self.rejected += 1
+                    _log.warning("⚠️  Broker skipped a malformed frame from %s: %s", node_id, e)
+                    continue
+                op = frame.get("op")
+
+                if op == "hello":
+                    node_id = frame["node"]
+                    with self.lock:
+                        self.nodes[node_id] = conn
+                        self.node_locks[node_id] = threading.Lock()
+                    self._broadcast_routes()
+
+                elif op == "announce":
+                    with self.lock:
+                        self.routes[frame["agent"]] = node_id
+                    self._broadcast_routes()
+
+                elif op == "withdraw":
+                    with self.lock:
+                        if self.routes.get(frame["agent"]) == node_id:
+                            del self.routes[frame["agent"]]
+                    self._broadcast_routes()
+
+                elif op == "nack":
+                    # A node could not decode a message: tell the sender's node
+                    with self.lock:
+                        sender_node = self.routes.get(frame.get("sender"))
+                    if sender_node:
+                        self._send_to(sender_node, {
+                            "op": "undeliverable",
+                            "message_id": frame.get("message_id"),
+                            "receiver": frame.get("receiver"),
+                            "reason": frame.get("reason")
+                        })
+        except OSError:
+            pass
+        finally:
+            conn.close()
+            if node_id is not None:
+                self._drop_node(node_id)
+
+    def _route(self, node_id: Optional[str], body: bytes):
+        """Forward a message frame, routed on the header alone (the payload is never decoded)"""
+        message = message_codec.MessageView(body)
+        with self.lock:
+            target = self.routes.get(message.receiver)
+        if target and self._write_to(target, _MESSAGE, body):
+            self.forwarded += 1
+        else:
+            self._send_to(node_id, {
+                "op": "undeliverable",
+                "message_id": message.id,
+                "receiver": message.receiver
+            })
+
+    def _drop_node(self, node_id: str):
+        with self.lock:
+            self.nodes.pop(node_id, None)
+            self.node_locks.pop(node_id, None)
+            lost = [name for name, node in self.routes.items() if node == node_id]
+            for name in lost:
+                del self.routes[name]
+            node_ids = list(self.nodes)
+
+        _log.info("📡 Node %s disconnected (lost agents: %s)", node_id, lost)
+        if lost:
+            for other in node_ids:
+                self._send_to(other, {"op": "agents_lost", "agents": lost, "node": node_id})
+        self._broadcast_routes()
+
+    def stop(self):
+        self.running = False
+        if self.server:
+            self.server.close()
+        with self.lock:
+            conns = list(self.nodes.values())
+        for conn in conns:
+            try:
+                conn.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Stand-in message broker for multi-node runs")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=7878)
+    args = parser.parse_args()
+    configure_logging(asynchronous=True)
+    MessageBroker(args.host, args.port).serve_forever()
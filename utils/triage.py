@@ -0,0 +1,295 @@
+# utils/triage.py
+"""
+Rule-Based Claim Triage
+
+Features:
+- Declarative rules over InsuranceClaim fields
+- Amount thresholds, claim types, claimant history
+- Keyword / regex red flags in the description
+- Batch fraud pre-score thresholds (see utils/fraud_scoring.py)
+- First-match-wins rule ordering
+- Reduced workflow selection (skip stages)
+- Rule hit-rate statistics (mergeable across worker processes)
+"""
+
+from typing import Dict, Iterable, List, Any, Optional, Tuple
+from dataclasses import dataclass, field
+import threading
+import re
+
+
+FULL_REVIEW = "full_review"
+FAST_TRACK = "fast_track"
+ESCALATE = "escalate"
+
+
+@dataclass
+class TriageRule:
+    """
+    Declarative triage rule.
+
+    Every condition that is set must hold for the rule to match; unset
+    conditions (None) are ignored. A rule with action ``fast_track`` removes
+    ``skip_stages`` from the workflow, ``escalate`` forces the full workflow.
+    """
+    name: str
+    action: str = FAST_TRACK
+    skip_stages: List[str] = field(default_factory=list)
+    description: str = ""
+    min_amount: Optional[float] = None
+    max_amount: Optional[float] = None
+    claim_types: Optional[List[str]] = None
+    keywords: Optional[List[str]] = None
+    pattern: Optional[str] = None
+    min_prior_claims: Optional[int] = None
+    max_prior_claims: Optional[int] = None
+    min_fraud_score: Optional[float] = None
+    max_fraud_score: Optional[float] = None
+
+    def __post_init__(self):
+        # Compile text conditions once - rules are evaluated for every claim
+        self._claim_types = {t.lower() for t in self.claim_types} if self.claim_types else None
+        self._keyword_re = None
+        if self.keywords:
+            alternation = "|".join(re.escape(k) for k in self.keywords)
+            self._keyword_re = re.compile(rf"\b(?:{alternation})\b", re.IGNORECASE)
+        self._pattern_re = re.compile(self.pattern, re.IGNORECASE) if self.pattern else None
+
+    def matches(self, claim_data: Dict[str, Any]) -> bool:
+        """Check whether the claim satisfies every condition of this rule"""
+        amount = float(claim_data.get("claim_amount", 0) or 0)
+        if self.min_amount is not None and amount < self.min_amount:
+            return False
+        if self.max_amount is not None and amount > self.max_amount:
+            return False
+
+        if self._claim_types is not None:
+            if str(claim_data.get("claim_type", "")).lower() not in self._claim_types:
+                return False
+
+        prior_claims = int(claim_data.get("prior_claims", 0) or 0)
+        if self.min_prior_claims is not None and prior_claims < self.min_prior_claims:
+            return False
+        if self.max_prior_claims is not None and prior_claims > self.max_prior_claims:
+            return False
+
+        # Pre-score conditions only apply to claims that were batch scored
+        fraud_score = claim_data.get("fraud_prescore")
+        if self.min_fraud_score is not None and (fraud_score is None or fraud_score < self.min_fraud_score):
+            return False
+        if self.max_fraud_score is not None and fraud_score is not None and fraud_score > self.max_fraud_score:
+            return False
+
+        description = claim_data.get("description", "") or ""
+        if self._keyword_re is not None and not self._keyword_re.search(description):
+            return False
+        if self._pattern_re is not None and not self._pattern_re.search(description):
+            return False
+
+        return True
+
+
+@dataclass
+class TriageDecision:
+    """Outcome of triaging a single claim"""
+    rule: Optional[str]
+    action: str
+    skip_stages: List[str] = field(default_factory=list)
+    reason: str = ""
+
+    def to_dict(self) -> Dict:
+        return {
+            "rule": self.rule,
+            "action": self.action,
+            "skip_stages": list(self.skip_stages),
+            "reason": self.reason
+        }
+
+
+def default_triage_rules(straight_through_limit: float = 1000.0, low_risk_limit: float = 5000.0) -> List[TriageRule]:
+    """
+    Default rule set: red flags escalate first, then low-value claims from
+    claimants without history are fast-tracked.
+    """
+    return [
+        TriageRule(
+            name="red_flag_keywords",
+            action=ESCALATE,
+            description="Description mentions a classic fraud indicator",
+            keywords=["stolen", "theft", "arson", "fire", "gps", "camera", "cash only", "no receipt", "total loss"]
+        ),
+        TriageRule(
+            name="recent_coverage_increase",
+            action=ESCALATE,
+            description="Coverage was raised shortly before the loss",
+            pattern=r"(increas|rais|upgrad)\w*\s.{0,40}coverage"
+        ),
+        TriageRule(
+            name="high_value",
+            action=ESCALATE,
+            description="Amount large enough to always warrant a full review",
+            min_amount=25000.0
+        ),
+        TriageRule(
+            name="high_fraud_prescore",
+            action=ESCALATE,
+            description="Batch pre-scoring ranked the claim as suspicious",
+            min_fraud_score=0.5
+        ),
+        TriageRule(
+            name="repeat_claimant",
+            action=ESCALATE,
+            description="Claimant has a history of frequent claims",
+            min_prior_claims=3
+        ),
+        TriageRule(
+            name="straight_through",
+            action=FAST_TRACK,
+            description=f"Under ${straight_through_limit:,.0f} with no prior claims",
+            max_amount=straight_through_limit,
+            max_prior_claims=0,
+            skip_stages=["siu_investigation", "claims_adjustment", "transparency_audit"]
+        ),
+        TriageRule(
+            name="low_risk",
+            action=FAST_TRACK,
+            description=f"Under ${low_risk_limit:,.0f} with at most one prior claim",
+            max_amount=low_risk_limit,
+            max_prior_claims=1,
+            skip_stages=["siu_investigation", "transparency_audit"]
+        ),
+    ]
+
+
+class TriageEngine:
+    """
+    Pre-stage triage for the orchestrator.
+
+    Rules are evaluated in order and the first match decides the workflow.
+    Claims matching no rule get the full workflow.
+    """
+
+    def __init__(self, rules: Optional[List[TriageRule]] = None):
+        self.rules: List[TriageRule] = list(rules) if rules is not None else default_triage_rules()
+
+        # Statistics
+        self.total_evaluated = 0
+        self.rule_hits: Dict[str, int] = {rule.name: 0 for rule in self.rules}
+        self.no_match = 0
+        self.stages_skipped = 0
+
+        self.lock = threading.Lock()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Picklable for spawn-context worker processes (the lock is recreated)
+        state = self.__dict__.copy()
+        del state["lock"]
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]):
+        self.__dict__.update(state)
+        self.lock = threading.Lock()
+
+    def add_rule(self, rule: TriageRule, position: Optional[int] = None):
+        """Add a rule (appended unless a position is given)"""
+        with self.lock:
+            if position is None:
+                self.rules.append(rule)
+            else:
+                self.rules.insert(position, rule)
+            self.rule_hits.setdefault(rule.name, 0)
+
+    def evaluate(self, claim_data: Dict[str, Any]) -> TriageDecision:
+        """Evaluate rules against a claim and return the decision"""
+        decision = TriageDecision(rule=None, action=FULL_REVIEW, reason="No triage rule matched")
+
+        for rule in self.rules:
+            if rule.matches(claim_data):
+                skip = rule.skip_stages if rule.action == FAST_TRACK else []
+                decision = TriageDecision(
+                    rule=rule.name,
+                    action=rule.action,
+                    skip_stages=list(skip),
+                    reason=rule.description
+                )
+                break
+
+        with self.lock:
+            self.total_evaluated += 1
+            if decision.rule is None:
+                self.no_match += 1
+            else:
+                self.rule_hits[decision.rule] = self.rule_hits.get(decision.rule, 0) + 1
+
+        return decision
+
+    def select_workflow(
+        self,
+        claim_data: Dict[str, Any],
+        workflow_steps: List[Dict]
+    ) -> Tuple[List[Dict], TriageDecision]:
+        """
+        Triage a claim and reduce the workflow accordingly.
+
+        Returns:
+            (steps to execute, triage decision)
+        """
+        decision = self.evaluate(claim_data)
+
+        if not decision.skip_stages:
+            return workflow_steps, decision
+
+        skip = set(decision.skip_stages)
+        selected = [step for step in workflow_steps if step["name"] not in skip]
+
+        with self.lock:
+            self.stages_skipped += len(workflow_steps) - len(selected)
+
+        return selected, decision
+
+    def get_stats(self) -> Dict:
+        """Get rule hit rates"""
+        with self.lock:
+            total = self.total_evaluated
+            return {
+                "total_evaluated": total,
+                "stages_skipped": self.stages_skipped,
+                "avg_stages_skipped": self.stages_skipped / total if total else 0.0,
+                "no_match": self.no_match,
+                "rule_hits": dict(self.rule_hits),
+                "rule_hit_rates": {
+                    name: hits / total if total else 0.0
+                    for name, hits in self.rule_hits.items()
+                }
+            }
+
+    def reset_stats(self):
+        """Reset hit counters"""
+        with self.lock:
+            self.total_evaluated = 0
+            self.no_match = 0
+            self.stages_skipped = 0
+            self.rule_hits = {rule.name: 0 for rule in self.rules}
+
+
+def merge_stats(stats: Iterable[Optional[Dict]]) -> Optional[Dict]:
+    """Combine TriageEngine.get_stats() results (e.g. one per worker process)"""
+    stats = [s for s in stats if s]
+    if not stats:
+        return None
+
+    total = sum(s["total_evaluated"] for s in stats)
+    skipped = sum(s["stages_skipped"] for s in stats)
+    rule_hits: Dict[str, int] = {}
+    for s in stats:
+        for name, hits in s["rule_hits"].items():
+            rule_hits[name] = rule_hits.get(name, 0) + hits
+
+    return {
+        "total_evaluated": total,
+        "stages_skipped": skipped,
+        "avg_stages_skipped": skipped / total if total else 0.0,
+        "no_match": sum(s["no_match"] for s in stats),
+        "rule_hits": rule_hits,
+        "rule_hit_rates": {name: hits / total if total else 0.0 for name, hits in rule_hits.items()}
+    }
@@ -0,0 +1,364 @@
+# utils/worker_pool.py
+"""
+Multi-Process Orchestrator Workers
+
+Features:
+- Pool of worker processes, each hosting its own orchestrator and agents
+- Claims assigned by the coordinator to the least-loaded worker's queue
+  (multiprocessing, no external broker), so every claim has a known owner
+- Bounded per-worker backlog for backpressure (the coordinator keeps
+  collecting results and checking workers while it waits for space)
+- Results streamed back to the coordinator as workflows complete, over a
+  pipe per worker (a worker killed mid-write cannot wedge the others)
+- Crashed workers are replaced and every claim assigned to them re-queued;
+  a claim that keeps killing workers (or exceeds task_timeout) fails
+- Triage and speculation stats reported by every worker and merged
+"""
+
+from typing import Dict, List, Any, Optional, Callable, Iterable, Iterator, Tuple
+from collections import deque
+from multiprocessing.connection import wait
+import multiprocessing as mp
+import os
+import time
+
+from utils import speculation, triage
+from utils.log import get_logger
+
+_log = get_logger("orchestrator")
+
+
+def _worker_stats(orchestrator) -> Dict[str, Optional[Dict]]:
+    """The worker orchestrator's cumulative triage and speculation stats"""
+    return {
+        "triage": orchestrator.triage_engine.get_stats() if orchestrator.triage_engine else None,
+        "speculation": orchestrator.speculation_stats.to_dict() if orchestrator.speculative_decision else None
+    }
+
+
+def _worker_main(
+    worker_id: int,
+    agent_factory: Callable[[], List[Any]],
+    orchestrator_kwargs: Dict[str, Any],
+    task_queue,
+    result_conn
+):
+    """Worker process entry point: build agents once, then serve claims"""
+    # Imported here so the coordinator does not need agents importable at
+    # pool construction time (spawned children import it fresh)
+    from utils.orchestrator import MultiAgentOrchestrator
+
+    orchestrator = MultiAgentOrchestrator(**orchestrator_kwargs)
+    for agent in agent_factory():
+        orchestrator.register_agent(agent)
+
+    result_conn.send(("ready", worker_id, os.getpid()))
+
+    while True:
+        task = task_queue.get()
+        if task is None:
+            break
+
+        claim_id, claim_data, workflow_steps = task
+        # Ack: the coordinator times the claim from here (task_timeout)
+        result_conn.send(("started", worker_id, claim_id))
+
+        try:
+            workflow = orchestrator.process_claim(claim_id, claim_data, workflow_steps)
+            result = ("done", worker_id, workflow.to_dict())
+        except Exception as e:
+            result = ("error", worker_id, {"claim_id": claim_id, "error": repr(e)})
+        finally:
+            # The coordinator owns the record - keep the worker's memory flat
+            orchestrator.forget_workflow(claim_id)
+
+        # Stats first, so they are current by the time the result is yielded
+        result_conn.send(("stats", worker_id, _worker_stats(orchestrator)))
+        result_conn.send(result)
+
+
+Task = Tuple[str, Dict, Optional[List[Dict]]]
+
+
+class WorkerPool:
+    """
+    Pool of orchestrator worker processes.
+
+    ``agent_factory`` must be a picklable top-level callable returning the
+    agent instances each worker should host.
+
+    Each worker has its own task queue and the coordinator records which
+    worker every claim was assigned to, so a worker that dies (even before
+    acknowledging a claim) never loses work: its claims are re-queued to
+    the other workers. The claim it was running when it died counts as a
+    failed attempt; after ``max_retries`` the claim is reported as failed.
+    With ``task_timeout``, a worker stuck on one claim is terminated.
+    """
+
+    def __init__(
+        self,
+        agent_factory: Callable[[], List[Any]],
+        num_workers: Optional[int] = None,
+        orchestrator_kwargs: Optional[Dict[str, Any]] = None,
+        max_queued: Optional[int] = None,
+        start_method: str = "spawn",
+        max_retries: int = 2,
+        task_timeout: Optional[float] = None,
+        poll_interval: float = 1.0
+    ):
+        self.agent_factory = agent_factory
+        self.num_workers = num_workers or os.cpu_count() or 1
+        self.orchestrator_kwargs = orchestrator_kwargs or {}
+        self.max_retries = max_retries
+        self.task_timeout = task_timeout
+        self.poll_interval = poll_interval
+
+        # Claims queued or running per worker
+        self.worker_backlog = max(1, (max_queued or self.num_workers * 2) // self.num_workers)
+
+        self.ctx = mp.get_context(start_method)
+
+        self.processes: Dict[int, Any] = {}
+        self.task_queues: Dict[int, Any] = {}
+        self.result_conns: Dict[Any, int] = {}                  # read end -> worker
+        self.assigned: Dict[int, Dict[str, Task]] = {}          # worker -> claim_id -> task
+        self.running: Dict[int, Tuple[str, float]] = {}         # worker -> (claim_id, monotonic start)
+        self.pending: Dict[str, Task] = {}
+        self.attempts: Dict[str, int] = {}
+        self.finished: deque = deque()                          # records not yet yielded
+        self.worker_stats: Dict[int, Dict] = {}                 # worker -> latest stats (kept after it dies)
+        self._next_worker_id = 0
+        self._last_check = 0.0
+
+        # Statistics
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.restarted = 0
+
+    def start(self, ready_timeout: float = 120.0):
+        """Spawn workers and wait until each has built its agents"""
+        _log.info("🏭 Starting %d orchestrator workers...", self.num_workers)
+        for _ in range(self.num_workers):
+            self._spawn()
+
+        waiting = dict(self.result_conns)
+        deadline = time.monotonic() + ready_timeout
+        while waiting:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError(f"Only {self.num_workers - len(waiting)}/{self.num_workers} workers became ready")
+            for conn in wait(list(waiting), remaining):
+                worker_id = waiting.pop(conn)
+                try:
+                    _, _, pid = conn.recv()
+                except (EOFError, OSError):
+                    raise RuntimeError(f"Worker {worker_id} exited during startup") from None
+                _log.info("   ✅ Worker %d ready (pid %d)", worker_id, pid)
+
+    def _spawn(self) -> int:
+        worker_id = self._next_worker_id
+        self._next_worker_id += 1
+        task_queue = self.ctx.Queue()
+        # One result pipe per worker: a shared queue's write lock dies with
+        # a worker killed mid-put and blocks every other worker's results
+        reader, writer = self.ctx.Pipe(duplex=False)
+        process = self.ctx.Process(
+            target=_worker_main,
+            args=(worker_id, self.agent_factory, self.orchestrator_kwargs, task_queue, writer),
+            name=f"orchestrator-worker-{worker_id}",
+            daemon=True
+        )
+        process.start()
+        # Only the child holds the write end, so its exit shows up as EOF
+        writer.close()
+        self.processes[worker_id] = process
+        self.task_queues[worker_id] = task_queue
+        self.result_conns[reader] = worker_id
+        self.assigned[worker_id] = {}
+        return worker_id
+
+    def submit(self, claim_id: str, claim_data: Dict, workflow_steps: Optional[List[Dict]] = None):
+        """
+        Assign a claim to the least-loaded worker.
+
+        While every worker's backlog is full, results are collected (into
+        ``finished``) and dead workers replaced until space frees up.
+        """
+        task = (claim_id, claim_data, workflow_steps)
+        self.pending[claim_id] = task
+        self.attempts[claim_id] = 0
+        self.submitted += 1
+        while not self._assign(task):
+            self._poll(self.poll_interval)
+
+    def _assign(self, task: Task, force: bool = False) -> bool:
+        """Queue a task on the least-loaded worker (force ignores the backlog limit)"""
+        worker_id = min(self.assigned, key=lambda w: len(self.assigned[w]))
+        if not force and len(self.assigned[worker_id]) >= self.worker_backlog:
+            return False
+        self.assigned[worker_id][task[0]] = task
+        self.task_queues[worker_id].put(task)
+        return True
+
+    def results(self, poll_interval: Optional[float] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Yield workflow records until every submitted claim has finished.
+
+        Failed claims are yielded as ``{"claim_id", "status": "failed", "error"}``.
+        """
+        while self.pending or self.finished:
+            if self.finished:
+                yield self.finished.popleft()
+            else:
+                self._poll(poll_interval or self.poll_interval)
+
+    def _poll(self, timeout: float):
+        """Handle waiting results; check on the workers at least every timeout seconds"""
+        self._receive(timeout)
+        if time.monotonic() - self._last_check >= timeout:
+            self._check_workers()
+
+    def _drain(self):
+        """Handle every result that is already waiting"""
+        while self._receive(0):
+            pass
+
+    def _receive(self, timeout: float) -> bool:
+        """Handle one result from each ready worker pipe (False if none was ready)"""
+        ready = wait(list(self.result_conns), timeout)
+        for conn in ready:
+            try:
+                kind, worker_id, payload = conn.recv()
+            except (EOFError, OSError):
+                # Worker gone (or died mid-send) - _check_workers replaces it
+                self._close_conn(conn)
+                continue
+            self._handle_result(kind, worker_id, payload)
+        return bool(ready)
+
+    def _close_conn(self, conn):
+        self.result_conns.pop(conn, None)
+        conn.close()
+
+    def _handle_result(self, kind: str, worker_id: int, payload: Any):
+        if kind == "started":
+            self.running[worker_id] = (payload, time.monotonic())
+            return
+        if kind == "stats":
+            self.worker_stats[worker_id] = payload
+            return
+        if kind == "ready":
+            _log.info("   ✅ Replacement worker %d ready (pid %d)", worker_id, payload)
+            return
+
+        claim_id = payload["claim_id"]
+        self.running.pop(worker_id, None)
+        self.assigned.get(worker_id, {}).pop(claim_id, None)
+        if self.pending.pop(claim_id, None) is None:
+            # Already finished elsewhere (re-queued after its worker was lost)
+            return
+        self.attempts.pop(claim_id, None)
+
+        if kind == "done":
+            self.completed += 1
+            self.finished.append(payload)
+        else:
+            self.failed += 1
+            self.finished.append({"claim_id": claim_id, "status": "failed", "error": payload["error"]})
+
+    def _check_workers(self):
+        """Replace dead (or timed-out) workers and re-queue the claims assigned to them"""
+        # Results a worker sent just before dying still count
+        self._drain()
+
+        now = self._last_check = time.monotonic()
+        for worker_id, process in list(self.processes.items()):
+            if process.is_alive():
+                running = self.running.get(worker_id)
+                if self.task_timeout is not None and running and now - running[1] > self.task_timeout:
+                    _log.warning(
+                        "   ⏱️  Worker %d exceeded %ss on %s - terminating", worker_id, self.task_timeout, running[0]
+                    )
+                    process.terminate()
+                    process.join(timeout=5.0)
+                else:
+                    continue
+
+            _log.warning("   ⚠️  Worker %d died (exit code %s) - restarting", worker_id, process.exitcode)
+            del self.processes[worker_id]
+            task_queue = self.task_queues.pop(worker_id)
+            task_queue.cancel_join_thread()
+            task_queue.close()
+            for conn in [c for c, w in self.result_conns.items() if w == worker_id]:
+                self._close_conn(conn)
+            orphaned = self.assigned.pop(worker_id)
+            running = self.running.pop(worker_id, None)
+            # A worker takes its claims in assignment order, so without an ack
+            # (lost with the process) the oldest assigned claim was running
+            culprit = running[0] if running else next(iter(orphaned), None)
+
+            self._spawn()
+            self.restarted += 1
+
+            for claim_id, task in orphaned.items():
+                if claim_id not in self.pending:
+                    continue
+                if claim_id == culprit:
+                    self.attempts[claim_id] += 1
+                if self.attempts[claim_id] > self.max_retries:
+                    attempts = self.attempts.pop(claim_id)
+                    del self.pending[claim_id]
+                    self.failed += 1
+                    self.finished.append({
+                        "claim_id": claim_id,
+                        "status": "failed",
+                        "error": f"worker lost {attempts} times while processing the claim"
+                    })
+                else:
+                    self._assign(task, force=True)
+
+    def map(self, claims: Iterable[Tuple[str, Dict]]) -> Iterator[Dict[str, Any]]:
+        """Process (claim_id, claim_data) pairs, yielding results as they complete"""
+        for claim_id, claim_data in claims:
+            self.submit(claim_id, claim_data)
+            # Yield whatever already finished so results flow while submitting
+            self._drain()
+            while self.finished:
+                yield self.finished.popleft()
+        yield from self.results()
+
+    def shutdown(self, timeout: float = 10.0):
+        """Stop all workers"""
+        for task_queue in self.task_queues.values():
+            task_queue.put(None)
+        for process in self.processes.values():
+            process.join(timeout=timeout)
+            if process.is_alive():
+                process.terminate()
+        for conn in list(self.result_conns):
+            self._close_conn(conn)
+        self.processes.clear()
+        self.task_queues.clear()
+        self.assigned.clear()
+        self.running.clear()
+        _log.info("🏭 Orchestrator workers stopped")
+
+    def get_stats(self) -> Dict:
+        return {
+            "workers": len(self.processes),
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "in_flight": len(self.pending),
+            "restarted": self.restarted,
+            "triage_stats": triage.merge_stats(s["triage"] for s in self.worker_stats.values()),
+            "speculation_stats": speculation.merge_stats(s["speculation"] for s in self.worker_stats.values())
+        }
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
@@ -0,0 +1,194 @@
+# utils/workflow_archive.py
+"""
+Workflow Retention & Archive
+
+Features:
+- Append-only JSONL archive of completed workflows
+- In-memory offset index (claim_id -> byte offset) for O(1) reload,
+  bounded to the newest max_records records
+- Compaction: the file is rewritten once superseded and expired records
+  outweigh the live ones
+- Small LRU cache of recently loaded records (raw bytes), so repeated reads
+  of a compacted workflow skip the disk
+- Index rebuilt from disk on startup
+- Retention policy by count and age
+"""
+
+from typing import Dict, Any, Optional, Tuple
+from collections import OrderedDict
+from dataclasses import dataclass
+import json
+import os
+import threading
+
+from utils.log import get_logger
+
+_log = get_logger("archive")
+
+
+@dataclass
+class RetentionPolicy:
+    """
+    How many completed workflows the orchestrator keeps in full.
+
+    Completed workflows beyond ``max_workflows`` or older than
+    ``max_age_seconds`` are compacted: claim data and stage results move to
+    the archive and only the status summary stays in memory. Beyond
+    ``max_summaries`` the oldest summaries are dropped as well and are
+    served from the archive on demand. The archive itself keeps the newest
+    ``max_archived`` records (None keeps every record).
+    """
+    archive_path: str = "workflow_archive.jsonl"
+    max_workflows: Optional[int] = 1000
+    max_age_seconds: Optional[float] = None
+    max_summaries: Optional[int] = 10000
+    max_archived: Optional[int] = 100000
+
+
+class WorkflowArchive:
+    """
+    Append-only on-disk store of full workflow records.
+
+    Records beyond max_records (oldest first) and records superseded by a
+    later store of the same claim become dead space; once dead space
+    exceeds both the live records and compact_min_bytes, the file is
+    rewritten with the live records only.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        cache_size: int = 64,
+        max_records: Optional[int] = 100000,
+        compact_min_bytes: int = 1 << 20
+    ):
+        self.path = path
+        self.max_records = max_records
+        self.compact_min_bytes = compact_min_bytes
+        # claim_id -> (offset, length), oldest stored first
+        self.index: "OrderedDict[str, Tuple[int, int]]" = OrderedDict()
+        self.live_bytes = 0
+        self.expired = 0
+        self.compactions = 0
+        self.lock = threading.Lock()
+
+        # claim_id -> record line; each load parses a fresh copy
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, bytes]" = OrderedDict()
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        self._rebuild_index()
+        self._file = open(path, "ab")
+        self._trim()
+        self._maybe_compact()
+
+        _log.info("🗄️  Workflow archive: %s (%d records)", path, len(self.index))
+
+    def _rebuild_index(self):
+        """Scan an existing archive so records survive a restart"""
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "rb") as f:
+            offset = 0
+            for line in f:
+                try:
+                    claim_id = json.loads(line)["claim_id"]
+                    self._index(claim_id, offset, len(line))
+                except (ValueError, KeyError):
+                    pass  # Torn write at the tail - ignore
+                offset += len(line)
+
+    def _index(self, claim_id: str, offset: int, length: int):
+        previous = self.index.pop(claim_id, None)
+        if previous is not None:
+            self.live_bytes -= previous[1]
+        self.index[claim_id] = (offset, length)
+        self.live_bytes += length
+
+    def _trim(self):
+        """Forget the oldest records beyond max_records (their bytes become dead space)"""
+        while self.max_records is not None and len(self.index) > self.max_records:
+            claim_id, (_, length) = self.index.popitem(last=False)
+            self._cache.pop(claim_id, None)
+            self.live_bytes -= length
+            self.expired += 1
+
+    def _maybe_compact(self):
+        dead_bytes = self._file.tell() - self.live_bytes
+        if dead_bytes > max(self.live_bytes, self.compact_min_bytes):
+            self._compact()
+
+    def _compact(self):
+        """Rewrite the archive with the live records only (caller holds the lock)"""
+        self._file.close()
+        temporary = self.path + ".compact"
+        index: "OrderedDict[str, Tuple[int, int]]" = OrderedDict()
+        with open(self.path, "rb") as source, open(temporary, "wb") as target:
+            for claim_id, (offset, length) in self.index.items():
+                source.seek(offset)
+                index[claim_id] = (target.tell(), length)
+                target.write(source.read(length))
+        os.replace(temporary, self.path)
+        self.index = index
+        self._file = open(self.path, "ab")
+        self.compactions += 1
+
+    def compact(self):
+        """Rewrite the archive now, dropping superseded and expired records"""
+        with self.lock:
+            self._compact()
+
+    def store(self, record: Dict[str, Any]):
+        """Append a workflow record (a later record for the same claim wins)"""
+        line = (json.dumps(record, default=str) + "\n").encode("utf-8")
+        with self.lock:
+            offset = self._file.tell()
+            self._file.write(line)
+            self._file.flush()
+            self._index(record["claim_id"], offset, len(line))
+            self._cache.pop(record["claim_id"], None)
+            self._trim()
+            self._maybe_compact()
+
+    def load(self, claim_id: str) -> Optional[Dict[str, Any]]:
+        """Load a workflow record by claim id"""
+        with self.lock:
+            line = self._cache.get(claim_id)
+            if line is not None:
+                self._cache.move_to_end(claim_id)
+            else:
+                location = self.index.get(claim_id)
+                if location is None:
+                    return None
+                # Read under the lock: compaction moves records
+                offset, length = location
+                with open(self.path, "rb") as f:
+                    f.seek(offset)
+                    line = f.read(length)
+                if self.cache_size:
+                    self._cache[claim_id] = line
+                    while len(self._cache) > self.cache_size:
+                        self._cache.popitem(last=False)
+        return json.loads(line)
+
+    def __contains__(self, claim_id: str) -> bool:
+        return claim_id in self.index
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self.lock:
+            return {
+                "records": len(self.index),
+                "live_bytes": self.live_bytes,
+                "file_bytes": self._file.tell(),
+                "expired": self.expired,
+                "compactions": self.compactions
+            }
+
+    def close(self):
+        with self.lock:
+            self._file.close()
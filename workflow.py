@@ -3,6 +3,7 @@ from pathlib import Path
 from dotenv import load_dotenv
 from datetime import datetime
 from utils.orchestrator import MultiAgentOrchestrator
+from utils.log import configure_logging
 from org.tasks import InsuranceClaim
 
 # Load environment
@@ -105,5 +106,6 @@ def main():
     return workflow, orchestrator
 
 if __name__ == "__main__":
+    configure_logging(asynchronous=True)
     orchestrator = main()
     print("\n🎉 System demonstration complete!\n")